@@ -0,0 +1,382 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the AsyncioFace class which extends ThreadsafeFace to add
+coroutines for asyncio applications, so that a consumer can write
+data = await face.express(interest) and a producer can write
+async for interest in face.serve(prefix). A consumer can also iterate over
+the segments of segmented data with
+async for content in face.fetchSegments(interest). This module uses the async and await
+syntax, so it requires Python 3.5 or later.
+"""
+
+import asyncio
+import logging
+import sys
+from pyndn.interest import Interest
+from pyndn.util.blob import Blob
+from pyndn.threadsafe_face import ThreadsafeFace
+from pyndn.util.segment_fetcher import SegmentFetcher
+
+class AsyncioFace(ThreadsafeFace):
+    """
+    Create a new AsyncioFace to use the asyncio loop to process events. The
+    constructor forms and the callback methods are the same as ThreadsafeFace,
+    and interest timeouts use the loop's call_later. The coroutines express and
+    serve must be used from a task running in the loop. For example, to fetch
+    many Data packets concurrently use
+    await asyncio.gather(*[face.express(name) for name in names]) .
+
+    :param loop: The event loop, for example from asyncio.get_event_loop(). It
+      is the responsibility of the application to start and stop the loop.
+    :param Transport transport: An object of a subclass of Transport used for
+      communication. The transport should be an async transport like
+      AsyncTcpTransport which uses the same loop.
+    :param Transport.ConnectionInfo connectionInfo: An object of a subclass of
+      Transport.ConnectionInfo to be used to connect to the transport.
+    :param str host: In the AsyncioFace(loop, host, port) form of the
+      constructor, host is the host of the NDN hub to connect using
+      AsyncTcpTransport.
+    :param int port: (optional) In the AsyncioFace(loop, host, port) form of
+      the constructor, port is the port of the NDN hub. If omitted. use 6363.
+    """
+    def __init__(self, loop, arg1 = None, arg2 = None):
+        super(AsyncioFace, self).__init__(loop, arg1, arg2)
+
+    class InterestTimeoutError(Exception):
+        """
+        Create an AsyncioFace.InterestTimeoutError which express raises when
+        the interest times out.
+
+        :param Interest interest: The interest which timed out.
+        """
+        def __init__(self, interest):
+            super(AsyncioFace.InterestTimeoutError, self).__init__(
+              "Interest timed out: " + interest.getName().toUri())
+            self._interest = interest
+
+        def getInterest(self):
+            """
+            Get the interest which timed out.
+
+            :return: The interest.
+            :rtype: Interest
+            """
+            return self._interest
+
+    class NetworkNackError(Exception):
+        """
+        Create an AsyncioFace.NetworkNackError which express raises when a
+        network Nack is received for the interest.
+
+        :param Interest interest: The interest which was Nacked.
+        :param NetworkNack networkNack: The received NetworkNack.
+        """
+        def __init__(self, interest, networkNack):
+            super(AsyncioFace.NetworkNackError, self).__init__(
+              "Network Nack for interest " + interest.getName().toUri() +
+              ", reason " + str(networkNack.getReason()))
+            self._interest = interest
+            self._networkNack = networkNack
+
+        def getInterest(self):
+            """
+            Get the interest which was Nacked.
+
+            :return: The interest.
+            :rtype: Interest
+            """
+            return self._interest
+
+        def getNetworkNack(self):
+            """
+            Get the received NetworkNack.
+
+            :return: The NetworkNack.
+            :rtype: NetworkNack
+            """
+            return self._networkNack
+
+    class RegisterFailedError(Exception):
+        """
+        Create an AsyncioFace.RegisterFailedError which iterating the
+        InterestStream from serve raises if registering the prefix fails.
+
+        :param Name prefix: The prefix which failed to register.
+        """
+        def __init__(self, prefix):
+            super(AsyncioFace.RegisterFailedError, self).__init__(
+              "Register failed for prefix " + prefix.toUri())
+            self._prefix = prefix
+
+        def getPrefix(self):
+            """
+            Get the prefix which failed to register.
+
+            :return: The prefix.
+            :rtype: Name
+            """
+            return self._prefix
+
+    async def express(self, interestOrName, wireFormat = None):
+        """
+        Send the interest through the transport and wait for the Data packet.
+        If the task awaiting this is cancelled, this removes the pending
+        interest.
+
+        :param interestOrName: If this is an Interest, send a copy of it. If
+          this is a Name, send an Interest with the name and a default interest
+          lifetime of 4 seconds.
+        :type interestOrName: Interest or Name
+        :param wireFormat: (optional) A WireFormat object used to encode the
+          message. If omitted, use WireFormat.getDefaultWireFormat().
+        :type wireFormat: A subclass of WireFormat
+        :return: The received Data packet.
+        :rtype: Data
+        :raises AsyncioFace.InterestTimeoutError: If the interest times out.
+        :raises AsyncioFace.NetworkNackError: If a network Nack is received.
+        """
+        future = self._loop.create_future()
+
+        def onData(interest, data):
+            if not future.done():
+                future.set_result(data)
+
+        def onTimeout(interest):
+            if not future.done():
+                future.set_exception(AsyncioFace.InterestTimeoutError(interest))
+
+        def onNetworkNack(interest, networkNack):
+            if not future.done():
+                future.set_exception(
+                  AsyncioFace.NetworkNackError(interest, networkNack))
+
+        pendingInterestId = self.expressInterest(
+          interestOrName, onData, onTimeout, onNetworkNack, wireFormat)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self.removePendingInterest(pendingInterestId)
+            raise
+
+    def serve(self, prefix, register = True, flags = None, wireFormat = None,
+              maxQueueSize = 0):
+        """
+        Return an AsyncioFace.InterestStream to iterate over the interests
+        received for the prefix, for example:
+        async for interest in face.serve(prefix): face.putData(makeData(interest))
+        The stream can also be used with "async with" to close it at the end.
+        To register a prefix with NFD, you must first call
+        setCommandSigningInfo.
+
+        :param Name prefix: The name prefix. This copies the Name.
+        :param bool register: (optional) If True or omitted, register the prefix
+          with the forwarder as with registerPrefix. If False, only call
+          setInterestFilter, for example if the prefix is already registered.
+        :param ForwardingFlags flags: (optional) The flags for registerPrefix.
+        :param wireFormat: (optional) The WireFormat for registerPrefix.
+        :type wireFormat: A subclass of WireFormat
+        :param int maxQueueSize: (optional) The maximum number of received
+          interests which are waiting to be iterated. When the queue is full,
+          further interests are dropped. If omitted or 0, there is no limit.
+        :return: The new InterestStream.
+        :rtype: AsyncioFace.InterestStream
+        """
+        return AsyncioFace.InterestStream(
+          self, prefix, register, flags, wireFormat, maxQueueSize)
+
+    class InterestStream(object):
+        """
+        An InterestStream is an async iterator over the interests received for
+        a prefix. Do not create this directly but call AsyncioFace.serve.
+        """
+        def __init__(self, face, prefix, register, flags, wireFormat,
+                     maxQueueSize):
+            self._face = face
+            self._maxQueueSize = maxQueueSize
+            # The queue has the received Interest objects. None or an Exception
+            # object ends the iteration. Don't bound the queue so that close()
+            # can always put None.
+            self._queue = AsyncioFace._makeQueue(face._loop)
+            self._isFinished = False
+            self._registeredPrefixId = None
+            self._interestFilterId = None
+
+            if register:
+                self._registeredPrefixId = face.registerPrefix(
+                  prefix, self._onInterest, self._onRegisterFailed, None,
+                  flags, wireFormat)
+            else:
+                self._interestFilterId = face.setInterestFilter(
+                  prefix, self._onInterest)
+
+        def close(self):
+            """
+            Remove the registered prefix or interest filter, and end the
+            iteration after the interests which were already received. If
+            already closed, do nothing.
+            """
+            if self._registeredPrefixId != None:
+                self._face.removeRegisteredPrefix(self._registeredPrefixId)
+                self._registeredPrefixId = None
+            elif self._interestFilterId != None:
+                self._face.unsetInterestFilter(self._interestFilterId)
+                self._interestFilterId = None
+            else:
+                return
+
+            self._queue.put_nowait(None)
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            if self._isFinished:
+                raise StopAsyncIteration
+
+            item = await self._queue.get()
+            if isinstance(item, Interest):
+                return item
+
+            self._isFinished = True
+            if item == None:
+                raise StopAsyncIteration
+            raise item
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, excType, excValue, traceback):
+            self.close()
+
+        def _onInterest(self, prefix, interest, face, interestFilterId, filter):
+            if self._maxQueueSize > 0 and self._queue.qsize() >= self._maxQueueSize:
+                logging.getLogger(__name__).info(
+                  "AsyncioFace.serve: Dropping interest %s for the full queue",
+                  interest.getName().toUri())
+                return
+
+            self._queue.put_nowait(interest)
+
+        def _onRegisterFailed(self, prefix):
+            self._registeredPrefixId = None
+            self._queue.put_nowait(AsyncioFace.RegisterFailedError(prefix))
+
+    def fetchSegments(self, baseInterest, validatorKeyChainOrVerifySegment = None,
+                      options = None):
+        """
+        Return an AsyncioFace.SegmentStream to iterate over the content of each
+        segment in order as it is fetched with SegmentFetcher, for example:
+        async for content in face.fetchSegments(Interest(name)): out.write(content.toBytes())
+        If fetching fails, the iteration raises a SegmentFetcher.Error. The
+        stream can also be used with "async with" to stop fetching at the end.
+
+        :param Interest baseInterest: An Interest for the initial segment of the
+          requested data. See SegmentFetcher.fetch.
+        :param validatorKeyChainOrVerifySegment: (optional) The KeyChain or
+          verifySegment function to validate each segment, as in
+          SegmentFetcher.fetch. If omitted or None, this does not validate the
+          segments.
+        :param SegmentFetcher.Options options: (optional) The options for the
+          window of outstanding Interests. If omitted, use the defaults.
+        :return: The new SegmentStream.
+        :rtype: AsyncioFace.SegmentStream
+        """
+        return AsyncioFace.SegmentStream(
+          self, baseInterest, validatorKeyChainOrVerifySegment, options)
+
+    class SegmentStream(object):
+        """
+        A SegmentStream is an async iterator over the content Blob of each
+        segment fetched by a SegmentFetcher. Do not create this directly but
+        call AsyncioFace.fetchSegments.
+        """
+        def __init__(self, face, baseInterest, validatorKeyChainOrVerifySegment,
+                     options):
+            # The queue has the content Blob of each segment. None or an
+            # Exception object ends the iteration.
+            self._queue = AsyncioFace._makeQueue(face._loop)
+            self._isFinished = False
+            self._isFetching = True
+            self._fetcher = SegmentFetcher.fetch(
+              face, baseInterest, validatorKeyChainOrVerifySegment,
+              self._onComplete, self._onError, options, self._onSegment)
+
+        def close(self):
+            """
+            Stop fetching, and end the iteration after the segments which were
+            already received. If already closed or fetching has finished, do
+            nothing.
+            """
+            if not self._isFetching:
+                return
+
+            self._isFetching = False
+            self._fetcher.stop()
+            self._queue.put_nowait(None)
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            if self._isFinished:
+                raise StopAsyncIteration
+
+            item = await self._queue.get()
+            if isinstance(item, Blob):
+                return item
+
+            self._isFinished = True
+            if item == None:
+                raise StopAsyncIteration
+            raise item
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, excType, excValue, traceback):
+            self.close()
+
+        def _onSegment(self, segmentNumber, content):
+            self._queue.put_nowait(content)
+
+        def _onComplete(self, content):
+            self._isFetching = False
+            self._queue.put_nowait(None)
+
+        def _onError(self, errorCode, message):
+            self._isFetching = False
+            self._queue.put_nowait(SegmentFetcher.Error(errorCode, message))
+
+    @staticmethod
+    def _makeQueue(loop):
+        """
+        Make an asyncio.Queue for the loop. Before Python 3.10, a queue uses
+        asyncio.get_event_loop() if the loop is not given, which is not the
+        face's loop if the application didn't call set_event_loop.
+
+        :param loop: The event loop of the face.
+        :return: The new queue.
+        :rtype: asyncio.Queue
+        """
+        if sys.version_info < (3, 10):
+            return asyncio.Queue(loop = loop)
+        else:
+            return asyncio.Queue()
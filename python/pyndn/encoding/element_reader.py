@@ -19,28 +19,30 @@
 
 """
 This module defines the ElementReader class which lets you call onReceivedData
-multiple times which uses a TlvStructureDecoder to detect the end of a TLV
-element, and calls elementListener.onReceivedElement(element) with the element.
-This handles the case where a single call to onReceivedData may contain multiple
-elements.
+multiple times which reads the outer TLV type and length to detect the end of a
+TLV element, and calls elementListener.onReceivedElement(element) with the
+element. This handles the case where a single call to onReceivedData may
+contain multiple elements.
 """
 
 from pyndn.util.blob import Blob
-from pyndn.encoding.tlv.tlv_structure_decoder import TlvStructureDecoder
-from pyndn.util.dynamic_byte_array import DynamicByteArray
 from pyndn.util.common import Common
 
 class ElementReader(object):
     """
-    Create an ElementReader with the elementListener and an initial buffer for
-    saving partial data.
+    Create an ElementReader with the elementListener. An element which is
+    entirely in one call to onReceivedData is passed to the elementListener
+    without copying. An element which spans calls is copied once into a buffer
+    whose size is the element length from the TLV header.
     """
     def __init__(self, elementListener):
         self._elementListener = elementListener
-        self._tlvStructureDecoder = TlvStructureDecoder()
-        self._usePartialData = False
-        self._partialData = DynamicByteArray(1000)
-        self._partialDataLength = 0
+        # The bytes of a TLV header which spans calls to onReceivedData.
+        self._partialHeader = bytearray()
+        # The buffer for an element which spans calls, or None if not reading
+        # a partial element.
+        self._partialElement = None
+        self._partialElementLength = 0
 
     def onReceivedData(self, data):
         """
@@ -52,78 +54,136 @@ class ElementReader(object):
         :param data: The buffer with the incoming element's bytes.
         :type data: An array type with int elements
         """
-        # Create a Blob and take its buf() since this creates a memoryview
-        #   which is more efficient for slicing.
-        data = Blob(data, False).buf()
+        blob = Blob(data, False)
+        # Use buf() which has int elements to read the headers, and toBuffer()
+        # to copy into a bytearray.
+        buf = blob.buf()
+        buffer = blob.toBuffer()
+        offset = 0
+        end = len(buf)
 
         # Process multiple objects in the data.
         while True:
-            try:
-                if not self._usePartialData:
-                    # This is the beginning of an element.
-                    if len(data) <= 0:
-                        # Wait for more data.
-                        return
-
-                # Scan the input to check if a whole TLV element has been read.
-                self._tlvStructureDecoder.seek(0)
-                gotElementEnd = self._tlvStructureDecoder.findElementEnd(data)
-                offset = self._tlvStructureDecoder.getOffset()
-            except ValueError as ex:
-                # Reset to read a new element on the next call.
-                self._usePartialData = False
-                self._tlvStructureDecoder = TlvStructureDecoder()
-
-                raise ex
-
-            if gotElementEnd:
-                # Got the remainder of an element. Report to the caller.
-                if self._usePartialData:
-                    # We have partial data from a previous call, so append this
-                    #   data and use partialData for onReceivedElement.
-                    self._partialData.copy(
-                      data[:offset], self._partialDataLength)
-                    self._partialDataLength += offset
-
-                    # Create a Blob and take its buf() since this creates a
-                    #   memoryview which is more efficient for slicing.
-                    partialDataView = Blob(
-                      self._partialData.getArray(), False).buf()
-                    element = partialDataView[:self._partialDataLength]
-                    # Assume we don't need to use partialData anymore until
-                    #   needed.
-                    self._usePartialData = False
-                else:
-                    # We are not using partialData, so just point to the input
-                    #   data buffer.
-                    element = data[:offset]
-
-                # Reset to read a new object. Do this before calling
-                # onReceivedElement in case it throws an exception.
-                data = data[offset:]
-                self._tlvStructureDecoder = TlvStructureDecoder()
+            if self._partialElement != None:
+                # Copy as much of the element as is in the data.
+                nBytes = min(
+                  len(self._partialElement) - self._partialElementLength,
+                  end - offset)
+                self._partialElement[
+                  self._partialElementLength:
+                  self._partialElementLength + nBytes] = \
+                  buffer[offset:offset + nBytes]
+                self._partialElementLength += nBytes
+                offset += nBytes
+                if self._partialElementLength < len(self._partialElement):
+                    # Wait for more data.
+                    return
 
+                # Reset to read a new element. Do this before calling
+                # onReceivedElement in case it throws an exception.
+                element = Blob(self._partialElement, False).buf()
+                self._partialElement = None
                 self._elementListener.onReceivedElement(element)
-                if len(data) == 0:
-                    # No more data in the packet.
+                continue
+
+            if offset >= end:
+                # No more data in the packet.
+                return
+
+            if len(self._partialHeader) > 0:
+                # Add enough of the data to finish the header.
+                header = self._partialHeader + bytearray(buffer[
+                  offset:offset + ElementReader._maxHeaderLength])
+                elementLength = self._readElementLength(header, 0, len(header))
+                if elementLength == None:
+                    # The header is still not complete.
+                    self._partialHeader = header
                     return
 
-                # else loop back to decode.
-            else:
-                # Save remaining data for a later call.
-                if not self._usePartialData:
-                    self._usePartialData = True
-                    self._partialDataLength = 0
+                # Copy the saved header bytes. The loop copies the rest.
+                self._partialElement = bytearray(elementLength)
+                self._partialElement[0:len(self._partialHeader)] = \
+                  self._partialHeader
+                self._partialElementLength = len(self._partialHeader)
+                self._partialHeader = bytearray()
+                continue
+
+            elementLength = self._readElementLength(buf, offset, end)
+            if elementLength == None:
+                # Save the partial header for a later call.
+                self._partialHeader = bytearray(buffer[offset:end])
+                return
 
-                if self._partialDataLength + len(data) > Common.MAX_NDN_PACKET_SIZE:
-                    # Reset to read a new element on the next call.
-                    self._usePartialData = False
-                    self._tlvStructureDecoder = TlvStructureDecoder()
+            if offset + elementLength <= end:
+                # We have the whole element, so just point to the input data
+                # buffer.
+                element = buf[offset:offset + elementLength]
+                offset += elementLength
+                self._elementListener.onReceivedElement(element)
+            else:
+                # Allocate the whole element. The loop copies the data.
+                self._partialElement = bytearray(elementLength)
+                self._partialElementLength = 0
 
-                    raise ValueError(
-                      "The incoming packet exceeds the maximum limit Face.getMaxNdnPacketSize()")
+    # The maximum length of a TLV type and length, each with 9 bytes.
+    _maxHeaderLength = 18
 
-                self._partialData.copy(data, self._partialDataLength)
-                self._partialDataLength += len(data)
+    def _readElementLength(self, input, offset, end):
+        """
+        Read the TLV type and length at the offset and return the length of
+        the entire element including the header.
+
+        :param input: The input buffer.
+        :type input: An array type with int elements
+        :param int offset: The offset in input of the TLV type.
+        :param int end: The end offset of the valid bytes in input.
+        :return: The length of the element, or None if the header does not end
+          before the end offset.
+        :rtype: int
+        :raises ValueError: If the element length exceeds
+          Common.MAX_NDN_PACKET_SIZE. This resets to read a new element.
+        """
+        lengthOffset = offset + ElementReader._getVarNumberLength(input[offset])
+        if lengthOffset >= end:
+            return None
+
+        firstOctet = input[lengthOffset]
+        valueOffset = lengthOffset + ElementReader._getVarNumberLength(firstOctet)
+        if valueOffset > end:
+            return None
+
+        if firstOctet < 253:
+            valueLength = firstOctet
+        else:
+            valueLength = 0
+            for i in range(lengthOffset + 1, valueOffset):
+                valueLength = (valueLength << 8) + input[i]
+
+        elementLength = valueOffset - offset + valueLength
+        if elementLength > Common.MAX_NDN_PACKET_SIZE:
+            # Reset to read a new element on the next call.
+            self._partialHeader = bytearray()
+            self._partialElement = None
+
+            raise ValueError(
+              "The incoming packet exceeds the maximum limit Face.getMaxNdnPacketSize()")
+
+        return elementLength
+
+    @staticmethod
+    def _getVarNumberLength(firstOctet):
+        """
+        Get the number of bytes in a VAR-NUMBER in NDN-TLV.
 
-                return
+        :param int firstOctet: The first octet of the VAR-NUMBER.
+        :return: The number of bytes including the first octet.
+        :rtype: int
+        """
+        if firstOctet < 253:
+            return 1
+        elif firstOctet == 253:
+            return 3
+        elif firstOctet == 254:
+            return 5
+        else:
+            return 9
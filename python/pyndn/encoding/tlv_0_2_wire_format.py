@@ -305,10 +305,7 @@ class Tlv0_2WireFormat(WireFormat):
                              data.getSignature().getSignature().buf())
         signedPortionEndOffsetFromBack = len(encoder)
 
-        self._encodeSignatureInfo(data.getSignature(), encoder)
-        encoder.writeBlobTlv(Tlv.Content, data.getContent().buf())
-        self._encodeMetaInfo(data.getMetaInfo(), encoder)
-        self._encodeName(data.getName(), encoder)
+        self._encodeDataSignedPortion(data, encoder)
         signedPortionBeginOffsetFromBack = len(encoder)
 
         encoder.writeTypeAndLength(Tlv.Data, len(encoder) - saveLength)
@@ -319,6 +316,53 @@ class Tlv0_2WireFormat(WireFormat):
         return (Blob(encoder.getOutput(), False), signedPortionBeginOffset,
                 signedPortionEndOffset)
 
+    def encodeSignedData(self, data, sign):
+        """
+        Encode data in NDN-TLV, calling sign to compute the signature value
+        over the signed portion, and return the encoding and signed offsets.
+        This sets data.getSignature().setSignature() to the signature value.
+        Unlike encodeData, this encodes the signed portion only once, then
+        appends the SignatureValue and writes the outer Data type and length.
+
+        :param Data data: The Data object to encode. Its Signature must already
+          have the SignatureInfo fields.
+        :param sign: This calls sign(signedPortion) where signedPortion is a
+          Blob with the bytes of the signed portion, and which returns the
+          signature value as a Blob.
+        :type sign: function object
+        :return: A Tuple of (encoding, signedPortionBeginOffset,
+          signedPortionEndOffset) where encoding is a Blob containing the
+          encoding, signedPortionBeginOffset is the offset in the encoding of
+          the beginning of the signed portion, and signedPortionEndOffset is
+          the offset in the encoding of the end of the signed portion.
+        :rtype: (Blob, int, int)
+        """
+        if haveModule_pyndn:
+            # The C bindings only encode a whole Data packet.
+            return super(Tlv0_2WireFormat, self).encodeSignedData(data, sign)
+
+        signedPortionEncoder = TlvEncoder(1500)
+        self._encodeDataSignedPortion(data, signedPortionEncoder)
+        signedPortion = signedPortionEncoder.getOutput()
+
+        signatureValue = sign(Blob(signedPortion, False))
+        data.getSignature().setSignature(signatureValue)
+
+        # Encode backwards. Copy the signed portion instead of encoding again.
+        encoder = TlvEncoder(len(signedPortion) + signatureValue.size() + 16)
+        encoder.writeBlobTlv(Tlv.SignatureValue, signatureValue.buf())
+        signedPortionEndOffsetFromBack = len(encoder)
+        encoder.writeBuffer(signedPortion)
+        signedPortionBeginOffsetFromBack = len(encoder)
+
+        encoder.writeTypeAndLength(Tlv.Data, len(encoder))
+        signedPortionBeginOffset = (len(encoder) -
+                                    signedPortionBeginOffsetFromBack)
+        signedPortionEndOffset = len(encoder) - signedPortionEndOffsetFromBack
+
+        return (Blob(encoder.getOutput(), False), signedPortionBeginOffset,
+                signedPortionEndOffset)
+
     def decodeData(self, data, input, copy = True):
         """
         Decode input as an NDN-TLV data packet, set the fields in the data
@@ -932,6 +976,19 @@ class Tlv0_2WireFormat(WireFormat):
 
         decoder.finishNestedTlvs(endOffset)
 
+    def _encodeDataSignedPortion(self, data, encoder):
+        """
+        An internal method to encode the signed portion of data (the Name,
+        MetaInfo, Content and SignatureInfo) backwards into the encoder.
+
+        :param Data data: The Data object to encode.
+        :param TlvEncoder encoder: The encoder to receive the encoding.
+        """
+        self._encodeSignatureInfo(data.getSignature(), encoder)
+        encoder.writeBlobTlv(Tlv.Content, data.getContent().buf())
+        self._encodeMetaInfo(data.getMetaInfo(), encoder)
+        self._encodeName(data.getName(), encoder)
+
     @staticmethod
     def _encodeMetaInfo(metaInfo, encoder):
         saveLength = len(encoder)
@@ -23,6 +23,8 @@ encoding and decoding Interest, Data, etc. with a specific wire format.
 You should use a derived class such as TlvWireFormat.
 """
 
+from pyndn.util.blob import Blob
+
 class WireFormat(object):
     _defaultWireFormat = None
 
@@ -118,6 +120,36 @@ class WireFormat(object):
         """
         raise RuntimeError("encodeData is not implemented")
 
+    def encodeSignedData(self, data, sign):
+        """
+        Encode data, calling sign to compute the signature value over the
+        signed portion, and return the encoding and signed offsets. This sets
+        data.getSignature().setSignature() to the signature value. This base
+        implementation calls encodeData once to get the signed portion and
+        again to include the signature value. Your derived class can override
+        to encode the signed portion only once.
+
+        :param Data data: The Data object to encode. Its Signature must already
+          have the SignatureInfo fields.
+        :param sign: This calls sign(signedPortion) where signedPortion is a
+          Blob with the bytes of the signed portion, and which returns the
+          signature value as a Blob.
+        :type sign: function object
+        :return: A Tuple of (encoding, signedPortionBeginOffset,
+          signedPortionEndOffset) where encoding is a Blob containing the
+          encoding, signedPortionBeginOffset is the offset in the encoding of
+          the beginning of the signed portion, and signedPortionEndOffset is
+          the offset in the encoding of the end of the signed portion.
+        :rtype: (Blob, int, int)
+        """
+        (encoding, signedPortionBeginOffset, signedPortionEndOffset) = \
+          self.encodeData(data)
+        data.getSignature().setSignature(sign(Blob(
+          encoding.buf()[signedPortionBeginOffset:signedPortionEndOffset],
+          False)))
+
+        return self.encodeData(data)
+
     def decodeData(self, data, input, copy = True):
         """
         Decode input as a data packet, set the fields in the data object, and
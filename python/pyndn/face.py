@@ -23,7 +23,6 @@ communication.
 """
 
 import os
-import collections
 from pyndn.name import Name
 from pyndn.interest import Interest
 from pyndn.forwarding_flags import ForwardingFlags
@@ -184,12 +183,12 @@ class Face(object):
         # OnTimeout,  None,          None
         # WireFormat, None,          None
         # None,       None,          None
-        if isinstance(arg3, collections.Callable):
+        if callable(arg3):
             onTimeout = arg3
         else:
             onTimeout = None
 
-        if isinstance(arg4, collections.Callable):
+        if callable(arg4):
             onNetworkNack = arg4
         else:
             onNetworkNack = None
@@ -340,7 +339,7 @@ class Face(object):
         # ForwardingFlags,   None,            None
         # WireFormat,        None,            None
         # None,              None,            None
-        if isinstance(arg5, collections.Callable):
+        if callable(arg5):
             onRegisterSuccess = arg5
         else:
             onRegisterSuccess = None
@@ -459,8 +458,10 @@ class Face(object):
         :type encoding: Blob or an array type with int elements
         :throws: RuntimeError If the packet size exceeds getMaxNdnPacketSize().
         """
-        # If encoding is a Blob, get its buf().
-        encodingBuffer = encoding.buf() if isinstance(encoding, Blob) else encoding
+        # If encoding is a Blob, get its buf(). Otherwise copy it since the
+        # transport may queue it to send later, and the caller may change it.
+        encodingBuffer = (encoding.buf() if isinstance(encoding, Blob)
+          else Blob(encoding, True).buf())
 
         self._node.send(encodingBuffer)
 
@@ -499,6 +500,28 @@ class Face(object):
         """
         self._node.shutdown()
 
+    def getTransport(self):
+        """
+        Get the Transport object given to the constructor, for example so that
+        an application's event loop can select on the transport's socket.
+
+        :return: The Transport object.
+        :rtype: Transport
+        """
+        return self._node.getTransport()
+
+    def getNextCallTime(self):
+        """
+        Get the time of the next call to a callback from callLater, such as an
+        interest timeout, which processEvents will make. An application's event
+        loop can use this to limit how long it waits for socket events.
+
+        :return: The call time in milliseconds, similar to
+          Common.getNowMilliseconds(), or None if there are no delayed calls.
+        :rtype: float
+        """
+        return self._node.getNextCallTime()
+
     @staticmethod
     def getMaxNdnPacketSize():
         """
@@ -519,8 +542,10 @@ class Face(object):
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
+        :return: A handle whose cancel() method removes the callback so that it
+          is not called. (A subclass which overrides this may return None.)
         """
-        self._node.callLater(delayMilliseconds, callback)
+        return self._node.callLater(delayMilliseconds, callback)
 
     @staticmethod
     def _getUnixSocketFilePathForLocalhost():
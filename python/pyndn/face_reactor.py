@@ -0,0 +1,208 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the FaceReactor class which uses one thread to process the
+events of many Face objects, waiting on their sockets with the selectors module
+instead of polling.
+"""
+
+import logging
+import socket
+try:
+    # Use builtin selectors on Python 3.4+
+    import selectors
+except ImportError:
+    # Use the selectors34 backport on earlier versions.
+    import selectors34 as selectors
+from pyndn.util.common import Common
+
+class FaceReactor(object):
+    """
+    Create a new FaceReactor with no faces. Call addFace for each Face, then
+    call run() which waits until a socket of a Face has data to receive or
+    until the next interest timeout or other delayed call, and calls the Face's
+    processEvents. This replaces an application loop which calls processEvents
+    and sleeps. The faces should use a transport with a socket such as
+    TcpTransport or UnixTransport (not an async transport or ThreadsafeFace).
+    As with Face.processEvents, all the Face methods such as expressInterest
+    should be called in the thread which calls run(), for example from the
+    callbacks. In Python <= 3.3, you must have the prerequisite selectors34
+    library. See the INSTALL file for installation details.
+    """
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._faces = []
+        self._isRunning = False
+        # stop() writes to _wakeupSend to wake up the select in run().
+        self._wakeupReceive, self._wakeupSend = socket.socketpair()
+        self._wakeupReceive.setblocking(False)
+        self._wakeupSend.setblocking(False)
+        self._selector.register(
+          self._wakeupReceive, selectors.EVENT_READ, None)
+
+    def addFace(self, face):
+        """
+        Add the face so that run() processes its events. If the face is
+        already added, do nothing. The face doesn't need to be connected yet,
+        since the reactor checks for a connection each time before it waits.
+
+        :param Face face: The Face to add.
+        """
+        if not face in self._faces:
+            self._faces.append(face)
+
+    def removeFace(self, face):
+        """
+        Remove the face so that run() no longer processes its events. This does
+        not shut down the face. If the face is not added, do nothing.
+
+        :param Face face: The Face to remove.
+        """
+        if face in self._faces:
+            self._faces.remove(face)
+            self._updateSelector()
+
+    def getFaceCount(self):
+        """
+        Get the number of faces which were added.
+
+        :return: The number of faces.
+        :rtype: int
+        """
+        return len(self._faces)
+
+    def run(self):
+        """
+        Process the events of the faces until stop() is called. This blocks
+        while there are no events. An exception from Face.processEvents (for
+        example in a callback) is logged and does not stop the reactor.
+        """
+        self._isRunning = True
+        while self._isRunning:
+            try:
+                self.runOnce()
+            except:
+                logging.exception("FaceReactor: Error processing events")
+
+    def runOnce(self, timeoutMilliseconds = None):
+        """
+        Wait until a face has events to process, then process them and return.
+        Unlike run(), this does not catch exceptions from Face.processEvents.
+        If a face raises an exception, the events of the remaining faces are
+        processed by the next call.
+
+        :param float timeoutMilliseconds: (optional) The maximum time to wait.
+          If omitted or None, wait until there are events.
+        """
+        self._updateSelector()
+
+        # Wait until the earliest delayed call of all the faces.
+        now = Common.getNowMilliseconds()
+        for face in self._faces:
+            nextCallTime = face.getNextCallTime()
+            if nextCallTime != None and (timeoutMilliseconds == None or
+                nextCallTime - now < timeoutMilliseconds):
+                timeoutMilliseconds = max(nextCallTime - now, 0)
+
+        readyFaces = []
+        timeout = (None if timeoutMilliseconds == None
+                   else timeoutMilliseconds / 1000.0)
+        for key, _ in self._selector.select(timeout):
+            if key.data == None:
+                self._clearWakeup()
+            elif not key.data in readyFaces:
+                readyFaces.append(key.data)
+
+        now = Common.getNowMilliseconds()
+        for face in self._faces:
+            if face in readyFaces:
+                continue
+            nextCallTime = face.getNextCallTime()
+            if nextCallTime != None and nextCallTime <= now:
+                readyFaces.append(face)
+
+        for face in readyFaces:
+            face.processEvents()
+
+    def stop(self):
+        """
+        Make run() return after it processes the current events. This can be
+        called from a callback or from another thread.
+        """
+        self._isRunning = False
+        try:
+            self._wakeupSend.send(b"\0")
+        except socket.error:
+            # The wakeup socket is full, so run() will wake up anyway.
+            pass
+
+    def close(self):
+        """
+        Close the selector used by the reactor. This does not shut down the
+        faces.
+        """
+        self._faces = []
+        self._selector.close()
+        self._wakeupReceive.close()
+        self._wakeupSend.close()
+
+    def _updateSelector(self):
+        """
+        Register the socket of each connected face with the selector, and
+        unregister the sockets which are closed or belong to removed faces. If
+        a transport has data waiting to be sent, also wait until its socket is
+        writable so that processEvents can send it.
+        """
+        sockets = {}
+        for face in self._faces:
+            transport = face.getTransport()
+            sock = transport.getSocket()
+            if sock == None:
+                continue
+
+            events = selectors.EVENT_READ
+            if (hasattr(transport, "getPendingSendByteCount") and
+                transport.getPendingSendByteCount() > 0):
+                events |= selectors.EVENT_WRITE
+            sockets[sock] = (events, face)
+
+        for key in list(self._selector.get_map().values()):
+            if key.data == None:
+                # Keep the wakeup socket.
+                continue
+
+            value = sockets.pop(key.fileobj, None)
+            if value == None:
+                self._selector.unregister(key.fileobj)
+            elif value != (key.events, key.data):
+                self._selector.modify(key.fileobj, value[0], value[1])
+
+        for sock, (events, face) in sockets.items():
+            self._selector.register(sock, events, face)
+
+    def _clearWakeup(self):
+        """
+        Receive the bytes which stop() sent to wake up the selector.
+        """
+        try:
+            while len(self._wakeupReceive.recv(1024)) > 0:
+                pass
+        except socket.error:
+            pass
@@ -22,11 +22,18 @@ This module defines DelayedCallTable which is an internal class used by the Node
 implementation of callLater to store callbacks and call them when they time out.
 """
 
+import heapq
 from pyndn.util.common import Common
 
 class DelayedCallTable(object):
     def __init__(self):
-        self._table = [] # of _Entry
+        # A heap of (callTime, sequenceNo, _Entry) so that the next entry to
+        # call is at the front. The sequenceNo keeps entries with the same
+        # call time in the order they were added.
+        self._heap = []
+        self._nextSequenceNo = 0
+        # The number of cancelled entries which are still in _heap.
+        self._nCancelled = 0
 
     def callLater(self, delayMilliseconds, callback):
         """
@@ -36,47 +43,94 @@ class DelayedCallTable(object):
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
+        :return: A handle whose cancel() method removes the callback so that it
+          is not called.
+        :rtype: DelayedCallTable.Handle
         """
-        entry = DelayedCallTable._Entry(delayMilliseconds, callback)
-        # Insert into _table, sorted on getCallTime().
-        # Search from the back since we expect it to go there.
-        i = len(self._table) - 1
-        while i >= 0:
-            if (self._table[i].getCallTime() <= entry.getCallTime()):
-                break
-            i -= 1
-
-        # Element i is the greatest less than or equal to
-        # entry.getCallTime(), so insert after it.
-        self._table.insert(i + 1, entry)
+        entry = DelayedCallTable.Handle(self, delayMilliseconds, callback)
+        heapq.heappush(
+          self._heap, (entry.getCallTime(), self._nextSequenceNo, entry))
+        self._nextSequenceNo += 1
+        return entry
 
     def callTimedOut(self):
         """
-        Call and remove timed-out callback entries. Since callLater does a
-        sorted insert into the delayed call table, the check for timed-out
-        entries is quick and does not require searching the entire table.
+        Call and remove timed-out callback entries. Since the delayed call table
+        is a heap on the call time, the check for timed-out entries is quick
+        and does not require searching the entire table.
         """
         now = Common.getNowMilliseconds()
-        # _table is sorted on _callTime, so we only need to process the
+        # _heap is ordered on the call time, so we only need to process the
         # timed-out entries at the front, then quit.
-        while (len(self._table) > 0 and self._table[0].getCallTime() <= now):
-            entry = self._table[0]
-            del self._table[0]
+        while len(self._heap) > 0 and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)[2]
+            if entry._isCancelled:
+                self._nCancelled -= 1
+                continue
+
+            # Detach the entry so that a later cancel() does nothing.
+            entry._table = None
             entry.callCallback()
 
-    class _Entry(object):
+    def getNextCallTime(self):
+        """
+        Get the call time of the next callback to call. An event loop can use
+        this to wait until callTimedOut() has something to do.
+
+        :return: The call time in milliseconds, similar to
+          Common.getNowMilliseconds(), or None if there are no callbacks.
+        :rtype: float
         """
-        _Entry holds the callback and other fields for an entry in the delayed
-        call table. Create a new DelayedCallTable.Entry and set the call time
-        based on the current time and the delayMilliseconds.
+        # Remove the cancelled entries at the front.
+        while len(self._heap) > 0 and self._heap[0][2]._isCancelled:
+            heapq.heappop(self._heap)
+            self._nCancelled -= 1
 
+        if len(self._heap) == 0:
+            return None
+        return self._heap[0][0]
+
+    def size(self):
+        """
+        Get the number of callbacks which are waiting to be called.
+
+        :return: The number of callbacks, not counting cancelled ones.
+        :rtype: int
+        """
+        return len(self._heap) - self._nCancelled
+
+    def _onCancelled(self):
+        """
+        This is called by Handle.cancel() for an entry in _heap. Cancelled
+        entries are removed lazily when they reach the front of the heap, but if
+        they are more than half of the heap then remove them all now so that the
+        heap doesn't grow when most calls are cancelled.
+        """
+        self._nCancelled += 1
+        if self._nCancelled > 16 and self._nCancelled * 2 > len(self._heap):
+            self._heap = [item for item in self._heap
+                          if not item[2]._isCancelled]
+            heapq.heapify(self._heap)
+            self._nCancelled = 0
+
+    class Handle(object):
+        """
+        A Handle holds the callback and other fields for an entry in the delayed
+        call table, and is returned by callLater so that the call can be
+        cancelled. Create a new DelayedCallTable.Handle and set the call time
+        based on the current time and the delayMilliseconds. Note: You should
+        not call this directly but call DelayedCallTable.callLater.
+
+        :param DelayedCallTable table: The table which holds this entry.
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
         """
-        def __init__(self, delayMilliseconds, callback):
+        def __init__(self, table, delayMilliseconds, callback):
+            self._table = table
             self._callback = callback
             self._callTime = Common.getNowMilliseconds() + delayMilliseconds
+            self._isCancelled = False
 
         def getCallTime(self):
             """
@@ -88,6 +142,21 @@ class DelayedCallTable(object):
             """
             return self._callTime
 
+        def cancel(self):
+            """
+            Cancel the call so that the callback is not called. If the callback
+            has already been called or cancelled, do nothing.
+            """
+            if self._table == None:
+                return
+
+            table = self._table
+            self._table = None
+            self._isCancelled = True
+            # Release the callback and what it refers to.
+            self._callback = None
+            table._onCancelled()
+
         def callCallback(self):
             """
             Call the callback given to the constructor. This does not catch
@@ -22,11 +22,20 @@ This module defines InterestFilterTable which is an internal class to hold a
 list of entries with an interest Filter and its OnInterestCallback.
 """
 
+import inspect
 import logging
+from pyndn.impl.name_trie import NameTrie
 
 class InterestFilterTable(object):
     def __init__(self):
-        self._table = [] # of Entry
+        # The key is the interestFilterId. The value is the tuple
+        # (sequenceNo, Entry) which is also stored in _prefixIndex.
+        self._entriesById = {}
+        # Index the (sequenceNo, Entry) by the filter prefix so that an
+        # incoming Interest only has to check the filters whose prefix matches.
+        self._prefixIndex = NameTrie()
+        # The sequenceNo keeps the order in which filters were added.
+        self._nextSequenceNo = 0
 
     class Entry(object):
         """
@@ -46,6 +55,9 @@ class InterestFilterTable(object):
             self._filter = filter
             self._onInterest = onInterest
             self._face = face
+            # Check the callback once here instead of for every Interest.
+            self._onInterestIncludesFilter = (
+              InterestFilterTable.Entry._acceptsFilterArgument(onInterest))
 
         def getInterestFilterId(self):
             """
@@ -83,6 +95,44 @@ class InterestFilterTable(object):
             """
             return self._face
 
+        def getOnInterestIncludesFilter(self):
+            """
+            Check if the OnInterestCallback accepts the filter argument, as
+            determined when this Entry was created.
+
+            :return: True if the callback should be called as
+              onInterest(prefix, interest, face, interestFilterId, filter), or
+              False if it is old-style and should be called as
+              onInterest(prefix, interest, face, interestFilterId).
+            :rtype: bool
+            """
+            return self._onInterestIncludesFilter
+
+        @staticmethod
+        def _acceptsFilterArgument(onInterest):
+            """
+            Use getcallargs to test if onInterest accepts 5 args.
+
+            :param onInterest: The OnInterestCallback.
+            :type onInterest: function object
+            :return: True if onInterest accepts 5 args, False if it is
+              old-style with 4 arguments.
+            :rtype: bool
+            """
+            onInterestCall = onInterest
+            # If onInterest is not a function nor a method assumes it is a
+            # calleable object
+            if (not inspect.isfunction(onInterestCall) and
+                not inspect.ismethod(onInterestCall)):
+                onInterestCall = onInterestCall.__call__
+            try:
+                inspect.getcallargs(onInterestCall,
+                  None, None, None, None, None)
+                return True
+            except TypeError:
+                # Assume onInterest is old-style with 4 arguments.
+                return False
+
     def setInterestFilter(self, interestFilterId, filterCopy, onInterest, face):
         """
         Add an entry to the table.
@@ -93,8 +143,11 @@ class InterestFilterTable(object):
         :type onInterest: function object
         :param Face face: The face which is passed to the onInterest callback.
         """
-        self._table.append(InterestFilterTable.Entry
+        item = (self._nextSequenceNo, InterestFilterTable.Entry
           (interestFilterId, filterCopy, onInterest, face))
+        self._nextSequenceNo += 1
+        self._entriesById[interestFilterId] = item
+        self._prefixIndex.add(filterCopy.getPrefix(), item)
 
     def getMatchedFilters(self, interest, matchedFilters):
         """
@@ -104,12 +157,20 @@ class InterestFilterTable(object):
         :param Interest interest: The interest which may match the filter in
           multiple entries.
         :param List<InterestFilterTable.Entry> matchedFilters: Add each matching
-          InterestFilterTable.Entry from the interest filter table.  The caller
-          should pass in an empty list.
+          InterestFilterTable.Entry from the interest filter table, in the
+          order that they were added.  The caller should pass in an empty list.
         """
-        for i in range(len(self._table)):
-            entry = self._table[i]
-            if entry.getFilter().doesMatch(interest.getName()):
+        # Walk the interest name once to find the filters whose prefix
+        # matches. Then only a regex filter needs to do more checking.
+        items = []
+        self._prefixIndex.findPrefixItems(interest.getName(), items)
+        if len(items) > 1:
+            items.sort(key = lambda item: item[0])
+
+        for item in items:
+            entry = item[1]
+            if (not entry.getFilter().hasRegexFilter() or
+                  entry.getFilter().doesMatch(interest.getName())):
                 matchedFilters.append(entry)
 
     def unsetInterestFilter(self, interestFilterId):
@@ -121,17 +182,10 @@ class InterestFilterTable(object):
 
         :param int interestFilterId: The ID returned from setInterestFilter.
         """
-        count = 0
-        # Go backwards through the list so we can erase entries.
-        # Remove all entries even though interestFilterId should be unique.
-        i = len(self._table) - 1
-        while i >= 0:
-            if (self._table[i].getInterestFilterId() == interestFilterId):
-                count += 1
-                self._table.pop(i)
-            i -= 1
-
-        if count == 0:
+        item = self._entriesById.pop(interestFilterId, None)
+        if item != None:
+            self._prefixIndex.remove(item[1].getFilter().getPrefix(), item)
+        else:
             logging.getLogger(__name__).debug(
               "unsetInterestFilter: Didn't find interestFilterId " +
               str(interestFilterId))
@@ -0,0 +1,132 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines NameTrie which is an internal class to index items by
+Name so that all items stored under a prefix of a given name can be found by
+walking the name's components once.
+"""
+
+class NameTrie(object):
+    """
+    Create an empty NameTrie. Each node is keyed by the value of a name
+    component, the same as Name.match which compares component values.
+    """
+    def __init__(self):
+        self._root = NameTrie._Node()
+
+    def add(self, name, item, nComponents = None):
+        """
+        Add the item under the given name.
+
+        :param Name name: The name for the item.
+        :param item: The item to add.
+        :param int nComponents: (optional) The number of leading components of
+          name to use. If omitted, use all of name.
+        """
+        if nComponents == None:
+            nComponents = len(name)
+
+        node = self._root
+        for i in range(nComponents):
+            key = name.get(i).getValue()
+            child = node._children.get(key)
+            if child == None:
+                child = NameTrie._Node()
+                node._children[key] = child
+            node = child
+
+        node._items.append(item)
+
+    def remove(self, name, item, nComponents = None):
+        """
+        Remove the item which was added under the given name, and remove any
+        nodes which are left empty.
+
+        :param Name name: The name given to add.
+        :param item: The item to remove. This compares by identity.
+        :param int nComponents: (optional) The number of leading components of
+          name given to add. If omitted, use all of name.
+        :return: True if the item was removed, False if it was not found.
+        :rtype: bool
+        """
+        if nComponents == None:
+            nComponents = len(name)
+
+        # Keep the path so that we can remove empty nodes.
+        path = [self._root]
+        node = self._root
+        for i in range(nComponents):
+            node = node._children.get(name.get(i).getValue())
+            if node == None:
+                return False
+            path.append(node)
+
+        for i in range(len(node._items)):
+            if node._items[i] is item:
+                del node._items[i]
+                break
+        else:
+            return False
+
+        # Remove empty nodes, from the leaf up to (but not including) the root.
+        i = nComponents
+        while i > 0 and path[i].isEmpty():
+            del path[i - 1]._children[name.get(i - 1).getValue()]
+            i -= 1
+
+        return True
+
+    def findPrefixItems(self, name, items):
+        """
+        Find all items which were added under a name which is a prefix of the
+        given name (including the name itself and the empty name), and add
+        them to the items list, shortest prefix first.
+
+        :param Name name: The name to search for.
+        :param list items: Add each matching item to this list.
+        """
+        node = self._root
+        items.extend(node._items)
+        for i in range(len(name)):
+            node = node._children.get(name.get(i).getValue())
+            if node == None:
+                return
+            items.extend(node._items)
+
+    def isEmpty(self):
+        """
+        Check if there are no items in the trie.
+
+        :return: True if the trie is empty.
+        :rtype: bool
+        """
+        return self._root.isEmpty()
+
+    class _Node(object):
+        """
+        A _Node has a dictionary of child nodes keyed by the component value
+        Blob, and the list of items stored at this node.
+        """
+        def __init__(self):
+            self._children = {}
+            self._items = []
+
+        def isEmpty(self):
+            return len(self._children) == 0 and len(self._items) == 0
@@ -23,11 +23,20 @@ list of pending interests with their callbacks.
 """
 
 import logging
+from pyndn.impl.name_trie import NameTrie
 
 class PendingInterestTable(object):
     def __init__(self):
-        self._table = []  # of Entry
-        self._removeRequests = [] # of int
+        # The key is the pendingInterestId. The value is the Entry.
+        self._entriesById = {}
+        # Index the entries by the Interest name so that an incoming Data
+        # packet only has to check the entries whose name is a prefix.
+        self._nameIndex = NameTrie()
+        # Index the entries which have an onNetworkNack callback by the
+        # Interest nonce so that a Nack doesn't have to check every entry. The
+        # key is the nonce Blob. The value is the list of Entry.
+        self._entriesByNonce = {}
+        self._removeRequests = set() # of int
 
     class Entry(object):
         """
@@ -55,6 +64,7 @@ class PendingInterestTable(object):
             self._onTimeout = onTimeout
             self._onNetworkNack = onNetworkNack
             self._isRemoved = False
+            self._timeoutHandle = None
 
         def getPendingInterestId(self):
             """
@@ -103,6 +113,25 @@ class PendingInterestTable(object):
                 except:
                     logging.exception("Error in onTimeout")
 
+        def setTimeoutHandle(self, timeoutHandle):
+            """
+            Set the handle returned by Face.callLater for the interest timeout
+            so that cancelTimeout() can cancel it.
+
+            :param timeoutHandle: The handle with a cancel() method, or None if
+              the Face callLater did not return a handle.
+            """
+            self._timeoutHandle = timeoutHandle
+
+        def cancelTimeout(self):
+            """
+            If a timeout handle was set, cancel it so that the interest timeout
+            callback is not called.
+            """
+            if self._timeoutHandle != None:
+                self._timeoutHandle.cancel()
+                self._timeoutHandle = None
+
         def setIsRemoved(self):
             """
             Set the isRemoved flag which is returned by getIsRemoved().
@@ -142,18 +171,21 @@ class PendingInterestTable(object):
           removePendingInterest was already called with the pendingInterestId.
         :rtype: PendingInterestTable.Entry
         """
-        try:
-            removeRequestIndex = self._removeRequests.index(pendingInterestId)
+        if pendingInterestId in self._removeRequests:
             # removePendingInterest was called with the pendingInterestId returned by
             #   expressInterest before we got here, so don't add a PIT entry.
-            del self._removeRequests[removeRequestIndex]
+            self._removeRequests.remove(pendingInterestId)
             return None
-        except ValueError:
-            pass
 
         entry = PendingInterestTable.Entry(
           pendingInterestId, interestCopy, onData, onTimeout, onNetworkNack)
-        self._table.append(entry)
+        self._entriesById[pendingInterestId] = entry
+        self._nameIndex.add(
+          interestCopy.getName(), entry,
+          PendingInterestTable._getIndexLength(interestCopy))
+        if onNetworkNack != None:
+            self._entriesByNonce.setdefault(
+              interestCopy.getNonce(), []).append(entry)
         return entry
 
     def extractEntriesForExpressedInterest(self, data, entries):
@@ -167,19 +199,20 @@ class PendingInterestTable(object):
           PendingInterestTable.Entry from the pending interest table. The caller
           should pass in an empty list.
         """
-        # Go backwards through the list so we can erase entries.
-        i = len(self._table) - 1
-        while i >= 0:
-            pendingInterest = self._table[i]
-
+        # Only an entry whose Interest name is a prefix of the Data name can
+        # match, so only check the selectors of those entries.
+        candidates = []
+        self._nameIndex.findPrefixItems(data.getName(), candidates)
+        # Return the most recently added entries first, the same as a
+        # backwards search through a list of entries.
+        candidates.sort(
+          key = lambda entry: entry.getPendingInterestId(), reverse = True)
+
+        for pendingInterest in candidates:
             if pendingInterest.getInterest().matchesData(data):
                 entries.append(pendingInterest)
-                # We let the callback from callLater call _processInterestTimeout,
-                # but for efficiency, mark this as removed so that it returns
-                # right away.
-                self._table.pop(i)
-                pendingInterest.setIsRemoved()
-            i -= 1
+                # This also cancels the interest timeout.
+                self._removeFromIndexes(pendingInterest)
 
     def extractEntriesForNackInterest(self, interest, entries):
         """
@@ -198,24 +231,21 @@ class PendingInterestTable(object):
           PendingInterestTable.Entry from the pending interest table. The caller
           should pass in an empty list.
         """
-        encoding = interest.wireEncode()
+        # An entry with the same encoding has the same nonce, so we only need
+        # to compare the encoding of the entries with the nonce.
+        candidates = self._entriesByNonce.get(interest.getNonce())
+        if candidates == None:
+            return
 
-        # Go backwards through the list so we can erase entries.
-        i = len(self._table) - 1
-        while i >= 0:
-            pendingInterest = self._table[i]
-            if pendingInterest.getOnNetworkNack() != None:
-                # wireEncode returns the encoding cached when the interest was
-                # sent (if it was the default wire encoding).
-                if pendingInterest.getInterest().wireEncode().equals(encoding):
-                    entries.append(pendingInterest)
-                    # We let the callback from callLater call _processInterestTimeout,
-                    # but for efficiency, mark this as removed so that it returns
-                    # right away.
-                    self._table.pop(i)
-                    pendingInterest.setIsRemoved()
-
-            i -= 1
+        encoding = interest.wireEncode()
+        # Go backwards through a copy of the list since we erase entries.
+        for pendingInterest in reversed(list(candidates)):
+            # wireEncode returns the encoding cached when the interest was
+            # sent (if it was the default wire encoding).
+            if pendingInterest.getInterest().wireEncode().equals(encoding):
+                entries.append(pendingInterest)
+                # This also cancels the interest timeout.
+                self._removeFromIndexes(pendingInterest)
 
     def removePendingInterest(self, pendingInterestId):
         """
@@ -227,44 +257,20 @@ class PendingInterestTable(object):
 
         :param int pendingInterestId: The ID returned from expressInterest.
         """
-        count = 0
-        # Go backwards through the list so we can erase entries.
-        # Remove all entries even though pendingInterestId should be unique.
-        i = len(self._table) - 1
-        while i >= 0:
-            if (self._table[i].getPendingInterestId() ==
-                  pendingInterestId):
-                count += 1
-                # For efficiency, mark this as removed so that
-                # _processInterestTimeout doesn't look for it.
-                self._table[i].setIsRemoved()
-                self._table.pop(i)
-            i -= 1
-
-        if count == 0:
-            logging.getLogger(__name__).debug(
-              "removePendingInterest: Didn't find pendingInterestId " +
-              str(pendingInterestId))
-
-        if count == 0:
-            # The pendingInterestId was not found. Perhaps this has been called before
-            #   the callback in expressInterest can add to the PIT. Add this
-            #   removal request which will be checked before adding to the PIT.
-            try:
-                self._removeRequests.index(pendingInterestId)
-            except ValueError:
-                # Not already requested, so add the request.
-                self._removeRequests.append(pendingInterestId)
-
-        if count == 0:
-            # The pendingInterestId was not found. Perhaps this has been called before
-            #   the callback in expressInterest can add to the PIT. Add this
-            #   removal request which will be checked before adding to the PIT.
-            try:
-                self._removeRequests.index(pendingInterestId)
-            except ValueError:
-                # Not already requested, so add the request.
-                self._removeRequests.append(pendingInterestId)
+        entry = self._entriesById.get(pendingInterestId)
+        if entry != None:
+            # This also cancels the interest timeout.
+            self._removeFromIndexes(entry)
+            return
+
+        logging.getLogger(__name__).debug(
+          "removePendingInterest: Didn't find pendingInterestId " +
+          str(pendingInterestId))
+
+        # The pendingInterestId was not found. Perhaps this has been called before
+        #   the callback in expressInterest can add to the PIT. Add this
+        #   removal request which will be checked before adding to the PIT.
+        self._removeRequests.add(pendingInterestId)
 
     def removeEntry(self, pendingInterest):
         """
@@ -284,13 +290,58 @@ class PendingInterestTable(object):
             # for it. Do nothing.
             return False
 
-        try:
-            index = self._table.index(pendingInterest)
-        except ValueError:
+        if (self._entriesById.get(pendingInterest.getPendingInterestId())
+              is not pendingInterest):
             # The pending interest has been removed. Do nothing.
             return False
 
-        pendingInterest.setIsRemoved()
-        del self._table[index]
+        self._removeFromIndexes(pendingInterest)
         return True
 
+    def size(self):
+        """
+        Get the number of entries in the pending interest table.
+
+        :return: The number of entries.
+        :rtype: int
+        """
+        return len(self._entriesById)
+
+    def _removeFromIndexes(self, pendingInterest):
+        """
+        Remove the entry from the ID, name and nonce indexes, set its isRemoved
+        flag and cancel its interest timeout.
+
+        :param PendingInterestTable.Entry pendingInterest: The entry which is
+          in the pending interest table.
+        """
+        del self._entriesById[pendingInterest.getPendingInterestId()]
+        interest = pendingInterest.getInterest()
+        self._nameIndex.remove(
+          interest.getName(), pendingInterest,
+          PendingInterestTable._getIndexLength(interest))
+        if pendingInterest.getOnNetworkNack() != None:
+            nonce = interest.getNonce()
+            nonceEntries = self._entriesByNonce[nonce]
+            nonceEntries.remove(pendingInterest)
+            if len(nonceEntries) == 0:
+                del self._entriesByNonce[nonce]
+        pendingInterest.setIsRemoved()
+        pendingInterest.cancelTimeout()
+
+    @staticmethod
+    def _getIndexLength(interest):
+        """
+        Get the number of components of the interest name to use in the name
+        index. If the name ends in an implicit digest, don't use it since the
+        Data name doesn't have it.
+
+        :param Interest interest: The Interest.
+        :return: The number of name components.
+        :rtype: int
+        """
+        name = interest.getName()
+        if len(name) > 0 and name.get(-1).isImplicitSha256Digest():
+            return len(name) - 1
+        else:
+            return len(name)
@@ -53,6 +53,9 @@ class InterestFilter(object):
             else:
                 self._regexFilterPattern = None
 
+        # doesMatch compiles the regex matcher once, when first needed.
+        self._regexMatcher = None
+
     def doesMatch(self, name):
         """
         Check if the given name matches this filter. Match if name starts with
@@ -86,8 +89,10 @@ class InterestFilter(object):
             if not self._prefix.match(name):
                 return False
 
-            return NdnRegexTopMatcher(self._regexFilterPattern).match(
-              name.getSubName(len(self._prefix)))
+            if self._regexMatcher == None:
+                self._regexMatcher = NdnRegexTopMatcher(
+                  self._regexFilterPattern)
+            return self._regexMatcher.match(name.getSubName(len(self._prefix)))
         else:
             # Just perform a prefix match.
             return self._prefix.match(name)
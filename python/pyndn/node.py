@@ -22,7 +22,6 @@ This module defines the Node class which provides functionality for the Face
 class.
 """
 
-import inspect
 import logging
 import threading
 from random import SystemRandom
@@ -321,6 +320,17 @@ class Node(object):
         # processEvents is not needed to check for delayed calls.
         self._delayedCallTable.callTimedOut();
 
+    def getNextCallTime(self):
+        """
+        Get the time of the next call to a callback from callLater, such as an
+        interest timeout, which processEvents will make.
+
+        :return: The call time in milliseconds, similar to
+          Common.getNowMilliseconds(), or None if there are no delayed calls.
+        :rtype: float
+        """
+        return self._delayedCallTable.getNextCallTime()
+
     def getTransport(self):
         """
         Get the transport object given to the constructor.
@@ -404,24 +414,10 @@ class Node(object):
             # Call all interest filter callbacks which match.
             matchedFilters = []
             self._interestFilterTable.getMatchedFilters(interest, matchedFilters)
-            for i in range(len(matchedFilters)):
-                entry = matchedFilters[i]
-                includeFilter = True
-                onInterestCall = entry.getOnInterest()
-                # If onInterest is not a function nor a method assumes it is a
-                # calleable object
-                if (not inspect.isfunction(onInterestCall) and
-                    not inspect.ismethod(onInterestCall)):
-                    onInterestCall = onInterestCall.__call__
-                # Use getcallargs to test if onInterest accepts 5 args.
-                try:
-                    inspect.getcallargs(onInterestCall,
-                      None, None, None, None, None)
-                except TypeError:
-                    # Assume onInterest is old-style with 4 arguments.
-                    includeFilter = False
-
-                if includeFilter:
+            for entry in matchedFilters:
+                # The Entry checked the number of callback arguments when it
+                # was created.
+                if entry.getOnInterestIncludesFilter():
                     try:
                         entry.getOnInterest()(
                           entry.getFilter().getPrefix(), interest,
@@ -520,8 +516,11 @@ class Node(object):
                 # Use a default timeout delay.
                 delayMilliseconds = 4000.0
 
-            face.callLater(delayMilliseconds,
-                           lambda: self._processInterestTimeout(pendingInterest))
+            # Keep the handle so that the timeout is cancelled when the
+            # entry is removed from the PIT.
+            pendingInterest.setTimeoutHandle(face.callLater(
+              delayMilliseconds,
+              lambda: self._processInterestTimeout(pendingInterest)))
 
         # Special case: For _timeoutPrefix we don't actually send the interest.
         if not self._timeoutPrefix.match(interestCopy.getName()):
@@ -584,8 +583,11 @@ class Node(object):
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
+        :return: A handle whose cancel() method removes the callback so that it
+          is not called.
+        :rtype: DelayedCallTable.Handle
         """
-        self._delayedCallTable.callLater(delayMilliseconds, callback)
+        return self._delayedCallTable.callLater(delayMilliseconds, callback)
 
     def _processInterestTimeout(self, pendingInterest):
         """
@@ -44,6 +44,7 @@ from pyndn.sha256_with_rsa_signature import Sha256WithRsaSignature
 from pyndn.key_locator import KeyLocator, KeyLocatorType
 from pyndn.validity_period import ValidityPeriod
 from pyndn.util.blob import Blob
+from pyndn.util.signed_blob import SignedBlob
 from pyndn.util.common import Common
 from pyndn.util.config_file import ConfigFile
 from pyndn.security.security_exception import SecurityException
@@ -112,6 +113,10 @@ class KeyChain(object):
 
         self._pib = None
         self._tpm = None
+        # The key is (signerType, signerName, digestAlgorithm) from the
+        # SigningInfo. The value is (keyName, signatureTemplate) from
+        # _resolveSigner. This is cleared when the PIB is changed.
+        self._signerCache = {}
 
         if arg1 == None:
             # The default constructor.
@@ -267,6 +272,7 @@ class KeyChain(object):
             params = KeyChain.getDefaultKeyParams()
 
         id = self._pib._addIdentity(identityName)
+        self._signerCache.clear()
 
         try:
             key = id.getDefaultKey()
@@ -314,6 +320,7 @@ class KeyChain(object):
             self._tpm._deleteKey(keyName)
 
         self._pib._removeIdentity(identityName)
+        self._signerCache.clear()
         # TODO: Mark identity as invalid.
 
     def setDefaultIdentity(self, identity):
@@ -323,6 +330,7 @@ class KeyChain(object):
         :param PibIdentity identity: The identity to make the default.
         """
         self._pib._setDefaultIdentity(identity.getName())
+        self._signerCache.clear()
 
     # Key management
 
@@ -348,6 +356,7 @@ class KeyChain(object):
         # Set up the key info in the PIB.
         publicKey = self._tpm.getPublicKey(keyName)
         key = identity._addKey(publicKey.toBytes(), keyName)
+        self._signerCache.clear()
 
         logging.getLogger(__name__).info(
           "Requesting self-signing for newly created key " + key.getName().toUri())
@@ -369,6 +378,7 @@ class KeyChain(object):
               "` does not match key `" + keyName.toUri() + "`")
 
         identity._removeKey(keyName)
+        self._signerCache.clear()
         self._tpm._deleteKey(keyName)
 
     def setDefaultKey(self, identity, key):
@@ -384,6 +394,7 @@ class KeyChain(object):
               "` does not match key `" + key.getName().toUri() + "`")
 
         identity._setDefaultKey(key.getName())
+        self._signerCache.clear()
 
     # Certificate management
 
@@ -407,6 +418,7 @@ class KeyChain(object):
               certificate.getKeyName().toUri() + "`")
 
         key._addCertificate(certificate)
+        self._signerCache.clear()
 
     def deleteCertificate(self, key, certificateName):
         """
@@ -423,6 +435,7 @@ class KeyChain(object):
               certificateName.toUri() + "`")
 
         key._removeCertificate(certificateName)
+        self._signerCache.clear()
 
     def setDefaultCertificate(self, key, certificate):
         """
@@ -438,6 +451,7 @@ class KeyChain(object):
         # This replaces the certificate it it exists.
         self.addCertificate(key, certificate)
         key._setDefaultCertificate(certificate.getName())
+        self._signerCache.clear()
 
     # Signing
 
@@ -523,15 +537,20 @@ class KeyChain(object):
 
             data.setSignature(signatureInfo)
 
-            # Encode once to get the signed portion.
-            encoding = data.wireEncode(wireFormat)
-
-            signatureBytes = self._signBuffer(
-              encoding.toSignedBytes(), keyName[0], params.getDigestAlgorithm())
-            data.getSignature().setSignature(signatureBytes)
-
-            # Encode again to include the signature.
-            data.wireEncode(wireFormat)
+            def sign(signedPortion):
+                return self._signBuffer(
+                  signedPortion.toBytes(), keyName[0],
+                  params.getDigestAlgorithm())
+
+            # Encode the signed portion once, sign it and append the signature.
+            (encoding, signedPortionBeginOffset, signedPortionEndOffset) = \
+              wireFormat.encodeSignedData(data, sign)
+            if wireFormat == WireFormat.getDefaultWireFormat():
+                # Save the encoding the same as wireEncode would.
+                data._setDefaultWireEncoding(
+                  SignedBlob(encoding, signedPortionBeginOffset,
+                             signedPortionEndOffset),
+                  wireFormat)
         elif isinstance(target, Interest):
             interest = target
 
@@ -561,6 +580,81 @@ class KeyChain(object):
             return self._signBuffer(
               buffer, keyName[0], params.getDigestAlgorithm())
 
+    def signBatch(self, dataList, params = None, wireFormat = None,
+                  executor = None):
+        """
+        Sign each Data packet in the list with the same signing parameters, for
+        example the segments of a large object. This resolves the signing key
+        and makes the SignatureInfo only once, then encodes and signs each Data
+        packet, concurrently if executor is given (the cryptography library
+        releases the GIL while signing). This is only supported for security
+        v2.
+
+        :param dataList: The Data packets to sign. This replaces the Signature
+          of each, and updates its wireEncoding the same as sign(data, params).
+        :type dataList: list of Data
+        :param SigningInfo params: (optional) The signing parameters. If omitted,
+          use the PIB to get the default key of the default identity.
+        :param wireFormat: (optional) A WireFormat object used to encode the
+           Data packets. If omitted, use WireFormat.getDefaultWireFormat().
+        :type wireFormat: A subclass of WireFormat
+        :param executor: (optional) The executor to encode and sign the Data
+          packets, which is called as executor.map(function, iterable) such as
+          a concurrent.futures.ThreadPoolExecutor. (A process pool can't be
+          used because the key can't be sent to another process.) If omitted
+          or None, sign in series on the calling thread.
+        :return: The list of wire encodings of the signed Data packets, in the
+          order of dataList, which are ready to send.
+        :rtype: list of SignedBlob
+        :raises SecurityException: If this is a security v1 KeyChain.
+        """
+        if isinstance(params, WireFormat):
+            # Shift the arguments.
+            executor = wireFormat
+            wireFormat = params
+            params = None
+
+        if self._isSecurityV1:
+            raise SecurityException(
+              "signBatch is not supported for security v1. Use sign for each Data packet.")
+
+        if params == None:
+            params = KeyChain._defaultSigningInfo
+        if wireFormat == None:
+            wireFormat = WireFormat.getDefaultWireFormat()
+
+        keyName = [None]
+        signatureInfo = self._prepareSignatureInfo(params, keyName)
+        digestAlgorithm = params.getDigestAlgorithm()
+
+        if keyName[0].equals(SigningInfo.getDigestSha256Identity()):
+            def sign(signedPortion):
+                return self._signBuffer(
+                  signedPortion.toBytes(), keyName[0], digestAlgorithm)
+        else:
+            keyHandle = self._tpm._findKey(keyName[0])
+            def sign(signedPortion):
+                if keyHandle == None:
+                    # The same as _signBuffer if the key does not exist.
+                    return Blob()
+                return keyHandle.sign(digestAlgorithm, signedPortion.toBytes())
+
+        isDefaultWireFormat = (wireFormat == WireFormat.getDefaultWireFormat())
+        def signData(data):
+            data.setSignature(signatureInfo)
+            (encoding, signedPortionBeginOffset, signedPortionEndOffset) = \
+              wireFormat.encodeSignedData(data, sign)
+            wireEncoding = SignedBlob(
+              encoding, signedPortionBeginOffset, signedPortionEndOffset)
+            if isDefaultWireFormat:
+                data._setDefaultWireEncoding(wireEncoding, wireFormat)
+            return wireEncoding
+
+        if executor == None:
+            return [signData(data) for data in dataList]
+        else:
+            return list(executor.map(signData, dataList))
+
     def selfSign(self, key, wireFormat = None):
         """
         Generate a self-signed certificate for the public key and add it to the
@@ -605,6 +699,7 @@ class KeyChain(object):
 
         try:
             key._addCertificate(certificate)
+            self._signerCache.clear()
         except Exception as ex:
             # We don't expect this since we just created the certificate.
             raise KeyChain.Error("Error encoding certificate: " + str(ex))
@@ -685,6 +780,24 @@ class KeyChain(object):
         id = self._pib._addIdentity(identity)
         key = id._addKey(certificate.getPublicKey().toBytes(), keyName)
         key._addCertificate(certificate)
+        self._signerCache.clear()
+
+    def importSafeBags(self, safeBags, password = None):
+        """
+        Import each SafeBag in the list as with importSafeBag, but save the
+        changes to the PIB once at the end instead of after each SafeBag. If
+        importing a SafeBag fails, this raises the error and the SafeBags
+        already imported remain in the KeyChain.
+
+        :param safeBags: The SafeBag objects to import.
+        :type safeBags: list of SafeBag
+        :param password: (optional) The password for decrypting each private
+          key. See importSafeBag.
+        :type password: an array which implements the buffer protocol
+        """
+        with self._pib.batch():
+            for safeBag in safeBags:
+                self.importSafeBag(safeBag, password)
 
     # PIB & TPM backend registry
 
@@ -1578,7 +1691,8 @@ class KeyChain(object):
     def _prepareSignatureInfo(self, params, keyName):
         """
         Prepare a Signature object according to signingInfo and get the signing
-        key name.
+        key name. This uses the signer cache so that signing again with the
+        same signer does not need to look up the PIB.
 
         :param SigningInfo params: The signing parameters.
         :param Array<Name> keyName: Set keyName[0] to the signing key name.
@@ -1587,6 +1701,46 @@ class KeyChain(object):
         :raises InvalidSigningInfoError: when the requested signing method
           cannot be satisfied.
         """
+        if params.getSignerType() == SigningInfo.SignerType.SHA256:
+            keyName[0] = SigningInfo.getDigestSha256Identity()
+            return DigestSha256Signature()
+
+        cacheKey = (params.getSignerType(), params.getSignerName(),
+                    params.getDigestAlgorithm())
+        signer = self._signerCache.get(cacheKey)
+        if signer == None:
+            signer = self._resolveSigner(params)
+            if len(self._signerCache) >= KeyChain._maxSignerCacheSize:
+                self._signerCache.clear()
+            # Copy the Name.
+            self._signerCache[(cacheKey[0], Name(cacheKey[1]), cacheKey[2])] = \
+              signer
+        (signerKeyName, signatureTemplate) = signer
+
+        signatureInfo = signatureTemplate.clone()
+        if (params.getValidityPeriod().hasPeriod() and
+            ValidityPeriod.canGetFromSignature(signatureInfo)):
+            # Set the ValidityPeriod from the SigningInfo params.
+            ValidityPeriod.getFromSignature(signatureInfo).setPeriod(
+              params.getValidityPeriod().getNotBefore(),
+              params.getValidityPeriod().getNotAfter())
+
+        keyName[0] = signerKeyName
+        return signatureInfo
+
+    def _resolveSigner(self, params):
+        """
+        Look up the signing key in the PIB according to signingInfo and make the
+        Signature object with the SignatureInfo for it, without a
+        ValidityPeriod. This is only called by _prepareSignatureInfo.
+
+        :param SigningInfo params: The signing parameters.
+        :return: A Tuple of (keyName, signatureTemplate) where keyName is the
+          signing key name and signatureTemplate is the Signature object.
+        :rtype: (Name, Signature)
+        :raises InvalidSigningInfoError: when the requested signing method
+          cannot be satisfied.
+        """
         identity = None
         key = None
 
@@ -1595,8 +1749,8 @@ class KeyChain(object):
                 identity = self._pib.getDefaultIdentity()
             except Pib.Error:
                 # There is no default identity, so use sha256 for signing.
-                keyName[0] = SigningInfo.getDigestSha256Identity()
-                return DigestSha256Signature()
+                return (SigningInfo.getDigestSha256Identity(),
+                        DigestSha256Signature())
         elif params.getSignerType() == SigningInfo.SignerType.ID:
             identity = params.getPibIdentity()
             if identity == None:
@@ -1633,9 +1787,6 @@ class KeyChain(object):
                 raise InvalidSigningInfoError(
                   "Signing certificate `" + params.getSignerName().toUri() +
                   "` does not exist")
-        elif params.getSignerType() == SigningInfo.SignerType.SHA256:
-            keyName[0] = SigningInfo.getDigestSha256Identity()
-            return DigestSha256Signature()
         else:
             # We don't expect this to happen.
             raise InvalidSigningInfoError("Unrecognized signer type")
@@ -1660,19 +1811,11 @@ class KeyChain(object):
         else:
             raise KeyChain.Error("Unsupported key type")
 
-        if (params.getValidityPeriod().hasPeriod() and
-            ValidityPeriod.canGetFromSignature(signatureInfo)):
-            # Set the ValidityPeriod from the SigningInfo params.
-            ValidityPeriod.getFromSignature(signatureInfo).setPeriod(
-              params.getValidityPeriod().getNotBefore(),
-              params.getValidityPeriod().getNotAfter())
-
         keyLocator = KeyLocator.getFromSignature(signatureInfo)
         keyLocator.setType(KeyLocatorType.KEYNAME)
         keyLocator.setKeyName(key.getName())
 
-        keyName[0] = key.getName()
-        return signatureInfo
+        return (Name(key.getName()), signatureInfo)
 
     def _signBuffer(self, buffer, keyName, digestAlgorithm):
         """
@@ -1771,6 +1914,7 @@ class KeyChain(object):
     _pibFactories = None # str => MakePibImpl
     _tpmFactories = None # str => MakeTpmBackEnd
     _defaultSigningInfo = SigningInfo()
+    _maxSignerCacheSize = 100
     _defaultKeyParams = RsaKeyParams()
 
 class InvalidSigningInfoError(KeyChain.Error):
@@ -83,6 +83,16 @@ class Pib(object):
         """
         return self._scheme + ":" + self._location
 
+    def batch(self):
+        """
+        Return a context manager to group many changes to the PIB so that the
+        PIB implementation can save them once at the end, for example
+        with pib.batch(): ... . See PibImpl.batch.
+
+        :return: The context manager from the PibImpl.
+        """
+        return self._pibImpl.batch()
+
     def setTpmLocator(self, tpmLocator):
         """
         Set the corresponding TPM information to tpmLocator. If the tpmLocator
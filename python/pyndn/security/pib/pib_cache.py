@@ -0,0 +1,469 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the PibCache class which extends PibImpl to keep the
+results of lookups in another PibImpl, such as PibSqlite3, in memory. Changes
+are written through to the other PibImpl.
+"""
+
+from pyndn.name import Name
+from pyndn.security.pib.pib import Pib
+from pyndn.security.v2.certificate_v2 import CertificateV2
+from pyndn.security.pib.pib_impl import PibImpl
+
+class PibCache(PibImpl):
+    """
+    Create a PibCache to cache lookups in the given PibImpl. The first lookup
+    of a TPM locator, identity, key or certificate (including the defaults)
+    reads from pibImpl, and later lookups are answered from memory. Each change
+    is written through to pibImpl and then clears the cache, since a change in
+    the PIB can also change defaults and remove related keys and certificates.
+    The lists returned by getIdentities, getKeysOfIdentity and
+    getCertificatesOfKey are not cached. This assumes that only this PibCache
+    changes the contents of pibImpl while it is in use, for example
+    KeyChain(PibCache(PibSqlite3()), TpmBackEndFile()) . This is meant for a
+    PIB with a modest number of identities which is read much more than it is
+    changed: Each kind of cached lookup keeps at most 1000 entries (then it is
+    cleared and filled again), and each change clears the whole cache.
+
+    :param PibImpl pibImpl: The PibImpl to cache.
+    """
+    def __init__(self, pibImpl):
+        super(PibCache, self).__init__()
+
+        self._pibImpl = pibImpl
+        self._clear()
+        # This is not cleared by changes to the identities.
+        self._tpmLocator = None
+
+    def getPibImpl(self):
+        """
+        Get the PibImpl given to the constructor.
+
+        :return: The cached PibImpl.
+        :rtype: PibImpl
+        """
+        return self._pibImpl
+
+    def batch(self):
+        """
+        Return the context manager from batch() of the cached PibImpl.
+        """
+        return self._pibImpl.batch()
+
+    # TpmLocator management.
+
+    def setTpmLocator(self, tpmLocator):
+        """
+        Set the corresponding TPM information to tpmLocator. This method does not
+        reset the contents of the PIB.
+
+        :param str tpmLocator: The TPM locator string.
+        """
+        self._pibImpl.setTpmLocator(tpmLocator)
+        self._tpmLocator = tpmLocator
+
+    def getTpmLocator(self):
+        """
+        Get the TPM Locator.
+
+        :return: The TPM locator string.
+        :rtype: str
+        """
+        if self._tpmLocator == None:
+            self._tpmLocator = self._pibImpl.getTpmLocator()
+
+        return self._tpmLocator
+
+    # Identity management.
+
+    def hasIdentity(self, identityName):
+        """
+        Check for the existence of an identity.
+
+        :param Name identityName: The name of the identity.
+        :return: True if the identity exists, otherwise False.
+        :rtype: bool
+        """
+        result = self._hasIdentity.get(identityName)
+        if result == None:
+            result = self._pibImpl.hasIdentity(identityName)
+            PibCache._put(self._hasIdentity, Name(identityName), result)
+
+        return result
+
+    def addIdentity(self, identityName):
+        """
+        Add the identity. If the identity already exists, do nothing. If no
+        default identity has been set, set the added identity as the default.
+
+        :param Name identityName: The name of the identity to add. This copies
+          the name.
+        """
+        self._pibImpl.addIdentity(identityName)
+        self._clear()
+
+    def removeIdentity(self, identityName):
+        """
+        Remove the identity and its related keys and certificates. If the
+        default identity is being removed, no default identity will be selected.
+        If the identity does not exist, do nothing.
+
+        :param Name identityName: The name of the identity to remove.
+        """
+        self._pibImpl.removeIdentity(identityName)
+        self._clear()
+
+    def clearIdentities(self):
+        """
+        Erase all certificates, keys, and identities.
+        """
+        self._pibImpl.clearIdentities()
+        self._clear()
+
+    def getIdentities(self):
+        """
+        Get the names of all the identities from the cached PibImpl.
+
+        :return: A fresh set of identity names. The Name objects are fresh
+          copies.
+        :rtype: set of Name
+        """
+        return self._pibImpl.getIdentities()
+
+    def setDefaultIdentity(self, identityName):
+        """
+        Set the identity with the identityName as the default identity. If the
+        identity with identityName does not exist, then it will be created.
+
+        :param Name identityName: The name for the default identity. This copies
+          the name.
+        """
+        self._pibImpl.setDefaultIdentity(identityName)
+        self._clear()
+
+    def getDefaultIdentity(self):
+        """
+        Get the default identity.
+
+        :return: The name of the default identity, as a fresh copy.
+        :rtype: Name
+        :raises Pib.Error: For no default identity.
+        """
+        if not self._isDefaultIdentityNameCached:
+            try:
+                self._defaultIdentityName = self._pibImpl.getDefaultIdentity()
+            except Pib.Error:
+                self._defaultIdentityName = None
+            self._isDefaultIdentityNameCached = True
+
+        if self._defaultIdentityName == None:
+            raise Pib.Error("No default identity")
+
+        # Copy the name.
+        return Name(self._defaultIdentityName)
+
+    # Key management.
+
+    def hasKey(self, keyName):
+        """
+        Check for the existence of a key with keyName.
+
+        :param Name keyName: The name of the key.
+        :return: True if the key exists, otherwise False. Return False if the
+          identity does not exist.
+        :rtype: bool
+        """
+        return self._getKeyBits(keyName) != None
+
+    def addKey(self, identityName, keyName, key):
+        """
+        Add the key. If a key with the same name already exists, overwrite the
+        key. If the identity does not exist, it will be created. If no default
+        key for the identity has been set, then set the added key as the default
+        for the identity.  If no default identity has been set, identity becomes
+        the default.
+
+        :param Name identityName: The name of the identity that the key belongs
+          to. This copies the name.
+        :param Name keyName:  The name of the key. This copies the name.
+        :param key: The public key bits. This copies the array.
+        :type key: an array which implements the buffer protocol
+        """
+        self._pibImpl.addKey(identityName, keyName, key)
+        self._clear()
+
+    def removeKey(self, keyName):
+        """
+        Remove the key with keyName and its related certificates. If the key
+        does not exist, do nothing.
+
+        :param Name keyName: The name of the key.
+        """
+        self._pibImpl.removeKey(keyName)
+        self._clear()
+
+    def getKeyBits(self, keyName):
+        """
+        Get the key bits of a key with name keyName.
+
+        :param Name keyName: The name of the key.
+        :return: The key bits.
+        :rtype: Blob
+        :raises Pib.Error: If the key does not exist.
+        """
+        keyBits = self._getKeyBits(keyName)
+        if keyBits == None:
+            raise Pib.Error("Key `" + keyName.toUri() + "` not found")
+
+        return keyBits
+
+    def getKeysOfIdentity(self, identityName):
+        """
+        Get all the key names of the identity with the name identityName from
+        the cached PibImpl.
+
+        :param Name identityName: The name of the identity.
+        :return: The set of key names. The Name objects are fresh copies. If the
+          identity does not exist, return an empty set.
+        :rtype: set of Name
+        """
+        return self._pibImpl.getKeysOfIdentity(identityName)
+
+    def setDefaultKeyOfIdentity(self, identityName, keyName):
+        """
+        Set the key with keyName as the default key for the identity with name
+        identityName.
+
+        :param Name identityName: The name of the identity. This copies the name.
+        :param Name keyName: The name of the key. This copies the name.
+        :raises Pib.Error: If the key does not exist.
+        """
+        self._pibImpl.setDefaultKeyOfIdentity(identityName, keyName)
+        self._clear()
+
+    def getDefaultKeyOfIdentity(self, identityName):
+        """
+        Get the name of the default key for the identity with name identityName.
+
+        :param Name identityName: The name of the identity.
+        :return: The name of the default key, as a fresh copy.
+        :rtype: Name
+        :raises Pib.Error: If there is no default key or if the identity does
+          not exist.
+        """
+        if identityName in self._defaultKeyNames:
+            defaultKeyName = self._defaultKeyNames[identityName]
+        else:
+            try:
+                defaultKeyName = self._pibImpl.getDefaultKeyOfIdentity(
+                  identityName)
+            except Pib.Error:
+                defaultKeyName = None
+            PibCache._put(
+              self._defaultKeyNames, Name(identityName), defaultKeyName)
+
+        if defaultKeyName == None:
+            raise Pib.Error(
+              "No default key for identity `" + identityName.toUri() + "`")
+
+        # Copy the name.
+        return Name(defaultKeyName)
+
+    # Certificate management.
+
+    def hasCertificate(self, certificateName):
+        """
+        Check for the existence of a certificate with name certificateName.
+
+        :param Name certificateName: The name of the certificate.
+        :return: True if the certificate exists, otherwise False.
+        :rtype: bool
+        """
+        return self._getCertificate(certificateName) != None
+
+    def addCertificate(self, certificate):
+        """
+        Add the certificate. If a certificate with the same name (without
+        implicit digest) already exists, then overwrite the certificate. If the
+        key or identity does not exist, they will be created. If no default
+        certificate for the key has been set, then set the added certificate as
+        the default for the key. If no default key was set for the identity, it
+        will be set as the default key for the identity. If no default identity
+        was selected, the certificate's identity becomes the default.
+
+        :param CertificateV2 certificate: The certificate to add. This copies
+          the object.
+        """
+        self._pibImpl.addCertificate(certificate)
+        self._clear()
+
+    def removeCertificate(self, certificateName):
+        """
+        Remove the certificate with name certificateName. If the certificate
+        does not exist, do nothing.
+
+        :param Name certificateName: The name of the certificate.
+        """
+        self._pibImpl.removeCertificate(certificateName)
+        self._clear()
+
+    def getCertificate(self, certificateName):
+        """
+        Get the certificate with name certificateName.
+
+        :param Name certificateName: The name of the certificate.
+        :return: A copy of the certificate.
+        :rtype: CertificateV2
+        :raises Pib.Error: If the certificate does not exist.
+        """
+        certificate = self._getCertificate(certificateName)
+        if certificate == None:
+            raise Pib.Error(
+              "Certificate `" + certificateName.toUri() +  "` does not exist")
+
+        return CertificateV2(certificate)
+
+    def getCertificatesOfKey(self, keyName):
+        """
+        Get a list of certificate names of the key with id keyName from the
+        cached PibImpl.
+
+        :param Name keyName: The name of the key.
+        :return: The set of certificate names. The Name objects are fresh
+          copies. If the key does not exist, return an empty set.
+        :rtype: set of Name
+        """
+        return self._pibImpl.getCertificatesOfKey(keyName)
+
+    def setDefaultCertificateOfKey(self, keyName, certificateName):
+        """
+        Set the cert with name certificateName as the default for the key with
+        keyName.
+
+        :param Name keyName: The name of the key.
+        :param Name certificateName: The name of the certificate. This copies
+          the name.
+        :raises Pib.Error: If the certificate with name certificateName does not
+          exist.
+        """
+        self._pibImpl.setDefaultCertificateOfKey(keyName, certificateName)
+        self._clear()
+
+    def getDefaultCertificateOfKey(self, keyName):
+        """
+        Get the default certificate for the key with keyName.
+
+        :param Name keyName: The name of the key.
+        :return: A copy of the default certificate.
+        :rtype: CertificateV2
+        :raises Pib.Error: If the default certificate does not exist.
+        """
+        if keyName in self._defaultCertificateNames:
+            certificateName = self._defaultCertificateNames[keyName]
+        else:
+            try:
+                certificate = self._pibImpl.getDefaultCertificateOfKey(keyName)
+                certificateName = Name(certificate.getName())
+                # Cache the certificate too since we have it.
+                PibCache._put(self._certificates, certificateName, certificate)
+            except Pib.Error:
+                certificateName = None
+            PibCache._put(
+              self._defaultCertificateNames, Name(keyName), certificateName)
+
+        if certificateName == None:
+            raise Pib.Error(
+              "No default certificate for key `" + keyName.toUri() + "`")
+
+        return self.getCertificate(certificateName)
+
+    def _getKeyBits(self, keyName):
+        """
+        Get the key bits from the cache, or from the PibImpl if not cached.
+
+        :param Name keyName: The name of the key.
+        :return: The key bits, or None if the key does not exist.
+        :rtype: Blob
+        """
+        if keyName in self._keyBits:
+            return self._keyBits[keyName]
+
+        try:
+            keyBits = self._pibImpl.getKeyBits(keyName)
+        except Pib.Error:
+            keyBits = None
+        PibCache._put(self._keyBits, Name(keyName), keyBits)
+        return keyBits
+
+    def _getCertificate(self, certificateName):
+        """
+        Get the certificate from the cache, or from the PibImpl if not cached.
+
+        :param Name certificateName: The name of the certificate.
+        :return: The cached certificate which the caller must not modify, or
+          None if the certificate does not exist.
+        :rtype: CertificateV2
+        """
+        if certificateName in self._certificates:
+            return self._certificates[certificateName]
+
+        try:
+            certificate = self._pibImpl.getCertificate(certificateName)
+        except Pib.Error:
+            certificate = None
+        PibCache._put(self._certificates, Name(certificateName), certificate)
+        return certificate
+
+    @staticmethod
+    def _put(cache, key, value):
+        """
+        Put the value in the cache dict. If the cache has _maxCacheSize
+        entries, clear it first so that lookups of many different names
+        (including names which don't exist) don't grow it without limit.
+
+        :param dict cache: The cache dict such as self._certificates.
+        :param Name key: The key, which the caller has copied if needed.
+        :param value: The value.
+        """
+        if len(cache) >= PibCache._maxCacheSize:
+            cache.clear()
+        cache[key] = value
+
+    def _clear(self):
+        """
+        Clear the cached identities, keys and certificates, including the
+        cached defaults and the records that an item does not exist.
+        """
+        # identityName => bool.
+        self._hasIdentity = {}
+        self._defaultIdentityName = None
+        self._isDefaultIdentityNameCached = False
+        # identityName => default key Name, or None if no default.
+        self._defaultKeyNames = {}
+        # keyName => keyBits Blob, or None if the key does not exist.
+        self._keyBits = {}
+        # keyName => default certificate Name, or None if no default.
+        self._defaultCertificateNames = {}
+        # certificateName => CertificateV2, or None if it does not exist.
+        self._certificates = {}
+
+    # The maximum number of entries in each of the cache dicts.
+    _maxCacheSize = 1000
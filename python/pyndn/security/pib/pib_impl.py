@@ -24,6 +24,8 @@ PIB implementation used by the Pib class. This class defines the interface that
 an actual PIB implementation should provide, for example PibMemory.
 """
 
+from contextlib import contextmanager
+
 class PibImpl(object):
     class Error(Exception):
         """
@@ -36,6 +38,18 @@ class PibImpl(object):
         def __init__(self, message):
             super(PibImpl.Error, self).__init__(message)
 
+    @contextmanager
+    def batch(self):
+        """
+        Return a context manager to group many changes to the PIB, for example
+        with pibImpl.batch(): ... . A PIB implementation with persistent
+        storage can save the changes once at the end of the batch instead of
+        after each change. Batches can be nested, in which case the changes
+        are saved at the end of the outermost batch. This base implementation
+        does nothing special, which is what an in-memory PIB needs.
+        """
+        yield self
+
     # TpmLocator management.
 
     def setTpmLocator(self, tpmLocator):
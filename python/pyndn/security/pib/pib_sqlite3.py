@@ -27,6 +27,7 @@ more persistent storage than PibMemory.
 
 import os
 import sqlite3
+from contextlib import contextmanager
 from pyndn.name import Name
 from pyndn.util.blob import Blob
 from pyndn.security.v2.certificate_v2 import CertificateV2
@@ -219,6 +220,8 @@ class PibSqlite3(PibImpl):
     def __init__(self, databaseDirectoryPath = None,
           databaseFilename = "pib.db"):
         super(PibSqlite3, self).__init__()
+        # The nesting level of batch().
+        self._batchDepth = 0
 
         if databaseDirectoryPath == None or databaseDirectoryPath == "":
             databaseDirectoryPath = PibSqlite3.getDefaultDatabaseDirectoryPath()
@@ -238,6 +241,10 @@ class PibSqlite3(PibImpl):
             cursor = self._database.cursor()
             # Enable foreign keys.
             cursor.execute("PRAGMA foreign_keys = ON")
+            # Use write-ahead logging so that a commit only needs to append to
+            # the log. (This returns the resulting mode, which may be
+            # unchanged if the file system doesn't support it.)
+            cursor.execute("PRAGMA journal_mode = WAL")
 
             # Initialize the PIB tables.
             for command in INITIALIZATION:
@@ -251,6 +258,32 @@ class PibSqlite3(PibImpl):
     def getScheme():
         return "pib-sqlite3"
 
+    @contextmanager
+    def batch(self):
+        """
+        Return a context manager to group many changes to the PIB, for example
+        with pibImpl.batch(): ... . Each change method normally commits to the
+        database, but inside a batch the changes are committed once at the
+        end of the outermost batch. This is for performance, not atomicity: if
+        an exception is raised in the batch, the changes made so far are still
+        committed, so that the database stays consistent with the TPM and the
+        objects in the Pib.
+        """
+        self._batchDepth += 1
+        try:
+            yield self
+        finally:
+            self._batchDepth -= 1
+            if self._batchDepth == 0:
+                self._commit()
+
+    def _commit(self):
+        """
+        Commit the changes to the database, unless this is inside a batch.
+        """
+        if self._batchDepth == 0:
+            self._database.commit()
+
     # TpmLocator management.
 
     def setTpmLocator(self, tpmLocator):
@@ -266,13 +299,13 @@ class PibSqlite3(PibImpl):
                 cursor = self._database.cursor()
                 cursor.execute(
                   "INSERT INTO tpmInfo (tpm_locator) values (?)", (tpmLocator, ))
-                self._database.commit()
+                self._commit()
                 cursor.close()
             else:
                 # Update the existing tpmLocator.
                 cursor = self._database.cursor()
                 cursor.execute("UPDATE tpmInfo SET tpm_locator=?", (tpmLocator, ))
-                self._database.commit()
+                self._commit()
                 cursor.close()
         except Exception as ex:
             raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -335,7 +368,7 @@ class PibSqlite3(PibImpl):
                 cursor.execute(
                   "INSERT INTO identities (identity) values (?)",
                   (sqlite3.Binary(bytearray(identityName.wireEncode().buf())), ))
-                self._database.commit()
+                self._commit()
                 cursor.close()
             except Exception as ex:
                 raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -356,7 +389,7 @@ class PibSqlite3(PibImpl):
             cursor.execute(
               "DELETE FROM identities WHERE identity=?",
               (sqlite3.Binary(bytearray(identityName.wireEncode().buf())), ))
-            self._database.commit()
+            self._commit()
             cursor.close()
         except Exception as ex:
             raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -368,7 +401,7 @@ class PibSqlite3(PibImpl):
         try:
             cursor = self._database.cursor()
             cursor.execute("DELETE FROM identities")
-            self._database.commit()
+            self._commit()
             cursor.close()
         except Exception as ex:
             raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -411,7 +444,7 @@ class PibSqlite3(PibImpl):
                 cursor.execute(
                   "INSERT INTO identities (identity) values (?)",
                   (sqlite3.Binary(bytearray(identityName.wireEncode().buf())), ))
-                self._database.commit()
+                self._commit()
                 cursor.close()
             except Exception as ex:
                 raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -421,7 +454,7 @@ class PibSqlite3(PibImpl):
             cursor.execute(
               "UPDATE identities SET is_default=1 WHERE identity=?",
               (sqlite3.Binary(bytearray(identityName.wireEncode().buf())), ))
-            self._database.commit()
+            self._commit()
             cursor.close()
         except Exception as ex:
             raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -503,7 +536,7 @@ class PibSqlite3(PibImpl):
                   (sqlite3.Binary(bytearray(identityName.wireEncode().buf())),
                    sqlite3.Binary(bytearray(keyName.wireEncode().buf())),
                    sqlite3.Binary(bytearray(key))))
-                self._database.commit()
+                self._commit()
                 cursor.close()
             except Exception as ex:
                 raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -514,7 +547,7 @@ class PibSqlite3(PibImpl):
                    "UPDATE keys SET key_bits=? WHERE key_name=?",
                   (sqlite3.Binary(bytearray(key)),
                    sqlite3.Binary(bytearray(keyName.wireEncode().buf()))))
-                self._database.commit()
+                self._commit()
                 cursor.close()
             except Exception as ex:
                 raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -534,7 +567,7 @@ class PibSqlite3(PibImpl):
             cursor.execute(
               "DELETE FROM keys WHERE key_name=?",
               (sqlite3.Binary(bytearray(keyName.wireEncode().buf())), ))
-            self._database.commit()
+            self._commit()
             cursor.close()
         except Exception as ex:
             raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -615,7 +648,7 @@ class PibSqlite3(PibImpl):
             cursor.execute(
               "UPDATE keys SET is_default=1 WHERE key_name=?",
               (sqlite3.Binary(bytearray(keyName.wireEncode().buf())), ))
-            self._database.commit()
+            self._commit()
             cursor.close()
         except Exception as ex:
             raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -710,7 +743,7 @@ class PibSqlite3(PibImpl):
                   (sqlite3.Binary(bytearray(certificate.getKeyName().wireEncode().buf())),
                    sqlite3.Binary(bytearray(certificate.getName().wireEncode().buf())),
                    sqlite3.Binary(bytearray(certificate.wireEncode().buf()))))
-                self._database.commit()
+                self._commit()
                 cursor.close()
             except Exception as ex:
                 raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -721,7 +754,7 @@ class PibSqlite3(PibImpl):
                    "UPDATE certificates SET certificate_data=? WHERE certificate_name=?",
                   (sqlite3.Binary(bytearray(certificate.wireEncode().buf())),
                    sqlite3.Binary(bytearray(certificate.getName().wireEncode().buf()))))
-                self._database.commit()
+                self._commit()
                 cursor.close()
             except Exception as ex:
                 raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -742,7 +775,7 @@ class PibSqlite3(PibImpl):
             cursor.execute(
              "DELETE FROM certificates WHERE certificate_name=?",
               (sqlite3.Binary(bytearray(certificateName.wireEncode().buf())), ))
-            self._database.commit()
+            self._commit()
             cursor.close()
         except Exception as ex:
             raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -830,7 +863,7 @@ class PibSqlite3(PibImpl):
             cursor.execute(
               "UPDATE certificates SET is_default=1 WHERE certificate_name=?",
               (sqlite3.Binary(bytearray(certificateName.wireEncode().buf())), ))
-            self._database.commit()
+            self._commit()
             cursor.close()
         except Exception as ex:
             raise PibImpl.Error("PibSqlite3: SQLite error: " + str(ex))
@@ -110,6 +110,9 @@ class ConfigPolicyManager(PolicyManager):
         self._keyGraceInterval = graceInterval
         self._keyTimestampTtl = keyTimestampTtl
         self._maxTrackedKeys = maxTrackedKeys
+        # The compiled matchers for the regex strings in the rules. This is
+        # per instance since a matcher keeps the state of its last match.
+        self._regexCache = NdnRegexTopMatcher.Cache()
 
         self.reset()
 
@@ -308,7 +311,7 @@ class ConfigPolicyManager(PolicyManager):
             # this just means the data/interest name has the signing identity as a prefix
             # that means everything before 'ksk-?' in the key name
             identityRegex = '^([^<KEY>]*)<KEY>(<>*)<ksk-.+><ID-CERT>'
-            identityMatch = NdnRegexTopMatcher(identityRegex)
+            identityMatch = self._regexCache.get(identityRegex)
             if identityMatch.match(signatureName):
                 identityPrefix = identityMatch.expand("\\1").append(
                   identityMatch.expand("\\2"))
@@ -323,7 +326,7 @@ class ConfigPolicyManager(PolicyManager):
             if not self._isSecurityV1:
                 # Check for a security v2 key name.
                 identityRegex2 = "^(<>*)<KEY><>$"
-                identityMatch2 = NdnRegexTopMatcher(identityRegex2)
+                identityMatch2 = self._regexCache.get(identityRegex2)
                 if identityMatch2.match(signatureName):
                     identityPrefix = identityMatch2.expand("\\1")
                     if self._matchesRelation(objectName, identityPrefix, 'is-prefix-of'):
@@ -357,7 +360,7 @@ class ConfigPolicyManager(PolicyManager):
             # Is this a simple regex?
             simpleKeyRegex = keyLocatorInfo.getFirstValue("regex")
             if simpleKeyRegex != None:
-                if NdnRegexTopMatcher(simpleKeyRegex).match(signatureName):
+                if self._regexCache.get(simpleKeyRegex).match(signatureName):
                     return True
                 else:
                     failureReason[0] = ("The custom signatureName \"" +
@@ -379,7 +382,7 @@ class ConfigPolicyManager(PolicyManager):
                 if (keyRegex != None and keyExpansion != None and
                       nameRegex != None and nameExpansion != None and
                       relationType != None):
-                    keyMatch = NdnRegexTopMatcher(keyRegex)
+                    keyMatch = self._regexCache.get(keyRegex)
                     if not keyMatch.match(signatureName):
                         failureReason[0] = (
                           "The custom hyper-relation signatureName \"" +
@@ -388,7 +391,7 @@ class ConfigPolicyManager(PolicyManager):
                         return False
                     keyMatchPrefix = keyMatch.expand(keyExpansion)
 
-                    nameMatch = NdnRegexTopMatcher(nameRegex)
+                    nameMatch = self._regexCache.get(nameRegex)
                     if not nameMatch.match(objectName):
                         failureReason[0] = (
                           "The custom hyper-relation objectName \"" +
@@ -506,7 +509,7 @@ class ConfigPolicyManager(PolicyManager):
                             matchName = Name(matchUri)
                             passed = self._matchesRelation(objName, matchName, matchRelation)
                         else:
-                            passed =  NdnRegexTopMatcher(regexPattern).match(objName)
+                            passed =  self._regexCache.get(regexPattern).match(objName)
 
                         if not passed:
                             break
@@ -20,7 +20,6 @@
 
 from pyndn.security.verification_helpers import VerificationHelpers
 from pyndn.security.security_types import DigestAlgorithm
-from pyndn.security.certificate.public_key import PublicKey
 from pyndn.digest_sha256_signature import DigestSha256Signature
 from pyndn.sha256_with_rsa_signature import Sha256WithRsaSignature
 from pyndn.sha256_with_ecdsa_signature import Sha256WithEcdsaSignature
@@ -148,9 +147,11 @@ class PolicyManager(object):
             isinstance(signature, Sha256WithEcdsaSignature)):
             if publicKeyDer.isNull():
                 return False
+            # Pass the DER so that verifySignature can use its cache of
+            # parsed public keys.
             return VerificationHelpers.verifySignature(
               signedBlob.toSignedBytes(), signature.getSignature(),
-              PublicKey(publicKeyDer), DigestAlgorithm.SHA256)
+              publicKeyDer, DigestAlgorithm.SHA256)
         elif isinstance(signature, DigestSha256Signature):
             return VerificationHelpers.verifyDigest(
               signedBlob.toSignedBytes(), signature.getSignature(),
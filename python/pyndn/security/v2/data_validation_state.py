@@ -88,7 +88,18 @@ class DataValidationState(ValidationState):
         :param CertificateV2 trustedCertificate: The certificate that signs the
           original packet.
         """
-        if VerificationHelpers.verifyDataSignature(self._data, trustedCertificate):
+        self._finishVerifyOriginalPacket(
+          VerificationHelpers.verifyDataSignature(self._data, trustedCertificate))
+
+    def _finishVerifyOriginalPacket(self, isVerified):
+        """
+        Call the success or failure callback for the result of verifying the
+        signature of the original packet. This is only called by
+        _verifyOriginalPacket and the Validator class.
+
+        :param bool isVerified: True if the signature verified.
+        """
+        if isVerified:
             logging.getLogger(__name__).info("OK signature for data `" +
               self._data.getName().toUri() + "`")
             try:
@@ -45,6 +45,7 @@ certificates.
 
 import logging
 from pyndn.data import Data
+from pyndn.security.verification_helpers import VerificationHelpers
 from pyndn.security.v2.validation_error import ValidationError
 from pyndn.security.v2.data_validation_state import DataValidationState
 from pyndn.security.v2.interest_validation_state import InterestValidationState
@@ -148,6 +149,48 @@ class Validator(CertificateStorage):
                 self._requestCertificate(certificateRequest, state)
         self._policy.checkPolicy(dataOrInterest, state, continueValidate)
 
+    def validateBatch(self, dataList, successCallback, failureCallback,
+                      executor = None):
+        """
+        Asynchronously validate the list of Data packets, such as the segments
+        of an object, which usually share a certificate chain. This checks the
+        policy for each Data packet, but fetches and validates the certificate
+        chain for each needed certificate only once. When the certificate chain
+        of every Data packet is validated (or validation has failed), this
+        verifies the signatures of the Data packets, concurrently if executor is
+        given (the cryptography library releases the GIL while verifying), and
+        then calls successCallback or failureCallback for each of them in the
+        order of dataList. (If validation fails before verifying the signature,
+        for example because of the policy, this calls failureCallback right
+        away.)
+
+        :param dataList: The Data packets to validate, which are copied.
+        :type dataList: list of Data
+        :param successCallback: On validation success, this calls
+          successCallback(data) for each Data packet.
+        :type successCallback: function object
+        :param failureCallback: On validation failure, this calls
+          failureCallback(data, error) for each Data packet, where error is a
+          ValidationError.
+        :type failureCallback: function object
+        :param executor: (optional) The executor to verify the signatures, which
+          is called as executor.map(function, iterable) such as a
+          concurrent.futures.ThreadPoolExecutor. If omitted or None, verify
+          the signatures in series on the calling thread.
+        """
+        states = []
+        for i in range(len(dataList)):
+            states.append(Validator._BatchDataValidationState(
+              dataList[i], successCallback, failureCallback, i))
+
+        batch = Validator._ValidationBatch(self, states, executor)
+        for i in range(len(dataList)):
+            logging.getLogger(__name__).info("Start validating data " +
+              dataList[i].getName().toUri())
+            batch.start(dataList[i], states[i])
+
+        batch.checkFinished()
+
     def _validateCertificate(self, certificate, state):
         """
         Recursively validate the certificates in the certification chain.
@@ -213,3 +256,142 @@ class Validator(CertificateStorage):
 
         self._certificateFetcher.fetch(
           certificateRequest, state, self._validateCertificate)
+
+    class _BatchDataValidationState(DataValidationState):
+        """
+        A _BatchDataValidationState extends DataValidationState to report to a
+        _ValidationBatch when the state is ready to verify the original packet
+        (instead of verifying it) or has finished without needing to.
+        """
+        def __init__(self, data, successCallback, failureCallback, batchIndex):
+            super(Validator._BatchDataValidationState, self).__init__(
+              data, successCallback, failureCallback)
+            # The index in the dataList given to validateBatch.
+            self._batchIndex = batchIndex
+            self._batch = None
+            # The name of the requested certificate, if this state is leading
+            # the validation of the certificate chain for other states.
+            self._leaderCertificateName = None
+            self._isReady = False
+
+        def fail(self, error):
+            super(Validator._BatchDataValidationState, self).fail(error)
+            if not self._isReady:
+                self._isReady = True
+                self._batch.onStateReady(self, None)
+
+        def _verifyOriginalPacket(self, trustedCertificate):
+            # The certificate chain is verified. Cache it now so that the states
+            # waiting for the same certificate find it as trusted.
+            for certificate in self._certificateChain:
+                self._batch._validator.cacheVerifiedCertificate(certificate)
+
+            self._isReady = True
+            self._batch.onStateReady(self, trustedCertificate)
+
+        def _bypassValidation(self):
+            super(Validator._BatchDataValidationState, self)._bypassValidation()
+            self._isReady = True
+            self._batch.onStateReady(self, None)
+
+    class _ValidationBatch(object):
+        """
+        A _ValidationBatch holds the states for one call to validateBatch, and
+        verifies the original packets when all the states are ready.
+
+        :param Validator validator: The Validator.
+        :param list states: The list of _BatchDataValidationState.
+        :param executor: The executor from validateBatch, or None.
+        """
+        def __init__(self, validator, states, executor):
+            self._validator = validator
+            self._executor = executor
+            self._nStatesNotReady = len(states)
+            for state in states:
+                state._batch = self
+            # The list of (state, trustedCertificate) to verify.
+            self._verifications = []
+            # The key is the Name of a requested certificate. The value is the
+            # list of (certificateRequest, state) waiting for the state which
+            # is validating the certificate chain.
+            self._waitingStates = {}
+            self._isFinished = False
+
+        def start(self, data, state):
+            """
+            Check the policy for the Data packet and request the certificate,
+            unless another state is already requesting the same certificate.
+            """
+            def continueValidate(certificateRequest, state):
+                if certificateRequest == None:
+                    state._bypassValidation()
+                    return
+
+                certificateName = certificateRequest._interest.getName()
+                if certificateName in self._waitingStates:
+                    self._waitingStates[certificateName].append(
+                      (certificateRequest, state))
+                    return
+
+                self._waitingStates[certificateName] = []
+                self._requestCertificate(certificateRequest, state)
+            self._validator._policy.checkPolicy(data, state, continueValidate)
+
+        def onStateReady(self, state, trustedCertificate):
+            """
+            The state calls this when it is ready to verify the original packet
+            with trustedCertificate, or has finished if trustedCertificate is
+            None.
+            """
+            if trustedCertificate != None:
+                self._verifications.append((state, trustedCertificate))
+            self._nStatesNotReady -= 1
+
+            certificateName = state._leaderCertificateName
+            if certificateName != None:
+                state._leaderCertificateName = None
+                waiting = self._waitingStates.pop(certificateName, [])
+                if trustedCertificate != None:
+                    # The certificate chain is cached, so the waiting states
+                    # will find the trusted certificate right away.
+                    for (certificateRequest, waitingState) in waiting:
+                        self._validator._requestCertificate(
+                          certificateRequest, waitingState)
+                elif len(waiting) > 0:
+                    # Let the next waiting state try to validate the chain.
+                    self._waitingStates[certificateName] = waiting[1:]
+                    self._requestCertificate(waiting[0][0], waiting[0][1])
+
+            self.checkFinished()
+
+        def checkFinished(self):
+            """
+            If all the states are ready, verify the original packets and call
+            the callbacks.
+            """
+            if self._nStatesNotReady > 0 or self._isFinished:
+                return
+            self._isFinished = True
+
+            # The states became ready in the order that their certificate
+            # chains were validated, so restore the order of dataList.
+            self._verifications.sort(
+              key = lambda verification: verification[0]._batchIndex)
+
+            def verify(verification):
+                return VerificationHelpers.verifyDataSignature(
+                  verification[0].getOriginalData(), verification[1])
+
+            if self._executor == None:
+                results = [verify(verification)
+                           for verification in self._verifications]
+            else:
+                results = list(self._executor.map(verify, self._verifications))
+
+            for i in range(len(self._verifications)):
+                self._verifications[i][0]._finishVerifyOriginalPacket(
+                  results[i])
+
+        def _requestCertificate(self, certificateRequest, state):
+            state._leaderCertificateName = certificateRequest._interest.getName()
+            self._validator._requestCertificate(certificateRequest, state)
@@ -23,6 +23,8 @@ This module defines the VerificationHelpers which has static methods to verify
 signatures and digests.
 """
 
+import threading
+from collections import OrderedDict
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.asymmetric import padding, ec
 from cryptography.hazmat.primitives.serialization import load_der_public_key
@@ -64,48 +66,113 @@ class VerificationHelpers(object):
             buffer = buffer.toBytes()
         if isinstance(signature, Blob):
             signature = signature.toBytes()
-        if not isinstance(publicKey, PublicKey):
-            # Turn publicKey into a PublicKey object.
-            if not isinstance(publicKey, Blob):
-                publicKey = Blob(publicKey)
-            publicKey = PublicKey(publicKey)
 
-        if digestAlgorithm == DigestAlgorithm.SHA256:
-            if publicKey.getKeyType() == KeyType.RSA:
-                # Get the public key.
-                try:
-                    cryptoPublicKey = load_der_public_key(
-                      publicKey.getKeyDer().toBytes(),
-                      backend = default_backend())
-                except:
-                    return False
-
-                try:
-                    cryptoPublicKey.verify(
-                      signature, buffer, padding.PKCS1v15(), hashes.SHA256())
-                    return True
-                except:
-                    return False
-            elif publicKey.getKeyType() == KeyType.EC:
-                # Get the public key.
-                try:
-                    cryptoPublicKey = load_der_public_key(
-                      publicKey.getKeyDer().toBytes(),
-                      backend = default_backend())
-                except:
-                    return False
-
-                try:
-                    cryptoPublicKey.verify(
-                      signature, buffer, ec.ECDSA(hashes.SHA256()))
-                    return True
-                except:
-                    return False
-            else:
-                raise ValueError("verifySignature: Invalid key type")
-        else:
+        if digestAlgorithm != DigestAlgorithm.SHA256:
             raise ValueError("verifySignature: Invalid digest algorithm")
 
+        # Get the parsed key from the cache or parse it.
+        cryptoPublicKey = VerificationHelpers._getCryptoPublicKey(publicKey)
+        if cryptoPublicKey == None:
+            return False
+        (keyType, cryptoPublicKey) = cryptoPublicKey
+
+        if keyType == KeyType.RSA:
+            try:
+                cryptoPublicKey.verify(
+                  signature, buffer, padding.PKCS1v15(), hashes.SHA256())
+                return True
+            except:
+                return False
+        elif keyType == KeyType.EC:
+            try:
+                cryptoPublicKey.verify(
+                  signature, buffer, ec.ECDSA(hashes.SHA256()))
+                return True
+            except:
+                return False
+        else:
+            raise ValueError("verifySignature: Invalid key type")
+
+    @staticmethod
+    def getMaxPublicKeyCacheSize():
+        """
+        Get the maximum number of parsed public keys which verifySignature
+        keeps in a process-wide cache.
+
+        :return: The maximum number of cached public keys.
+        :rtype: int
+        """
+        return VerificationHelpers._maxPublicKeyCacheSize
+
+    @staticmethod
+    def setMaxPublicKeyCacheSize(maxPublicKeyCacheSize):
+        """
+        Set the maximum number of parsed public keys which verifySignature
+        keeps in a process-wide cache. If the cache has more keys, remove the
+        least recently used. The default is 100. Set to 0 to not cache.
+
+        :param int maxPublicKeyCacheSize: The maximum number of cached public
+          keys.
+        """
+        with VerificationHelpers._publicKeyCacheLock:
+            VerificationHelpers._maxPublicKeyCacheSize = maxPublicKeyCacheSize
+            while (len(VerificationHelpers._publicKeyCache) >
+                   maxPublicKeyCacheSize):
+                VerificationHelpers._publicKeyCache.popitem(False)
+
+    @staticmethod
+    def _getCryptoPublicKey(publicKey):
+        """
+        Get the key type and the cryptography public key object for the public
+        key, using the cache keyed by the key DER so that each key is only
+        decoded and loaded once.
+
+        :param publicKey: The object containing the public key, or the public
+          key DER which is used to make the PublicKey object.
+        :type publicKey: PublicKey or Blob or  an object which is the same as
+          the bytes() operator
+        :return: A Tuple of (keyType, cryptoPublicKey), or None if the key DER
+          can't be loaded.
+        :rtype: (int from KeyType, object)
+        :raises: UnrecognizedKeyFormatException if publicKey is not a PublicKey
+          and the key type can't be decoded.
+        """
+        if isinstance(publicKey, PublicKey):
+            keyDer = publicKey.getKeyDer()
+        elif isinstance(publicKey, Blob):
+            keyDer = publicKey
+        else:
+            keyDer = Blob(publicKey)
+        cacheKey = keyDer.toBytes()
+
+        with VerificationHelpers._publicKeyCacheLock:
+            result = VerificationHelpers._publicKeyCache.pop(cacheKey, None)
+            if result != None:
+                # Insert at the end as the most recently used.
+                VerificationHelpers._publicKeyCache[cacheKey] = result
+                return result
+
+        # Parse outside of the lock.
+        if not isinstance(publicKey, PublicKey):
+            # Turn publicKey into a PublicKey object to get the key type.
+            publicKey = PublicKey(keyDer)
+        try:
+            cryptoPublicKey = load_der_public_key(
+              cacheKey, backend = default_backend())
+        except:
+            return None
+        result = (publicKey.getKeyType(), cryptoPublicKey)
+
+        with VerificationHelpers._publicKeyCacheLock:
+            if VerificationHelpers._maxPublicKeyCacheSize > 0:
+                while (len(VerificationHelpers._publicKeyCache) >=
+                       VerificationHelpers._maxPublicKeyCacheSize):
+                    # Remove the least recently used key.
+                    VerificationHelpers._publicKeyCache.popitem(False)
+                VerificationHelpers._publicKeyCache[cacheKey] = result
+
+        return result
+
     @staticmethod
     def verifyDataSignature(
       data, publicKeyOrCertificate, digestAlgorithm = None, wireFormat = None):
@@ -262,3 +329,9 @@ class VerificationHelpers(object):
               interest.getName().get(-1).getValue().buf(), False)
         except:
             return None
+
+    # The key is the public key DER bytes. The value is (keyType,
+    # cryptoPublicKey). The order is from least to most recently used.
+    _publicKeyCache = OrderedDict()
+    _publicKeyCacheLock = threading.Lock()
+    _maxPublicKeyCacheSize = 100
@@ -31,6 +31,7 @@ http://named-data.net/doc/ndn-ccl-api/chrono-sync2013.html .
 # protoc --python_out=. sync-state.proto
 from pyndn.sync.sync_state_pb2 import SyncState, SyncStateMsg
 import logging
+from collections import OrderedDict
 from pyndn.name import Name
 from pyndn.interest import Interest
 from pyndn.data import Data
@@ -112,13 +113,20 @@ class ChronoSync2013(object):
         self._contentCache = MemoryContentCache(face)
 
         self._digestLog = [] # of _DigestLogEntry
+        # The key is the digest. The value is the position of its entry in the
+        # digest log, counting the entries removed by compaction.
+        self._digestLogIndex = {}
+        # The position of _digestLog[0], which is the number of entries removed
+        # by compaction.
+        self._digestLogOffset = 0
+        self._maxDigestLogSize = 1000
         self._digestTree = DigestTree()
         self._sequenceNo = -1
         self._enabled = True
 
         emptyContent = SyncStateMsg()
         # Use getattr to avoid pylint errors.
-        self._digestLog.append(self._DigestLogEntry("00", getattr(emptyContent, "ss")))
+        self._addDigestLogEntry("00", getattr(emptyContent, "ss"))
 
         # Register the prefix with the contentCache_ and use our own onInterest
         #   as the onDataNotFound fallback.
@@ -307,6 +315,37 @@ class ChronoSync2013(object):
         """
         return self._sequenceNo
 
+    def getMaxDigestLogSize(self):
+        """
+        Get the number of recent digest log entries to keep. See
+        setMaxDigestLogSize.
+
+        :return: The maximum digest log size, or None for no limit.
+        :rtype: int
+        """
+        return self._maxDigestLogSize
+
+    def setMaxDigestLogSize(self, maxDigestLogSize):
+        """
+        Set the number of recent digest log entries to keep. The digest log
+        remembers the sync state changes after each root digest so that this
+        can answer a sync interest for an older digest with only the changes.
+        When the log grows to twice maxDigestLogSize, the oldest entries are
+        removed so that maxDigestLogSize remain. A sync interest for a removed
+        digest is handled like a sync interest for an unknown digest. The
+        initial entry for the digest "00" is never removed. If you don't call
+        this, the maximum is 1000.
+
+        :param int maxDigestLogSize: The maximum digest log size, or None for
+          no limit.
+        """
+        if maxDigestLogSize != None and maxDigestLogSize < 1:
+            raise ValueError(
+              "ChronoSync2013.setMaxDigestLogSize: The maximum must be at least 1")
+
+        self._maxDigestLogSize = maxDigestLogSize
+        self._compactDigestLog()
+
     def shutdown(self):
         """
         Unregister callbacks so that this does not respond to interests anymore.
@@ -378,8 +417,7 @@ class ChronoSync2013(object):
                         self._sequenceNo = syncState.seqno.seq
 
         if self._logFind(self._digestTree.getRoot()) == -1:
-            self._digestLog.append(
-              self._DigestLogEntry(self._digestTree.getRoot(), content))
+            self._addDigestLogEntry(self._digestTree.getRoot(), content)
             return True
         else:
             return False
@@ -387,12 +425,44 @@ class ChronoSync2013(object):
     def _logFind(self, digest):
         """
         Search the digest log by digest.
+
+        :return: The position of the entry in the digest log (see
+          _digestLogIndex), or -1 if not found.
+        :rtype: int
+        """
+        return self._digestLogIndex.get(digest, -1)
+
+    def _addDigestLogEntry(self, digest, content):
+        """
+        Append a _DigestLogEntry to the digest log, update _digestLogIndex and
+        compact the log if needed.
+        """
+        self._digestLogIndex[digest] = (
+          self._digestLogOffset + len(self._digestLog))
+        self._digestLog.append(self._DigestLogEntry(digest, content))
+
+        if (self._maxDigestLogSize != None and
+              len(self._digestLog) >= 2 * self._maxDigestLogSize):
+            self._compactDigestLog()
+
+    def _compactDigestLog(self):
+        """
+        If the digest log is longer than _maxDigestLogSize, remove the oldest
+        entries, except for the digest "00". Compacting only when the log
+        reaches twice the maximum keeps the cost constant per added entry.
         """
-        for i in range(len(self._digestLog)):
-            if digest == self._digestLog[i].getDigest():
-                return i
+        if self._maxDigestLogSize == None:
+            return
+        nRemove = len(self._digestLog) - self._maxDigestLogSize
+        if nRemove <= 0:
+            return
 
-        return -1
+        for i in range(nRemove):
+            digest = self._digestLog[i].getDigest()
+            if digest != "00":
+                del self._digestLogIndex[digest]
+        del self._digestLog[:nRemove]
+        self._digestLogOffset += nRemove
 
     def _onInterest(self, prefix, interest, face, interestFilterId, filter):
         """
@@ -580,10 +650,12 @@ class ChronoSync2013(object):
           False.
         :rtype: bool
         """
-        nameList = []       # of str
-        sequenceNoList = [] # of int
-        sessionNoList = []  # of int
-        for j in range(index + 1, len(self._digestLog)):
+        # The key is the name. The value is (sequenceNo, sessionNo) from the
+        # latest sync state, in the order that the name was first found.
+        latestSyncStates = OrderedDict()
+        # The digest "00" may be older than the first entry in _digestLog.
+        start = max(index + 1 - self._digestLogOffset, 0)
+        for j in range(start, len(self._digestLog)):
             temp = self._digestLog[j].getData() # array of sync_state_pb2.SyncState.
             for i in range(len(temp)):
                 syncState = temp[i]
@@ -592,27 +664,17 @@ class ChronoSync2013(object):
 
                 if self._digestTree.find(
                       syncState.name, syncState.seqno.session) != -1:
-                    n = -1
-                    for k in range(len(nameList)):
-                        if nameList[k] == syncState.name:
-                            n = k
-                            break
-
-                    if n == -1:
-                        nameList.append(syncState.name)
-                        sequenceNoList.append(syncState.seqno.seq)
-                        sessionNoList.append(syncState.seqno.session)
-                    else:
-                        sequenceNoList[n] = syncState.seqno.seq
-                        sessionNoList[n] = syncState.seqno.session
+                    latestSyncStates[syncState.name] = (
+                      syncState.seqno.seq, syncState.seqno.session)
 
         tempContent = SyncStateMsg()
-        for i in range(len(nameList)):
+        for name in latestSyncStates:
+            (sequenceNo, sessionNo) = latestSyncStates[name]
             content = getattr(tempContent, "ss").add()
-            content.name = nameList[i]
+            content.name = name
             content.type = SyncState_UPDATE
-            content.seqno.seq = sequenceNoList[i]
-            content.seqno.session = sessionNoList[i]
+            content.seqno.seq = sequenceNo
+            content.seqno.session = sessionNo
 
         sent = False
         if len(getattr(tempContent, "ss")) != 0:
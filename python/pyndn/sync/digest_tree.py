@@ -23,6 +23,7 @@ This module defines the DigestTree class which maintains a digest tree for
 ChronoSync.
 """
 
+import bisect
 import logging
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
@@ -31,7 +32,15 @@ from pyndn.util.blob import Blob
 class DigestTree(object):
     def __init__(self):
         self._digestNode = [] # of DigestTree.Node
+        # The (dataPrefix, sessionNo) of each node in _digestNode, in the same
+        # sorted order, for bisect.
+        self._nodeKeys = []
+        # The key is (dataPrefix, sessionNo). The value is the DigestTree.Node.
+        self._nodeIndex = {}
+        # The root is computed by getRoot when needed, so that many updates
+        # only compute it once.
         self._root = "00"
+        self._isRootStale = False
 
     class Node(object):
         """
@@ -47,6 +56,12 @@ class DigestTree(object):
             self._dataPrefix = dataPrefix
             self._sessionNo = sessionNo
             self._sequenceNo = sequenceNo
+            # The digest of the data prefix doesn't change, so compute it once.
+            sha256 = hashes.Hash(hashes.SHA256(), backend=default_backend())
+            # Use Blob to convert a string to UTF-8 if needed.
+            sha256.update(Blob(self._dataPrefix, False).toBytes())
+            self._nameDigest = sha256.finalize()
+            # The raw digest bytes.
             self._digest = None
 
             self._recomputeDigest()
@@ -85,7 +100,8 @@ class DigestTree(object):
             :return: The digest as a hex string.
             :rtype: str
             """
-            return self._digest
+            # Use Blob to convert a str (Python 2) or bytes (Python 3) to hex.
+            return Blob(self._digest, False).toHex()
 
         def setSequenceNo(self, sequenceNo):
             """
@@ -114,42 +130,34 @@ class DigestTree(object):
 
         def _recomputeDigest(self):
             """
-            Digest the fields and set self._digest to the hex digest.
+            Digest the fields and set self._digest to the raw digest bytes.
             """
             sha256 = hashes.Hash(hashes.SHA256(), backend=default_backend())
-            number = bytearray(4)
+            number = bytearray(8)
             # Debug: sync-state.proto defines seq and session as uint64, but
             #   the original ChronoChat-js only digests 32 bits.
-            self._int32ToLittleEndian(self._sessionNo, number)
-            sha256.update(Blob(number, False).toBytes())
-            self._int32ToLittleEndian(self._sequenceNo, number)
-            sha256.update(Blob(number, False).toBytes())
+            self._int32ToLittleEndian(self._sessionNo, number, 0)
+            self._int32ToLittleEndian(self._sequenceNo, number, 4)
+            sha256.update(bytes(number))
             sequenceDigest = sha256.finalize()
 
             sha256 = hashes.Hash(hashes.SHA256(), backend=default_backend())
-            # Use Blob to convert a string to UTF-8 if needed.
-            sha256.update(Blob(self._dataPrefix, False).toBytes());
-            nameDigest = sha256.finalize()
-
-            sha256 = hashes.Hash(hashes.SHA256(), backend=default_backend())
-            sha256.update(nameDigest)
+            sha256.update(self._nameDigest)
             sha256.update(sequenceDigest)
-            nodeDigest = sha256.finalize()
-            # Use Blob to convert a str (Python 2) or bytes (Python 3) to hex.
-            self._digest = Blob(nodeDigest, False).toHex()
+            self._digest = sha256.finalize()
 
         @staticmethod
-        def _int32ToLittleEndian(value, result):
+        def _int32ToLittleEndian(value, result, offset = 0):
             for i in range(4):
-                result[i] = value & 0xff
+                result[offset + i] = value & 0xff
                 value >>= 8
 
     def update(self, dataPrefix, sessionNo, sequenceNo):
         """
-        Update the digest tree and recompute the root digest.  If the
-        combination of dataPrefix and sessionNo already exists in the tree then
-        update its sequenceNo (only if the given sequenceNo is newer), otherwise
-        add a new node.
+        Update the digest tree and mark the root digest to be recomputed by
+        getRoot. If the combination of dataPrefix and sessionNo already exists
+        in the tree then update its sequenceNo (only if the given sequenceNo is
+        newer), otherwise add a new node.
 
         :param str dataPrefix: The data prefix. In Python3, this is encoded
           as UTF-8 to digest.
@@ -159,41 +167,37 @@ class DigestTree(object):
           given sequenceNo is not newer than the existing sequence number).
         :rtype: bool
         """
-        nodeIndex = self.find(dataPrefix, sessionNo)
-        logging.getLogger(__name__).info("%s, %d", dataPrefix, sessionNo)
-        logging.getLogger(__name__).info(
-          "DigestTree.update session %d, nodeIndex %d", sessionNo, nodeIndex)
-        if nodeIndex >= 0:
+        logger = logging.getLogger(__name__)
+        key = (dataPrefix, sessionNo)
+        node = self._nodeIndex.get(key)
+        if node != None:
             # Only update to a newer status.
-            if self._digestNode[nodeIndex].getSequenceNo() < sequenceNo:
-                self._digestNode[nodeIndex].setSequenceNo(sequenceNo)
+            if node.getSequenceNo() < sequenceNo:
+                node.setSequenceNo(sequenceNo)
             else:
                 return False
         else:
-            logging.getLogger(__name__).info(
-              "new comer %s, session %d, sequence %d", dataPrefix, sessionNo,
-              sequenceNo)
-            # Insert into _digestnode sorted.
-            temp = DigestTree.Node(dataPrefix, sessionNo, sequenceNo)
-            # Find the index of the first node where it is not less than temp.
-            i = 0
-            while i < len(self._digestNode):
-                if not self._digestNode[i].lessThan(temp):
-                    break
-                i += 1
-
-            self._digestNode.insert(i, temp)
-
-        self._recomputeRoot()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                  "new comer %s, session %d, sequence %d", dataPrefix, sessionNo,
+                  sequenceNo)
+            # Insert into _digestNode sorted. The tuple order of the key is
+            # the same as Node.lessThan.
+            node = DigestTree.Node(dataPrefix, sessionNo, sequenceNo)
+            i = bisect.bisect_left(self._nodeKeys, key)
+            self._nodeKeys.insert(i, key)
+            self._digestNode.insert(i, node)
+            self._nodeIndex[key] = node
+
+        self._isRootStale = True
         return True
 
     def find(self, dataPrefix, sessionNo):
-        for i in range(len(self._digestNode)):
-          if (self._digestNode[i].getDataPrefix() == dataPrefix and
-              self._digestNode[i].getSessionNo() == sessionNo):
-            return i
+        key = (dataPrefix, sessionNo)
+        if not key in self._nodeIndex:
+            return -1
 
-        return -1
+        return bisect.bisect_left(self._nodeKeys, key)
 
     def size(self):
         return len(self._digestNode)
@@ -203,34 +207,28 @@ class DigestTree(object):
 
     def getRoot(self):
         """
-        Get the root digest.
+        Get the root digest, recomputing it if the tree was updated.
 
         :return: The root digest as a hex string.
         :rtype: str
         """
-        return self._root
-
-    @staticmethod
-    def _updateHex(messageDigest, hex):
-        """
-        Convert the hex string to bytes and call messageDigest.update.
+        if self._isRootStale:
+            self._recomputeRoot()
 
-        :param messageDigest: The digest to update.
-        :type messageDigest: A HashContext object, for example from
-          hashes.Hash(hashes.SHA256(), backend=default_backend()).
-        :param str hex: The hex string.
-        """
-        messageDigest.update(Blob(bytearray.fromhex(hex), False).toBytes())
+        return self._root
 
     def _recomputeRoot(self):
         """
-        Set _root to the digest of all digests in _digestnode. This sets
+        Set _root to the digest of all digests in _digestNode. This sets
         _root to the hex value of the digest.
         """
         sha256 = hashes.Hash(hashes.SHA256(), backend=default_backend())
-        for i in range(len(self._digestNode)):
-            self._updateHex(sha256, self._digestNode[i].getDigest())
+        # Digest the concatenated node digests with one update.
+        sha256.update(b"".join([node._digest for node in self._digestNode]))
         digestRoot = sha256.finalize()
         # Use Blob to convert a str (Python 2) or bytes (Python 3) to hex.
         self._root = Blob(digestRoot, False).toHex()
-        logging.getLogger(__name__).info("update root to: %s", self._root)
+        self._isRootStale = False
+        logger = logging.getLogger(__name__)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("update root to: %s", self._root)
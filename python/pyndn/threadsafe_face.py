@@ -22,6 +22,12 @@ This module defines the ThreadsafeFace class which extends Face to provide the
 main methods for NDN communication in a thread-safe manner.
 """
 
+try:
+    # Use builtin asyncio on Python 3.4+, or Tulip on Python 3.3
+    import asyncio
+except ImportError:
+    # Use Trollius on Python <= 3.2
+    import trollius as asyncio
 from pyndn.util.common import Common
 from pyndn.transport.async_tcp_transport import AsyncTcpTransport
 from pyndn.transport.async_unix_transport import AsyncUnixTransport
@@ -176,6 +182,54 @@ class ThreadsafeFace(Face):
         self._loop.call_soon_threadsafe(
             super(ThreadsafeFace, self).send, encoding)
 
+    def drain(self):
+        """
+        Return a future which is done when the transport can accept more data,
+        so that a producer can limit the data buffered for a slow connection,
+        for example putData(data) then await face.drain() . Since send is
+        dispatched to the loop, this checks the transport after the packets
+        already sent through this face are written. See
+        AsyncSocketTransport.drain and setWriteBufferLimits. If the transport
+        does not have flow control, the future is done at that point. The
+        future must be awaited in the loop given to the constructor.
+
+        :return: The future, whose result is None.
+        :rtype: asyncio.Future
+        """
+        future = asyncio.Future(loop = self._loop)
+
+        def onTransportDrained(transportFuture):
+            if not future.done():
+                future.set_result(None)
+
+        def checkTransport():
+            transport = self.getTransport()
+            if hasattr(transport, "drain"):
+                transport.drain().add_done_callback(onTransportDrained)
+            else:
+                onTransportDrained(None)
+
+        self._loop.call_soon_threadsafe(checkTransport)
+        return future
+
+    def setOnWritable(self, onWritable):
+        """
+        Set the callback for when the transport can accept more data after its
+        write buffer reached the high watermark. See
+        AsyncSocketTransport.setOnWritable. If the transport does not have flow
+        control, this does nothing.
+
+        :param onWritable: This calls onWritable() when writing resumes, or None
+          for no callback.
+          NOTE: The library will log any exceptions raised by this callback, but
+          for better error handling the callback should catch and properly
+          handle any exceptions.
+        :type onWritable: function object
+        """
+        transport = self.getTransport()
+        if hasattr(transport, "setOnWritable"):
+            self._loop.call_soon_threadsafe(transport.setOnWritable, onWritable)
+
     def callLater(self, delayMilliseconds, callback):
         """
         Override to call callback() after the given delay, using
@@ -186,6 +240,9 @@ class ThreadsafeFace(Face):
         :param float delayMilliseconds: The delay in milliseconds.
         :param callback: This calls callback() after the delay.
         :type callback: function object
+        :return: The handle from call_later whose cancel() method removes the
+          callback so that it is not called.
+        :rtype: asyncio.Handle
         """
         # Convert milliseconds to seconds.
-        self._loop.call_later(delayMilliseconds / 1000.0, callback)
+        return self._loop.call_later(delayMilliseconds / 1000.0, callback)
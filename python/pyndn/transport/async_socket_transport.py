@@ -45,6 +45,14 @@ class AsyncSocketTransport(Transport):
         self._loop = loop
         self._transport = None
         self._elementReader = None
+        # Flow control, set by _ReceiveProtocol.pause_writing and
+        # resume_writing.
+        self._isWritingPaused = False
+        # The futures returned by drain() while writing is paused.
+        self._drainWaiters = []
+        self._onWritable = None
+        self._writeBufferHighWatermark = None
+        self._writeBufferLowWatermark = None
 
     def _connectHelper(self, elementListener, connectCoroutine):
         """
@@ -60,9 +68,14 @@ class AsyncSocketTransport(Transport):
         :type onConnected: function object
         """
         self.close()
-        asyncio.async(connectCoroutine, loop = self._loop)
+        AsyncSocketTransport._ensureFuture(connectCoroutine, loop = self._loop)
         self._elementReader = ElementReader(elementListener)
 
+    # asyncio.async was renamed to ensure_future in Python 3.4.4, and "async" is
+    # a reserved word in Python 3.7, so use getattr.
+    _ensureFuture = staticmethod(getattr(
+      asyncio, "ensure_future", None) or getattr(asyncio, "async"))
+
     class _ReceiveProtocol(asyncio.Protocol):
         def __init__(self, parent, onConnected):
             self._parent = parent
@@ -72,10 +85,31 @@ class AsyncSocketTransport(Transport):
             # Need to catch and log exceptions at this async entry point.
             try:
                 self._parent._transport = transport
+                self._parent._isWritingPaused = False
+                self._parent._applyWriteBufferLimits()
                 self._onConnected()
             except:
                 logging.exception("Error in connection_made")
 
+        def connection_lost(self, exc):
+            # asyncio doesn't call resume_writing after the connection is lost,
+            # so don't leave drain() waiting for a closed connection.
+            self._parent._isWritingPaused = False
+            self._parent._releaseDrainWaiters()
+
+        def pause_writing(self):
+            self._parent._isWritingPaused = True
+
+        def resume_writing(self):
+            # Need to catch and log exceptions at this async entry point.
+            try:
+                self._parent._isWritingPaused = False
+                self._parent._releaseDrainWaiters()
+                if self._parent._onWritable != None:
+                    self._parent._onWritable()
+            except:
+                logging.exception("Error in resume_writing")
+
         def data_received(self, data):
             # Need to catch and log exceptions at this async entry point.
             try:
@@ -105,6 +139,80 @@ class AsyncSocketTransport(Transport):
                 AsyncSocketTransport._sendNeedsStr = True
                 self.send(data)
 
+    def drain(self):
+        """
+        Return a future which is done when the write buffer is below the low
+        watermark, so that a producer can wait before sending more, for example
+        await transport.drain() . If writing is not paused, the returned future
+        is already done. It is also done if the connection is lost. To be
+        thread-safe, this must be called from the loop which was given to the
+        constructor.
+
+        :return: The future, whose result is None.
+        :rtype: asyncio.Future
+        """
+        future = asyncio.Future(loop = self._loop)
+        if self._isWritingPaused:
+            self._drainWaiters.append(future)
+        else:
+            future.set_result(None)
+
+        return future
+
+    def getIsWritingPaused(self):
+        """
+        Check if the write buffer has reached the high watermark, so that the
+        application should wait before sending more. See drain and
+        setOnWritable.
+
+        :return: True if writing is paused.
+        :rtype: bool
+        """
+        return self._isWritingPaused
+
+    def getWriteBufferSize(self):
+        """
+        Get the number of bytes in the write buffer which are not yet sent.
+
+        :return: The write buffer size, or 0 if not connected.
+        :rtype: int
+        """
+        if self._transport == None:
+            return 0
+
+        return self._transport.get_write_buffer_size()
+
+    def setWriteBufferLimits(self, high = None, low = None):
+        """
+        Set the watermarks for flow control of the write buffer, as in the
+        asyncio transport set_write_buffer_limits. When the write buffer
+        reaches the high watermark, writing is paused until the buffer drains
+        below the low watermark. The limits apply to the current connection
+        and later connections.
+
+        :param int high: (optional) The high watermark in bytes. If omitted or
+          None, use the asyncio default.
+        :param int low: (optional) The low watermark in bytes. If omitted or
+          None, use the asyncio default.
+        """
+        self._writeBufferHighWatermark = high
+        self._writeBufferLowWatermark = low
+        self._applyWriteBufferLimits()
+
+    def setOnWritable(self, onWritable):
+        """
+        Set the callback for when the write buffer drains below the low
+        watermark after writing was paused.
+
+        :param onWritable: This calls onWritable() when writing resumes, or None
+          for no callback.
+          NOTE: The library will log any exceptions raised by this callback, but
+          for better error handling the callback should catch and properly
+          handle any exceptions.
+        :type onWritable: function object
+        """
+        self._onWritable = onWritable
+
     def processEvents(self):
         """
         Do nothing since the async loop reads the socket.
@@ -130,3 +238,22 @@ class AsyncSocketTransport(Transport):
         if self._transport != None:
             self._transport.close()
             self._transport = None
+        self._isWritingPaused = False
+        self._releaseDrainWaiters()
+
+    def _applyWriteBufferLimits(self):
+        if self._transport != None and (
+              self._writeBufferHighWatermark != None or
+              self._writeBufferLowWatermark != None):
+            self._transport.set_write_buffer_limits(
+              self._writeBufferHighWatermark, self._writeBufferLowWatermark)
+
+    def _releaseDrainWaiters(self):
+        """
+        Set the result of each future from drain() and clear the list.
+        """
+        drainWaiters = self._drainWaiters
+        self._drainWaiters = []
+        for future in drainWaiters:
+            if not future.done():
+                future.set_result(None)
@@ -0,0 +1,182 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the SocketSendQueue class which is used by the socket-based
+Transport classes to gather outgoing packets and send them on a socket with
+fewer system calls.
+"""
+
+import errno
+import socket
+
+class SocketSendQueue(object):
+    """
+    Create a new SocketSendQueue to send on the given socket. The added buffers
+    are not copied, and flush sends as many as possible with one call to
+    socket.sendmsg (where available) which gathers them without joining them.
+
+    :param socket sock: The connected socket.
+    """
+    def __init__(self, sock):
+        self._socket = sock
+        # memoryview objects for the bytes not yet sent.
+        self._buffers = []
+        self._byteCount = 0
+        self._flushByteCount = 64 * 1024
+        self._isBlocking = True
+
+    def add(self, data):
+        """
+        Add the data to the queue, and flush if the number of queued bytes
+        reaches getFlushByteCount(). The caller must not change the data until
+        it is sent.
+
+        :param data: The buffer of data to send.
+        :type data: An array type with int elements
+        """
+        buffer = memoryview(data)
+        if len(buffer) == 0:
+            return
+
+        self._buffers.append(buffer)
+        self._byteCount += len(buffer)
+        if self._byteCount >= self._flushByteCount:
+            self.flush()
+
+    def flush(self):
+        """
+        Send the queued data. If getIsBlocking() is True, this waits until all
+        the data is sent. Otherwise, this sends what the socket accepts without
+        waiting and keeps the rest in the queue.
+
+        :return: True if all the queued data is sent, False if some remains.
+        :rtype: bool
+        """
+        while len(self._buffers) > 0:
+            nBytesSent = self._sendSome()
+            if nBytesSent == None:
+                # The socket is not ready to send more.
+                return False
+            self._removeSent(nBytesSent)
+
+        return True
+
+    def clear(self):
+        """
+        Remove all the queued data without sending it.
+        """
+        self._buffers = []
+        self._byteCount = 0
+
+    def getByteCount(self):
+        """
+        Get the number of bytes in the queue which are not yet sent.
+
+        :return: The number of queued bytes.
+        :rtype: int
+        """
+        return self._byteCount
+
+    def getFlushByteCount(self):
+        """
+        Get the number of queued bytes at which add() calls flush().
+
+        :return: The flush byte count.
+        :rtype: int
+        """
+        return self._flushByteCount
+
+    def setFlushByteCount(self, flushByteCount):
+        """
+        Set the number of queued bytes at which add() calls flush(). If you
+        don't call this, the flush byte count is 65536.
+
+        :param int flushByteCount: The flush byte count.
+        """
+        self._flushByteCount = flushByteCount
+
+    def getIsBlocking(self):
+        """
+        Get whether flush waits until all the data is sent. See setIsBlocking.
+
+        :return: True if flush waits.
+        :rtype: bool
+        """
+        return self._isBlocking
+
+    def setIsBlocking(self, isBlocking):
+        """
+        Set whether flush waits until all the data is sent. If False, flush
+        uses socket.MSG_DONTWAIT and leaves the data which the socket doesn't
+        accept in the queue. (On platforms without MSG_DONTWAIT, flush always
+        waits.) If you don't call this, flush waits.
+
+        :param bool isBlocking: True if flush waits.
+        """
+        self._isBlocking = isBlocking
+
+    # This is the usual IOV_MAX limit for one call to sendmsg.
+    _maxBuffersPerSend = 1024
+    # This will be set True if send gets a TypeError.
+    _sendNeedsStr = False
+
+    def _sendSome(self):
+        """
+        Send some of the queued data with one system call.
+
+        :return: The number of bytes sent, or None if the socket would block.
+        :rtype: int
+        """
+        flags = 0 if self._isBlocking else getattr(socket, "MSG_DONTWAIT", 0)
+        try:
+            if hasattr(self._socket, "sendmsg"):
+                return self._socket.sendmsg(
+                  self._buffers[:SocketSendQueue._maxBuffersPerSend], [], flags)
+            elif SocketSendQueue._sendNeedsStr:
+                # This version of send can't use a memoryview, so convert.
+                return self._socket.send(str(bytearray(self._buffers[0])), flags)
+            else:
+                try:
+                    return self._socket.send(self._buffers[0], flags)
+                except TypeError:
+                    # Assume we need to convert to a str.
+                    SocketSendQueue._sendNeedsStr = True
+                    return self._sendSome()
+        except socket.error as ex:
+            if ex.errno == errno.EAGAIN or ex.errno == errno.EWOULDBLOCK:
+                return None
+            if ex.errno == errno.EINTR:
+                return 0
+            raise
+
+    def _removeSent(self, nBytesSent):
+        """
+        Remove nBytesSent from the front of the queue.
+        """
+        self._byteCount -= nBytesSent
+        i = 0
+        while i < len(self._buffers) and nBytesSent >= len(self._buffers[i]):
+            nBytesSent -= len(self._buffers[i])
+            i += 1
+        del self._buffers[:i]
+
+        if nBytesSent > 0:
+            # Part of the first buffer was sent. Slicing doesn't copy.
+            self._buffers[0] = self._buffers[0][nBytesSent:]
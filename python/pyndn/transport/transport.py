@@ -113,6 +113,18 @@ class Transport(object):
         """
         raise RuntimeError("getIsConnected is not implemented")
 
+    def getSocket(self):
+        """
+        Get the socket which processEvents receives from, so that an event loop
+        such as FaceReactor can wait until it is ready. This base class
+        implementation returns None, but your derived class can override.
+
+        :return: The connected socket, or None if not connected or if this
+          transport doesn't have a socket to wait on.
+        :rtype: socket
+        """
+        return None
+
     def close(self):
         """
         Close the connection.  This base class implementation does nothing, but
@@ -197,6 +197,15 @@ class UdpTransport(Transport):
         # Assume we are still connected.  TODO: Do a test receive?
         return True
 
+    def getSocket(self):
+        """
+        Get the socket which processEvents receives from.
+
+        :return: The connected socket, or None if not connected.
+        :rtype: socket
+        """
+        return self._socket
+
     def close(self):
         """
         Close the connection.  If not connected, this does nothing.
@@ -22,10 +22,12 @@ This module defines the UnixTransport class which extends Transport for
 communication over a Unix socket.
 """
 
+import errno
 import socket
 from pyndn.util.blob import Blob, Common
 from pyndn.transport.transport import Transport
 from pyndn.transport.socket_poller import SocketPoller
+from pyndn.transport.socket_send_queue import SocketSendQueue
 from pyndn.encoding.element_reader import ElementReader
 
 class UnixTransport(Transport):
@@ -35,6 +37,11 @@ class UnixTransport(Transport):
     def __init__(self):
         self._socket = None
         self._socketPoller = None
+        self._sendQueue = None
+        self._isNonBlockingSend = False
+        # While this is True, send adds to _sendQueue which processEvents
+        # flushes at the end.
+        self._isProcessingEvents = False
         self._buffer = bytearray(Common.MAX_NDN_PACKET_SIZE)
         # Create a Blob and take its buf() since this creates a memoryview
         #   which is more efficient for slicing.
@@ -101,30 +108,61 @@ class UnixTransport(Transport):
         self._socket.connect(connectionInfo.getFilePath())
 
         self._socketPoller = SocketPoller(self._socket)
+        self._sendQueue = SocketSendQueue(self._socket)
+        self._sendQueue.setIsBlocking(not self._isNonBlockingSend)
         self._elementReader = ElementReader(elementListener)
 
         if onConnected != None:
             onConnected()
 
-    # This will be set True if send gets a TypeError.
-    _sendNeedsStr = False
     def send(self, data):
         """
-        Send data to the host.
+        Send data to the host. When this is called while processEvents
+        processes the received packets (for example when onInterest calls
+        putData), the data is queued and processEvents sends all the queued data
+        together at the end. Otherwise, this sends immediately. See also
+        setNonBlockingSend.
 
-        :param data: The buffer of data to send.
+        :param data: The buffer of data to send. This does not copy the buffer,
+          so the caller must not change it while it is queued.
         :type data: An array type accepted by socket.send
+        :raises RuntimeError: If the transport is not connected.
         """
-        if UnixTransport._sendNeedsStr:
-            # This version of sendall can't use a memoryview, etc., so convert.
-            self._socket.sendall(str(bytearray(data)))
-        else:
-            try:
-                self._socket.sendall(data)
-            except TypeError:
-                # Assume we need to convert to a str.
-                UnixTransport._sendNeedsStr = True
-                self.send(data)
+        if self._sendQueue == None:
+            raise RuntimeError(
+              "Cannot send because the transport is not connected")
+
+        self._sendQueue.add(data)
+        if not self._isProcessingEvents:
+            self._sendQueue.flush()
+
+    def getPendingSendByteCount(self):
+        """
+        Get the number of bytes given to send which are queued and not yet
+        sent. With setNonBlockingSend(True), a value which keeps growing means
+        that the connection can't keep up, and the application should send less.
+
+        :return: The number of queued bytes.
+        :rtype: int
+        """
+        if self._sendQueue == None:
+            return 0
+
+        return self._sendQueue.getByteCount()
+
+    def setNonBlockingSend(self, nonBlockingSend):
+        """
+        Set whether send and processEvents avoid waiting for the socket to
+        accept data. If True, the data which the socket doesn't accept is kept
+        in a queue and sent by a later call to send or processEvents, and
+        getPendingSendByteCount() reports the queued bytes. If you don't call
+        this, sending waits until the socket accepts all the data.
+
+        :param bool nonBlockingSend: True to not wait when sending.
+        """
+        self._isNonBlockingSend = nonBlockingSend
+        if self._sendQueue != None:
+            self._sendQueue.setIsBlocking(not nonBlockingSend)
 
     def processEvents(self):
         """
@@ -141,19 +179,37 @@ class UnixTransport(Transport):
         if not self.getIsConnected():
             return
 
-        # Loop until there is no more data in the receive buffer.
-        while True:
-            if not self._socketPoller.isReady():
-                # There is no data waiting.
-                return
-
-            nBytesRead = self._socket.recv_into(self._buffer)
-            if nBytesRead <= 0:
-                # Since we checked for data ready, we don't expect this.
-                return
-
-            # _bufferView is a memoryview, so we can slice efficienty.
-            self._elementReader.onReceivedData(self._bufferView[0:nBytesRead])
+        self._isProcessingEvents = True
+        try:
+            # Loop until there is no more data in the receive buffer.
+            while True:
+                if not self._socketPoller.isReady():
+                    # There is no data waiting.
+                    return
+
+                try:
+                    nBytesRead = self._socket.recv_into(self._buffer)
+                except socket.error as ex:
+                    if ex.errno == errno.ECONNRESET:
+                        # The connection is broken, so close it as below.
+                        self.close()
+                    raise
+                if nBytesRead <= 0:
+                    # The socket was ready but has no data, so the other end
+                    # closed the connection. Close so that an event loop
+                    # doesn't keep waking up for the socket.
+                    self.close()
+                    return
+
+                # _bufferView is a memoryview, so we can slice efficienty.
+                self._elementReader.onReceivedData(
+                  self._bufferView[0:nBytesRead])
+        finally:
+            self._isProcessingEvents = False
+            # Send the data queued while processing the received packets, and
+            # any data left by a non-blocking send.
+            if self._sendQueue != None:
+                self._sendQueue.flush()
 
     def getIsConnected(self):
         """
@@ -168,6 +224,15 @@ class UnixTransport(Transport):
         # Assume we are still connected.  TODO: Do a test receive?
         return True
 
+    def getSocket(self):
+        """
+        Get the socket which processEvents receives from.
+
+        :return: The connected socket, or None if not connected.
+        :rtype: socket
+        """
+        return self._socket
+
     def close(self):
         """
         Close the connection.  If not connected, this does nothing.
@@ -176,6 +241,8 @@ class UnixTransport(Transport):
             self._socketPoller.close()
             self._socketPoller = None
 
+        self._sendQueue = None
+
         if self._socket != None:
             self._socket.close()
             self._socket = None
@@ -17,15 +17,16 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # A copy of the GNU Lesser General Public License is in the file COPYING.
 
-from pyndn.util import blob, exponential_re_express, memory_content_cache
-from pyndn.util import segment_fetcher, signed_blob
-__all__ = ['blob', 'exponential_re_express', 'memory_content_cache',
-           'segment_fetcher', 'signed_blob']
+from pyndn.util import blob, eviction_policy, exponential_re_express
+from pyndn.util import memory_content_cache, segment_fetcher, signed_blob
+__all__ = ['blob', 'eviction_policy', 'exponential_re_express',
+           'memory_content_cache', 'segment_fetcher', 'signed_blob']
 
 import sys as _sys
 
 try:
     from pyndn.util.blob import *
+    from pyndn.util.eviction_policy import *
     from pyndn.util.exponential_re_express import *
     from pyndn.util.memory_content_cache import *
     from pyndn.util.segment_fetcher import *
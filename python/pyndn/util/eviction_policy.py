@@ -0,0 +1,228 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+"""
+This module defines the EvictionPolicy abstract base class and the
+LruEvictionPolicy, LfuEvictionPolicy and ArcEvictionPolicy classes which a
+capacity-bounded cache such as MemoryContentCache uses to choose the entry to
+evict when it is full.
+"""
+
+from collections import OrderedDict
+
+class EvictionPolicy(object):
+    """
+    An EvictionPolicy keeps track of the entries in a cache. The cache calls
+    onInsert, onAccess and onRemove as the entries change, and calls evict()
+    when it needs to make room. An entry is any object with a getName() method,
+    and is tracked by identity. A policy object should only be used by one
+    cache.
+    """
+    def onInsert(self, entry):
+        """
+        The cache calls this when it inserts the entry.
+
+        :param entry: The new entry.
+        """
+        raise RuntimeError("EvictionPolicy.onInsert is not implemented")
+
+    def onAccess(self, entry):
+        """
+        The cache calls this when the entry is used to answer a request.
+
+        :param entry: The entry given to onInsert.
+        """
+        raise RuntimeError("EvictionPolicy.onAccess is not implemented")
+
+    def onRemove(self, entry):
+        """
+        The cache calls this when it removes the entry for a reason other than
+        evict(), for example because it is stale.
+
+        :param entry: The entry given to onInsert.
+        """
+        raise RuntimeError("EvictionPolicy.onRemove is not implemented")
+
+    def evict(self):
+        """
+        Choose the entry to evict and stop tracking it. The cache removes the
+        returned entry.
+
+        :return: The entry to evict, or None if there are no entries.
+        """
+        raise RuntimeError("EvictionPolicy.evict is not implemented")
+
+class LruEvictionPolicy(EvictionPolicy):
+    """
+    An LruEvictionPolicy evicts the least recently used entry.
+    """
+    def __init__(self):
+        # The key is the entry, in order from least to most recently used.
+        self._entries = OrderedDict()
+
+    def onInsert(self, entry):
+        self._entries[entry] = True
+
+    def onAccess(self, entry):
+        # Move to the end.
+        if self._entries.pop(entry, None) != None:
+            self._entries[entry] = True
+
+    def onRemove(self, entry):
+        self._entries.pop(entry, None)
+
+    def evict(self):
+        if len(self._entries) == 0:
+            return None
+        return self._entries.popitem(False)[0]
+
+class LfuEvictionPolicy(EvictionPolicy):
+    """
+    An LfuEvictionPolicy evicts the least frequently used entry, and the least
+    recently used among entries with the same count. Each operation takes
+    constant time.
+    """
+    def __init__(self):
+        # The key is the entry. The value is its use count.
+        self._counts = {}
+        # The key is the use count. The value is an OrderedDict whose keys are
+        # the entries with that count, in order from least to most recently
+        # used.
+        self._entriesByCount = {}
+        self._minimumCount = 0
+
+    def onInsert(self, entry):
+        self._counts[entry] = 1
+        self._entriesByCount.setdefault(1, OrderedDict())[entry] = True
+        self._minimumCount = 1
+
+    def onAccess(self, entry):
+        count = self._counts.get(entry)
+        if count == None:
+            return
+
+        self._removeFromCount(entry, count)
+        self._counts[entry] = count + 1
+        self._entriesByCount.setdefault(count + 1, OrderedDict())[entry] = True
+        if count == self._minimumCount and not count in self._entriesByCount:
+            self._minimumCount = count + 1
+
+    def onRemove(self, entry):
+        count = self._counts.pop(entry, None)
+        if count == None:
+            return
+
+        self._removeFromCount(entry, count)
+        if count == self._minimumCount:
+            self._updateMinimumCount()
+
+    def evict(self):
+        if len(self._counts) == 0:
+            return None
+
+        entry = self._entriesByCount[self._minimumCount].popitem(False)[0]
+        del self._counts[entry]
+        if len(self._entriesByCount[self._minimumCount]) == 0:
+            del self._entriesByCount[self._minimumCount]
+            self._updateMinimumCount()
+        return entry
+
+    def _removeFromCount(self, entry, count):
+        entries = self._entriesByCount[count]
+        del entries[entry]
+        if len(entries) == 0:
+            del self._entriesByCount[count]
+
+    def _updateMinimumCount(self):
+        # This is only needed when removing an arbitrary entry empties the
+        # lowest count, so searching the counts is not a bottleneck.
+        if len(self._entriesByCount) == 0:
+            self._minimumCount = 0
+        else:
+            self._minimumCount = min(self._entriesByCount)
+
+class ArcEvictionPolicy(EvictionPolicy):
+    """
+    An ArcEvictionPolicy implements the Adaptive Replacement Cache policy. It
+    keeps entries used once and entries used more than once in separate
+    recency lists, and remembers the names of recently evicted entries from
+    each list. When an evicted name is inserted again, the policy adapts the
+    target size of the two lists toward the list which would have kept it.
+    The capacity for the remembered names is the largest number of entries
+    that the cache has held.
+    """
+    def __init__(self):
+        # The keys are the entries used once (_t1) and more than once (_t2),
+        # in order from least to most recently used.
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        # The keys are the names of the entries evicted from _t1 and _t2.
+        self._b1 = OrderedDict()
+        self._b2 = OrderedDict()
+        # The target size of _t1.
+        self._targetT1Size = 0
+        self._capacity = 0
+
+    def onInsert(self, entry):
+        name = entry.getName()
+        if name in self._b1:
+            # We evicted this from _t1 too soon, so favor _t1.
+            self._targetT1Size = min(self._capacity, self._targetT1Size +
+              max(len(self._b2) // len(self._b1), 1))
+            del self._b1[name]
+            self._t2[entry] = True
+        elif name in self._b2:
+            # We evicted this from _t2 too soon, so favor _t2.
+            self._targetT1Size = max(0, self._targetT1Size -
+              max(len(self._b1) // len(self._b2), 1))
+            del self._b2[name]
+            self._t2[entry] = True
+        else:
+            self._t1[entry] = True
+
+        self._capacity = max(self._capacity, len(self._t1) + len(self._t2))
+
+    def onAccess(self, entry):
+        if self._t1.pop(entry, None) != None or self._t2.pop(entry, None) != None:
+            self._t2[entry] = True
+
+    def onRemove(self, entry):
+        if self._t1.pop(entry, None) == None:
+            self._t2.pop(entry, None)
+
+    def evict(self):
+        if len(self._t1) > 0 and (len(self._t1) > self._targetT1Size or
+                                  len(self._t2) == 0):
+            entry = self._t1.popitem(False)[0]
+            ghosts = self._b1
+        elif len(self._t2) > 0:
+            entry = self._t2.popitem(False)[0]
+            ghosts = self._b2
+        else:
+            return None
+
+        ghosts[entry.getName()] = True
+        while len(self._b1) + len(self._b2) > self._capacity:
+            # Forget the oldest name in the longer list.
+            if len(self._b1) >= len(self._b2):
+                self._b1.popitem(False)
+            else:
+                self._b2.popitem(False)
+
+        return entry
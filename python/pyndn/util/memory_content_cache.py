@@ -21,18 +21,22 @@
 This module defines the MemoryContentCache class which holds a set of Data
 packets and answers an Interest to return the correct Data packet. The cache is
 periodically cleaned up to remove each stale Data packet based on its
-FreshnessPeriod (if it has one).
+FreshnessPeriod (if it has one). The cache can also be bounded by a maximum
+content count and byte count, using a pluggable EvictionPolicy.
 Note: This class is an experimental feature. See the API docs for more detail at
 http://named-data.net/doc/ndn-ccl-api/memory-content-cache.html .
 """
 
 import logging
-import collections
+import bisect
+import heapq
 from pyndn.forwarding_flags import ForwardingFlags
 from pyndn.interest_filter import InterestFilter
 from pyndn.encoding.wire_format import WireFormat
 from pyndn.name import Name
 from pyndn.util.common import Common
+from pyndn.impl.name_trie import NameTrie
+from pyndn.util.eviction_policy import LruEvictionPolicy
 
 class MemoryContentCache(object):
     """
@@ -60,13 +64,37 @@ class MemoryContentCache(object):
         self._interestFilterIdList = []
         # elements are int
         self._registeredPrefixIdList = []
-        # elements are MemoryContentCache._Content
-        self._noStaleTimeCache = []
-        # elements are MemoryContentCache.StaleTimeContent
-        self._staleTimeCache = []
-        self._emptyComponent = Name.Component()
-        self._pendingInterestTable = [] # of PendingInterest
+        # The names of all the content in the cache in sorted order, so that the
+        # content under an interest name is a contiguous range found by bisect.
+        # (A duplicate name is inserted after the existing ones.)
+        self._contentNames = []
+        # The MemoryContentCache._Content for each of _contentNames, kept in
+        # sync with it.
+        self._contents = []
+        # A heap of (cacheRemovalTimeMilliseconds, sequenceNo, content) for
+        # each MemoryContentCache._StaleTimeContent, used by _doCleanup. The
+        # sequenceNo keeps content added at the same time in order.
+        self._staleTimeHeap = []
+        self._nextContentSequenceNo = 0
+        # The number of evicted entries which are still in _staleTimeHeap.
+        self._nEvictedInStaleTimeHeap = 0
+        # The pending interest table is a NameTrie of _PendingInterest indexed
+        # by the interest name, so that add(data) only visits the pending
+        # interests whose name is a prefix of the data name.
+        self._pendingInterestTable = NameTrie()
+        # A heap of (timeoutTimeMilliseconds, sequenceNo, pendingInterest) for
+        # each _PendingInterest which has a timeout.
+        self._pendingInterestTimeoutHeap = []
+        self._nextPendingInterestSequenceNo = 0
         self._minimumCacheLifetime = 0.0
+        # None means no limit.
+        self._maxContentCount = None
+        self._maxByteCount = None
+        self._byteCount = 0
+        self._evictionPolicy = LruEvictionPolicy()
+        self._hitCount = 0
+        self._missCount = 0
+        self._evictionCount = 0
 
     def registerPrefix(
       self, prefix, onRegisterFailed, onRegisterSuccess = None,
@@ -141,9 +169,9 @@ class MemoryContentCache(object):
         else:
           onRegisterSuccess = None
 
-        if isinstance(arg3, collections.Callable):
+        if callable(arg3):
           onDataNotFound = arg3
-        elif isinstance(arg4, collections.Callable):
+        elif callable(arg4):
           onDataNotFound = arg4
         else:
           onDataNotFound = None
@@ -245,7 +273,10 @@ class MemoryContentCache(object):
         This also checks if cleanupIntervalMilliseconds
         milliseconds have passed and
         removes stale content from the cache. After removing stale content,
-        remove timed-out pending interests from storePendingInterest(), then if
+        remove timed-out pending interests from storePendingInterest(). If
+        storing the Data packet would go over getMaxContentCount() or
+        getMaxByteCount(), first remove content chosen by the eviction policy.
+        Then if
         the added Data packet satisfies any interest, send it through the
         face and remove the interest from the pending interest table.
 
@@ -257,35 +288,54 @@ class MemoryContentCache(object):
 
         if (data.getMetaInfo().getFreshnessPeriod() != None and
               data.getMetaInfo().getFreshnessPeriod() >= 0.0):
-            # The content will go stale, so use staleTimeCache.
+            # The content will go stale.
             content = MemoryContentCache._StaleTimeContent(
               data, nowMilliseconds, self._minimumCacheLifetime)
-            # Insert into _staleTimeCache, sorted on
-            # content._cacheRemovalTimeMilliseconds.
-            # Search from the back since we expect it to go there.
-            i = len(self._staleTimeCache) - 1
-            while i >= 0:
-                if (self._staleTimeCache[i]._cacheRemovalTimeMilliseconds <=
-                      content._cacheRemovalTimeMilliseconds):
-                    break
-                i -= 1
-
-            # Element i is the greatest less than or equal to
-            # content._cacheRemovalTimeMilliseconds, so insert after it.
-            self._staleTimeCache.insert(i + 1, content)
         else:
-            # The data does not go stale, so use _noStaleTimeCache.
-            self._noStaleTimeCache.append(MemoryContentCache._Content(data))
-
-        # Remove timed-out interests and check if the data packet matches any
-        #   pending interest.
-        # Go backwards through the list so we can erase entries.
-        for i in range(len(self._pendingInterestTable) - 1, -1, -1):
-            pendingInterest = self._pendingInterestTable[i]
-            if pendingInterest.isTimedOut(nowMilliseconds):
-                self._pendingInterestTable.pop(i)
-                continue
-
+            # The data does not go stale.
+            content = MemoryContentCache._Content(data)
+
+        contentByteCount = len(content.getDataEncoding())
+        if (self._maxByteCount != None and
+              contentByteCount > self._maxByteCount):
+            # The content can never fit, so don't store it. It can still
+            # satisfy a pending interest below.
+            logging.getLogger(__name__).debug(
+              "Not caching %s: %d bytes is more than the maximum byte count",
+              content.getName().toUri(), contentByteCount)
+        else:
+            self._evict(1, contentByteCount)
+
+            # Insert after any content with the same name.
+            i = bisect.bisect_right(self._contentNames, content.getName())
+            self._contentNames.insert(i, content.getName())
+            self._contents.insert(i, content)
+            self._byteCount += contentByteCount
+            self._evictionPolicy.onInsert(content)
+            if isinstance(content, MemoryContentCache._StaleTimeContent):
+                heapq.heappush(self._staleTimeHeap,
+                  (content._cacheRemovalTimeMilliseconds,
+                   self._nextContentSequenceNo, content))
+                self._nextContentSequenceNo += 1
+
+        # Remove timed-out interests. The heap is ordered on the timeout time,
+        # so we only need to pop the timed-out entries at the top.
+        while (len(self._pendingInterestTimeoutHeap) > 0 and
+               self._pendingInterestTimeoutHeap[0][2].isTimedOut(nowMilliseconds)):
+            pendingInterest = heapq.heappop(self._pendingInterestTimeoutHeap)[2]
+            # This does nothing if the pending interest was already satisfied.
+            self._pendingInterestTable.remove(
+              pendingInterest.getInterest().getName(), pendingInterest)
+
+        # Check if the data packet matches any pending interest whose name is
+        # a prefix of the data name. Check the most recent first.
+        pendingInterests = []
+        self._pendingInterestTable.findPrefixItems(
+          data.getName(), pendingInterests)
+        pendingInterests.sort(
+          key = lambda pendingInterest: pendingInterest._sequenceNo,
+          reverse = True)
+        for pendingInterest in pendingInterests:
             if pendingInterest.getInterest().matchesName(data.getName()):
                 try:
                     # Send to the same face from the original call to onInterest.
@@ -296,8 +346,10 @@ class MemoryContentCache(object):
                       "Error in face.send: %s", str(ex))
                     return
 
-                # The pending interest is satisfied, so remove it.
-                self._pendingInterestTable.pop(i)
+                # The pending interest is satisfied, so remove it. (It stays in
+                # _pendingInterestTimeoutHeap until it times out.)
+                self._pendingInterestTable.remove(
+                  pendingInterest.getInterest().getName(), pendingInterest)
 
     def storePendingInterest(self, interest, face):
         """
@@ -311,8 +363,15 @@ class MemoryContentCache(object):
         :param Face face: The Face with the connection which
           received the interest. This comes from the OnInterest callback.
         """
-        self._pendingInterestTable.append(
-          self._PendingInterest(interest, face))
+        pendingInterest = self._PendingInterest(
+          interest, face, self._nextPendingInterestSequenceNo)
+        self._nextPendingInterestSequenceNo += 1
+
+        self._pendingInterestTable.add(interest.getName(), pendingInterest)
+        if pendingInterest._timeoutTimeMilliseconds >= 0.0:
+            heapq.heappush(self._pendingInterestTimeoutHeap,
+              (pendingInterest._timeoutTimeMilliseconds,
+               pendingInterest._sequenceNo, pendingInterest))
 
     def getStorePendingInterest(self):
         """
@@ -348,6 +407,122 @@ class MemoryContentCache(object):
         """
         self._minimumCacheLifetime = minimumCacheLifetime
 
+    def getMaxContentCount(self):
+        """
+        Get the maximum number of Data packets in the cache.
+
+        :return: The maximum number of Data packets, or None for no limit.
+        :rtype: int
+        """
+        return self._maxContentCount
+
+    def setMaxContentCount(self, maxContentCount):
+        """
+        Set the maximum number of Data packets in the cache. When add(data)
+        would go over the limit, this uses the eviction policy to remove
+        content. If the cache already has more content, this removes it now.
+        The default is no limit.
+
+        :param int maxContentCount: The maximum number of Data packets, or None
+          for no limit.
+        """
+        self._maxContentCount = maxContentCount
+        self._evict(0, 0)
+
+    def getMaxByteCount(self):
+        """
+        Get the maximum total size of the Data packet encodings in the cache.
+
+        :return: The maximum number of bytes, or None for no limit.
+        :rtype: int
+        """
+        return self._maxByteCount
+
+    def setMaxByteCount(self, maxByteCount):
+        """
+        Set the maximum total size of the Data packet encodings in the cache.
+        When add(data) would go over the limit, this uses the eviction policy to
+        remove content, and a Data packet which is larger than the limit is not
+        stored. If the cache already has more content, this removes it now. The
+        default is no limit.
+
+        :param int maxByteCount: The maximum number of bytes, or None for no
+          limit.
+        """
+        self._maxByteCount = maxByteCount
+        self._evict(0, 0)
+
+    def getEvictionPolicy(self):
+        """
+        Get the eviction policy which chooses the content to remove when the
+        cache is full.
+
+        :return: The eviction policy.
+        :rtype: EvictionPolicy
+        """
+        return self._evictionPolicy
+
+    def setEvictionPolicy(self, evictionPolicy):
+        """
+        Set the eviction policy which chooses the content to remove when the
+        cache is full. The default is an LruEvictionPolicy. The new policy
+        starts tracking the content already in the cache.
+
+        :param EvictionPolicy evictionPolicy: The eviction policy, for example
+          LruEvictionPolicy(), LfuEvictionPolicy() or ArcEvictionPolicy(). It
+          should not be used by another cache.
+        """
+        self._evictionPolicy = evictionPolicy
+        for content in self._contents:
+            evictionPolicy.onInsert(content)
+
+    def getHitCount(self):
+        """
+        Get the number of interests which were answered from the cache.
+
+        :return: The number of hits.
+        :rtype: int
+        """
+        return self._hitCount
+
+    def getMissCount(self):
+        """
+        Get the number of interests which did not match content in the cache.
+
+        :return: The number of misses.
+        :rtype: int
+        """
+        return self._missCount
+
+    def getEvictionCount(self):
+        """
+        Get the number of Data packets which the eviction policy removed to
+        stay within the maximum content count and byte count. This does not
+        include stale content removed during cleanup.
+
+        :return: The number of evictions.
+        :rtype: int
+        """
+        return self._evictionCount
+
+    def getByteCount(self):
+        """
+        Get the total size of the Data packet encodings now in the cache.
+
+        :return: The number of bytes.
+        :rtype: int
+        """
+        return self._byteCount
+
+    def size(self):
+        """
+        Get the number of Data packets now in the cache.
+
+        :return: The number of Data packets.
+        :rtype: int
+        """
+        return len(self._contents)
+
     def _storePendingInterestCallback(
           self, prefix, interest, face, interestFilterId, filter):
         """
@@ -364,60 +539,50 @@ class MemoryContentCache(object):
         First check if cleanupIntervalMilliseconds milliseconds have passed and
         remove stale content from the cache. Then search the cache for the Data
         packet, matching any interest selectors including ChildSelector, and
-        send the Data packet to the face. If no matching Data packet is in
+        send the Data packet to the face. (If there is no ChildSelector, send
+        the leftmost match.) The search only visits the content whose name has
+        the interest name as a prefix, found in the sorted name index in
+        logarithmic time. If no matching Data packet is in
         the cache, call the callback in onDataNotFoundForPrefix (if defined).
         """
         nowMilliseconds = Common.getNowMilliseconds()
         self._doCleanup(nowMilliseconds)
 
-        selectedComponent = None
-        selectedEncoding = None
-        # We need to iterate over both arrays.
-        totalSize = len(self._staleTimeCache) + len(self._noStaleTimeCache)
-        for i in range(totalSize):
-            isFresh = True
-            if i < len(self._staleTimeCache):
-                content = self._staleTimeCache[i]
-                isFresh = content.isFresh(nowMilliseconds)
-            else:
-                # We have iterated over the first array. Get from the second.
-                content = self._noStaleTimeCache[i - len(self._staleTimeCache)]
+        # The names in the canonical order are sorted first on the components of
+        # the interest name, so the content under the interest name is the
+        # range from the interest name up to (but not including) its successor.
+        interestName = interest.getName()
+        begin = bisect.bisect_left(self._contentNames, interestName)
+        if interestName.size() == 0:
+            end = len(self._contentNames)
+        else:
+            end = bisect.bisect_left(
+              self._contentNames, interestName.getSuccessor(), begin)
+
+        # Within the range, the content is sorted on the child component. If
+        # there is no ChildSelector, also send the leftmost match.
+        if interest.getChildSelector() == 1:
+            # Rightmost child.
+            indexes = range(end - 1, begin - 1, -1)
+        else:
+            indexes = range(begin, end)
 
+        selectedContent = None
+        for i in indexes:
+            content = self._contents[i]
             if (interest.matchesName(content.getName()) and
-                  not (interest.getMustBeFresh() and not isFresh)):
-                if (interest.getChildSelector() == None):
-                    # No child selector, so send the first match that we have found.
-                    face.send(content.getDataEncoding())
-                    return
-                else:
-                    # Update selectedEncoding based on the child selector.
-                    if (content.getName().size() > interest.getName().size()):
-                        component = content.getName().get(interest.getName().size())
-                    else:
-                        component = self._emptyComponent
-
-                    gotBetterMatch = False
-                    if selectedEncoding == None:
-                        # Save the first match.
-                        gotBetterMatch = True
-                    else:
-                        if interest.getChildSelector() == 0:
-                            # Leftmost child.
-                            if component.compare(selectedComponent) < 0:
-                                gotBetterMatch = True
-                        else:
-                            # Rightmost child.
-                            if component.compare(selectedComponent) > 0:
-                                gotBetterMatch = True
-
-                    if gotBetterMatch:
-                        selectedComponent = component
-                        selectedEncoding = content.getDataEncoding()
-
-        if selectedEncoding != None:
-            # We found the leftmost or rightmost child.
-            face.send(selectedEncoding)
+                  not (interest.getMustBeFresh() and
+                       not content.isFresh(nowMilliseconds))):
+                selectedContent = content
+                break
+
+        if selectedContent != None:
+            # We found the leftmost or rightmost match.
+            self._hitCount += 1
+            self._evictionPolicy.onAccess(selectedContent)
+            face.send(selectedContent.getDataEncoding())
         else:
+            self._missCount += 1
             # Call the onDataNotFound callback (if defined).
             if prefix.toUri() in self._onDataNotFoundForPrefix:
                 try:
@@ -429,22 +594,96 @@ class MemoryContentCache(object):
     def _doCleanup(self, nowMilliseconds):
         """
         Check if now is greater than nextCleanupTime and, if so, remove stale
-        content from staleTimeCache and reset nextCleanupTime based on
-        cleanupIntervalMilliseconds. Since add(Data) does a sorted insert into
-        staleTimeCache, the check for stale data is quick and does not require
-        searching the entire staleTimeCache.
+        content from the cache and reset nextCleanupTime based on
+        cleanupIntervalMilliseconds. Since add(Data) pushes stale-time content
+        onto a heap ordered by removal time, the check for stale data is quick
+        and does not require searching the entire cache.
+
         :param float nowMilliseconds: The current time in milliseconds from
           Common.getNowMilliseconds().
         """
         if nowMilliseconds >= self._nextCleanupTime:
-            # staleTimeCache is sorted on _cacheRemovalTimeMilliseconds, so we only need
-            # to erase the stale entries at the front, then quit.
-            while (len(self._staleTimeCache) > 0 and
-                   self._staleTimeCache[0].isPastRemovalTime(nowMilliseconds)):
-                del self._staleTimeCache[0]
+            # _staleTimeHeap is ordered on _cacheRemovalTimeMilliseconds, so we
+            # only need to pop the stale entries at the top, then quit.
+            while (len(self._staleTimeHeap) > 0 and
+                   self._staleTimeHeap[0][2].isPastRemovalTime(nowMilliseconds)):
+                content = heapq.heappop(self._staleTimeHeap)[2]
+                if content._isEvicted:
+                    self._nEvictedInStaleTimeHeap -= 1
+                    continue
+                if self._removeContent(content):
+                    self._evictionPolicy.onRemove(content)
 
             self._nextCleanupTime = nowMilliseconds + self._cleanupIntervalMilliseconds
 
+    def _evict(self, nNewContent, nNewBytes):
+        """
+        Use the eviction policy to remove content until there is room for
+        nNewContent more Data packets with nNewBytes more bytes.
+
+        :param int nNewContent: The number of Data packets to make room for.
+        :param int nNewBytes: The number of bytes to make room for.
+        """
+        while len(self._contents) > 0 and (
+              (self._maxContentCount != None and
+               len(self._contents) + nNewContent > self._maxContentCount) or
+              (self._maxByteCount != None and
+               self._byteCount + nNewBytes > self._maxByteCount)):
+            content = self._evictionPolicy.evict()
+            if content == None or not self._removeContent(content):
+                # The policy is out of sync with the cache. (This shouldn't
+                # happen.)
+                logging.getLogger(__name__).error(
+                  "The eviction policy did not return content in the cache")
+                return
+            self._evictionCount += 1
+
+            if isinstance(content, MemoryContentCache._StaleTimeContent):
+                self._onStaleTimeContentEvicted(content)
+
+    def _onStaleTimeContentEvicted(self, content):
+        """
+        Mark the evicted content so that _doCleanup skips it. Evicted entries
+        are removed lazily when they reach the top of _staleTimeHeap, but if
+        they are more than half of the heap then remove them all now so that
+        the heap (and the encodings it refers to) stays bounded by the cache
+        limits even if the content has a long freshness period.
+
+        :param MemoryContentCache._StaleTimeContent content: The evicted
+          content.
+        """
+        content._isEvicted = True
+        self._nEvictedInStaleTimeHeap += 1
+        if (self._nEvictedInStaleTimeHeap > 16 and
+              self._nEvictedInStaleTimeHeap * 2 > len(self._staleTimeHeap)):
+            self._staleTimeHeap = [item for item in self._staleTimeHeap
+                                   if not item[2]._isEvicted]
+            heapq.heapify(self._staleTimeHeap)
+            self._nEvictedInStaleTimeHeap = 0
+
+    def _removeContent(self, content):
+        """
+        Remove the content from _contentNames and _contents and update the byte
+        count.
+
+        :param MemoryContentCache._Content content: The content to remove,
+          found by its name and then by identity.
+        :return: True if the content was removed, False if it was not found.
+        :rtype: bool
+        """
+        i = bisect.bisect_left(self._contentNames, content.getName())
+        while i < len(self._contents):
+            if self._contents[i] is content:
+                del self._contentNames[i]
+                del self._contents[i]
+                self._byteCount -= len(content.getDataEncoding())
+                return True
+            if self._contentNames[i] != content.getName():
+                break
+            i += 1
+
+        return False
+
     """
     _Content is a private class to hold the name and encoding for each entry in
     the cache. This base class is for a Data packet without a FreshnessPeriod.
@@ -468,6 +707,12 @@ class MemoryContentCache(object):
         def getDataEncoding(self):
             return self._dataEncoding
 
+        def isFresh(self, nowMilliseconds):
+            """
+            Content without a FreshnessPeriod is always fresh.
+            """
+            return True
+
     """
     _StaleTimeContent extends _Content to include the
     _cacheRemovalTimeMilliseconds for when this entry should be cleaned up from
@@ -500,6 +745,8 @@ class MemoryContentCache(object):
             # Common.getNowMilliseconds().
             self._freshnessExpiryTimeMilliseconds = (nowMilliseconds +
               data.getMetaInfo().getFreshnessPeriod())
+            # True if the content was evicted but is still in _staleTimeHeap.
+            self._isEvicted = False
 
         def isPastRemovalTime(self, nowMilliseconds):
             """
@@ -539,13 +786,17 @@ class MemoryContentCache(object):
         :param Face face: The face from the onInterest callback.
           If the interest is satisfied later by a new data packet, we will send
           the data packet to the face.
+        :param int sequenceNo: The sequence number which orders the pending
+          interests by when they were stored.
         """
-        def __init__(self, interest, face):
+        def __init__(self, interest, face, sequenceNo):
             self._interest = interest
             self._face = face
+            self._sequenceNo = sequenceNo
 
             # Set up _timeoutTimeMilliseconds.
-            if self._interest.getInterestLifetimeMilliseconds() >= 0.0:
+            if (self._interest.getInterestLifetimeMilliseconds() != None and
+                self._interest.getInterestLifetimeMilliseconds() >= 0.0):
               self._timeoutTimeMilliseconds = (Common.getNowMilliseconds() +
                 self._interest.getInterestLifetimeMilliseconds())
             else:
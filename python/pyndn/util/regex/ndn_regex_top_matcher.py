@@ -18,6 +18,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # A copy of the GNU Lesser General Public License is in the file COPYING.
 
+from collections import OrderedDict
 from pyndn.name import Name
 from pyndn.util.regex.ndn_regex_matcher_base import NdnRegexMatcherBase
 from pyndn.util.regex.ndn_regex_backref_manager import NdnRegexBackrefManager
@@ -129,6 +130,76 @@ class NdnRegexTopMatcher(NdnRegexMatcherBase):
 
         return NdnRegexTopMatcher(regexStr)
 
+    class Cache(object):
+        """
+        Create an NdnRegexTopMatcher.Cache which keeps the compiled matchers
+        for the most recently used expressions, so that a matcher is not
+        compiled again each time the same expression is used. Since a matcher
+        keeps the result of the last call to match() which expand() uses, a
+        cache must only be used by one owner such as a ConfigPolicyManager,
+        and not shared between threads.
+
+        :param int maxSize: (optional) The maximum number of matchers to keep.
+          If omitted, use 100.
+        """
+        def __init__(self, maxSize = 100):
+            # The key is the expression str. The value is the
+            # NdnRegexTopMatcher.
+            self._matchers = OrderedDict()
+            self._maxSize = maxSize
+
+        def get(self, expr):
+            """
+            Get the NdnRegexTopMatcher for the expression, creating and adding
+            it if needed. The returned matcher is the same object each time
+            for the same expression, so call match() and then expand() before
+            getting it again.
+
+            :param str expr: The expression.
+            :return: The compiled matcher.
+            :rtype: NdnRegexTopMatcher
+            """
+            matcher = self._matchers.pop(expr, None)
+            if matcher == None:
+                matcher = NdnRegexTopMatcher(expr)
+                while (len(self._matchers) >= self._maxSize and
+                       len(self._matchers) > 0):
+                    # Remove the least recently used matcher.
+                    self._matchers.popitem(False)
+
+            # Insert at the end as the most recently used.
+            self._matchers[expr] = matcher
+            return matcher
+
+        def size(self):
+            """
+            Get the number of matchers in the cache.
+
+            :return: The number of matchers.
+            :rtype: int
+            """
+            return len(self._matchers)
+
+        def getMaxSize(self):
+            """
+            Get the maximum number of matchers kept by the cache.
+
+            :return: The maximum cache size.
+            :rtype: int
+            """
+            return self._maxSize
+
+        def setMaxSize(self, maxSize):
+            """
+            Set the maximum number of matchers kept by the cache. If the cache
+            has more matchers, remove the least recently used.
+
+            :param int maxSize: The maximum cache size.
+            """
+            self._maxSize = maxSize
+            while len(self._matchers) > maxSize:
+                self._matchers.popitem(False)
+
     def _compile(self):
         errMsg = "Error: RegexTopMatcher.Compile(): "
 
@@ -38,28 +38,43 @@ The following logic is implemented in SegmentFetcher:
 
 2. Infer the latest version of the Data: <version> = Data.getName().get(-2)
 
-3. If the segment number in the retrieved packet == 0, go to step 5.
+3. Keep a window of Interests outstanding for the segments which have not
+   been received, starting with segment 0, until all segments up to the
+   FinalBlockId are received. (The segment from step 1 is not fetched again.)
 
-4. Send an Interest for segment 0:
+   >> Interest: /<prefix>/<version>/<segment=N>
 
-   >> Interest: /<prefix>/<version>/<segment=0>
+   The window size is adjusted with AIMD congestion control. It grows for each
+   received segment (exponentially in slow start, then additively) and is
+   multiplied by a decrease factor, at most once per window, on an Interest
+   timeout, a congestion or duplicate network Nack, or a Data packet with a
+   CongestionMark. Segments may arrive out of order, and a timed-out or
+   Nacked segment is retransmitted by itself up to the maximum number of
+   retries. See SegmentFetcher.Options.
 
-5. Keep sending Interests for the next segment while the retrieved Data does
-   not have a FinalBlockId or the FinalBlockId != Data.getName().get(-1).
-
-   >> Interest: /<prefix>/<version>/<segment=(N+1))>
-
-6. Call the onComplete callback with a Blob that concatenates the content
+4. Call the onComplete callback with a Blob that concatenates the content
    from all the segmented objects.
 
+Instead of keeping all the content until the end, an application can pass an
+onSegment callback to fetch which receives the content of each segment in
+order as soon as it and the segments before it are received, for example to
+write the content to a file. An application can also pass a
+SegmentFetcher.BufferSink which writes the content into a preallocated
+bytearray or mmap, or can iterate over the content with
+SegmentFetcher.fetchSegments.
+
 If an error occurs during the fetching process, the onError callback is called
 with a proper error code.  The following errors are possible:
 
-- `INTEREST_TIMEOUT`: if any of the Interests times out
+- `INTEREST_TIMEOUT`: if any of the Interests times out after the maximum
+  number of retries
 - `DATA_HAS_NO_SEGMENT`: if any of the retrieved Data packets don't have a segment
   as the last component of the name (not counting the implicit digest)
 - `SEGMENT_VERIFICATION_FAILED`: if any retrieved segment fails
   the user-provided VerifySegment callback or KeyChain verifyData.
+- `NACK_ERROR`: if a network Nack is received for an Interest, after the
+  maximum number of retries for a congestion or duplicate Nack
+- `SEGMENT_DELIVERY_FAILED`: if the onSegment callback raises an exception
 
 In order to validate individual segments, a KeyChain needs to be supplied. If
 verifyData fails, the fetching process is aborted with
@@ -79,7 +94,10 @@ Example:
 """
 
 import logging
+import time
+from pyndn.name import Name
 from pyndn.interest import Interest
+from pyndn.network_nack import NetworkNack
 from pyndn.util.blob import Blob
 
 class SegmentFetcher(object):
@@ -111,15 +129,47 @@ class SegmentFetcher(object):
       for better error handling the callback should catch and properly
       handle any exceptions.
     :type onError: function object
+    :param SegmentFetcher.Options options: The options for the window of
+      outstanding Interests. This does not copy the object.
+    :param onSegment: If not None, call onSegment(segmentNumber, content) for
+      each segment in order instead of keeping the content for onComplete. This
+      may also be a SegmentFetcher.BufferSink.
+    :type onSegment: function object
     """
-    def __init__(self, face, validatorKeyChain, verifySegment, onComplete, onError):
+    def __init__(self, face, validatorKeyChain, verifySegment, onComplete,
+                 onError, options, onSegment = None):
         self._face = face
         self._validatorKeyChain = validatorKeyChain
         self._verifySegment = verifySegment
         self._onComplete = onComplete
         self._onError = onError
+        self._options = options
+        self._onSegment = onSegment
 
+        self._baseInterest = None
+        # The name without the segment, set from the first Data packet.
+        self._versionedPrefix = None
+        # The pendingInterestId of the Interest to discover the version.
+        self._discoveryPendingInterestId = None
+        self._windowSize = float(options.getInitialWindowSize())
+        self._slowStartThreshold = float(
+          options.getInitialSlowStartThreshold())
+        # Don't decrease the window again for a congestion event on a segment
+        # which was requested before the last decrease.
+        self._recoveryPoint = -1
+        self._nextSegmentToRequest = 0
+        self._finalSegmentNumber = None
+        # The key is the segment number. The value is the _PendingSegment.
+        self._pendingSegments = {}
+        # Segment numbers to request again before requesting new segments.
+        self._retransmitQueue = []
+        # Content received out of order. The key is the segment number. The
+        # value is the content Blob.
+        self._receivedSegments = {}
         self._contentParts = [] # of Blob
+        # The number of segments given to _deliverSegment, in order.
+        self._nDeliveredSegments = 0
+        self._isFinished = False
 
     class ErrorCode(object):
         """
@@ -128,6 +178,300 @@ class SegmentFetcher(object):
         INTEREST_TIMEOUT = 1
         DATA_HAS_NO_SEGMENT = 2
         SEGMENT_VERIFICATION_FAILED =  3
+        NACK_ERROR = 4
+        SEGMENT_DELIVERY_FAILED = 5
+
+    class Error(Exception):
+        """
+        SegmentFetcher.fetchSegments and the AsyncioFace.fetchSegments
+        iteration raise a SegmentFetcher.Error for an error which fetch would
+        report to onError.
+
+        :param int errorCode: The value from SegmentFetcher.ErrorCode.
+        :param str message: The error message.
+        """
+        def __init__(self, errorCode, message):
+            super(SegmentFetcher.Error, self).__init__(message)
+            self._errorCode = errorCode
+
+        def getErrorCode(self):
+            """
+            Get the error code given to the constructor.
+
+            :return: The value from SegmentFetcher.ErrorCode.
+            :rtype: int
+            """
+            return self._errorCode
+
+    class BufferSink(object):
+        """
+        A BufferSink can be passed to SegmentFetcher.fetch as the onSegment
+        callback to write the content of each segment into one buffer without
+        keeping a list of content Blobs. When fetching is complete, onComplete
+        receives a Blob of the written bytes which shares the buffer.
+
+        :param buffer: (optional) A preallocated bytearray, or an mmap opened
+          for writing. If the buffer is too small, this resizes it. If omitted,
+          this allocates a bytearray. If the FinalBlockId is known, this
+          allocates the size of the first segment times the number of segments.
+        :type buffer: bytearray or mmap.mmap
+        """
+        def __init__(self, buffer = None):
+            self._buffer = buffer
+            self._size = 0
+            self._segmentSize = None
+            self._finalSegmentNumber = None
+
+        def __call__(self, segmentNumber, content):
+            """
+            Write the content of the segment after the content of the previous
+            segments. This is called by SegmentFetcher in segment order.
+
+            :param int segmentNumber: The segment number.
+            :param Blob content: The content of the segment.
+            """
+            if self._segmentSize == None:
+                self._segmentSize = content.size()
+
+            end = self._size + content.size()
+            if self._buffer == None:
+                self._buffer = bytearray(max(end, self._getSizeHint()))
+            elif end > len(self._buffer):
+                newSize = max(end, self._getSizeHint(), 2 * len(self._buffer))
+                if isinstance(self._buffer, bytearray):
+                    self._buffer.extend(bytearray(newSize - len(self._buffer)))
+                else:
+                    # Assume it is an mmap.
+                    self._buffer.resize(newSize)
+
+            if content.size() > 0:
+                self._buffer[self._size:end] = content.toBuffer()
+            self._size = end
+
+        def setFinalSegmentNumber(self, finalSegmentNumber):
+            """
+            Set the final segment number which is used for the size hint. This
+            is called by SegmentFetcher when it gets the FinalBlockId.
+
+            :param int finalSegmentNumber: The final segment number.
+            """
+            self._finalSegmentNumber = finalSegmentNumber
+
+        def getBuffer(self):
+            """
+            Get the buffer which may be larger than the written content.
+
+            :return: The buffer given to the constructor, or the allocated
+              bytearray, or None if nothing has been written.
+            :rtype: bytearray or mmap.mmap
+            """
+            return self._buffer
+
+        def getSize(self):
+            """
+            Get the number of bytes written to the buffer.
+
+            :return: The number of bytes written.
+            :rtype: int
+            """
+            return self._size
+
+        def getContent(self):
+            """
+            Get a Blob of the written bytes, which shares the buffer.
+
+            :return: The content Blob.
+            :rtype: Blob
+            """
+            if self._buffer == None:
+                return Blob(bytearray(0), False)
+            return Blob(memoryview(self._buffer)[:self._size], False)
+
+        def _getSizeHint(self):
+            if self._finalSegmentNumber == None or self._segmentSize == None:
+                return 0
+            return self._segmentSize * (self._finalSegmentNumber + 1)
+
+    class Options(object):
+        """
+        Create a SegmentFetcher.Options with the default values for the window
+        of outstanding Interests. The window starts at one Interest and grows
+        by one with each received segment up to the slow start threshold of 32,
+        then more slowly up to the maximum window size of 64. A timed-out
+        Interest is reported as an error without retrying. To fetch one
+        segment at a time, call setMaxWindowSize(1).
+        """
+        def __init__(self):
+            self._initialWindowSize = 1.0
+            self._maxWindowSize = 64.0
+            self._initialSlowStartThreshold = 32.0
+            self._additiveIncreaseStep = 1.0
+            self._multiplicativeDecreaseFactor = 0.5
+            self._maxRetries = 0
+            self._ignoreCongestionMarks = False
+
+        def getInitialWindowSize(self):
+            """
+            Get the initial number of outstanding Interests.
+
+            :return: The initial window size.
+            :rtype: float
+            """
+            return self._initialWindowSize
+
+        def getMaxWindowSize(self):
+            """
+            Get the maximum number of outstanding Interests.
+
+            :return: The maximum window size. The default is 64.
+            :rtype: float
+            """
+            return self._maxWindowSize
+
+        def getInitialSlowStartThreshold(self):
+            """
+            Get the initial slow start threshold. While the window size is less
+            than this, each received segment increases the window by the
+            additive increase step.
+
+            :return: The initial slow start threshold. The default is 32.
+            :rtype: float
+            """
+            return self._initialSlowStartThreshold
+
+        def getAdditiveIncreaseStep(self):
+            """
+            Get the additive increase step. After slow start, the window grows
+            by this much for each window of received segments.
+
+            :return: The additive increase step.
+            :rtype: float
+            """
+            return self._additiveIncreaseStep
+
+        def getMultiplicativeDecreaseFactor(self):
+            """
+            Get the factor to multiply the window size by on a congestion event.
+
+            :return: The multiplicative decrease factor.
+            :rtype: float
+            """
+            return self._multiplicativeDecreaseFactor
+
+        def getMaxRetries(self):
+            """
+            Get the maximum number of times to retransmit the Interest for a
+            segment after a timeout or a congestion or duplicate network Nack.
+
+            :return: The maximum number of retries.
+            :rtype: int
+            """
+            return self._maxRetries
+
+        def getIgnoreCongestionMarks(self):
+            """
+            Get the flag for whether to ignore the CongestionMark of received
+            Data packets.
+
+            :return: True to ignore congestion marks.
+            :rtype: bool
+            """
+            return self._ignoreCongestionMarks
+
+        def setInitialWindowSize(self, initialWindowSize):
+            """
+            Set the initial number of outstanding Interests.
+
+            :param float initialWindowSize: The initial window size, which must
+              be at least 1.
+            :return: This Options so that you can chain calls to update values.
+            :rtype: SegmentFetcher.Options
+            """
+            if initialWindowSize < 1:
+                raise ValueError(
+                  "SegmentFetcher.Options: The initial window size must be at least 1")
+            self._initialWindowSize = initialWindowSize
+            return self
+
+        def setMaxWindowSize(self, maxWindowSize):
+            """
+            Set the maximum number of outstanding Interests. If you don't call
+            this, the maximum window size is 64.
+
+            :param float maxWindowSize: The maximum window size, which must be
+              at least 1. Use float("inf") for no maximum.
+            :return: This Options so that you can chain calls to update values.
+            :rtype: SegmentFetcher.Options
+            """
+            if maxWindowSize < 1:
+                raise ValueError(
+                  "SegmentFetcher.Options: The maximum window size must be at least 1")
+            self._maxWindowSize = maxWindowSize
+            return self
+
+        def setInitialSlowStartThreshold(self, initialSlowStartThreshold):
+            """
+            Set the initial slow start threshold. If you don't call this, the
+            initial slow start threshold is 32.
+
+            :param float initialSlowStartThreshold: The initial slow start
+              threshold.
+            :return: This Options so that you can chain calls to update values.
+            :rtype: SegmentFetcher.Options
+            """
+            self._initialSlowStartThreshold = initialSlowStartThreshold
+            return self
+
+        def setAdditiveIncreaseStep(self, additiveIncreaseStep):
+            """
+            Set the additive increase step.
+
+            :param float additiveIncreaseStep: The additive increase step.
+            :return: This Options so that you can chain calls to update values.
+            :rtype: SegmentFetcher.Options
+            """
+            self._additiveIncreaseStep = additiveIncreaseStep
+            return self
+
+        def setMultiplicativeDecreaseFactor(self, multiplicativeDecreaseFactor):
+            """
+            Set the factor to multiply the window size by on a congestion event.
+
+            :param float multiplicativeDecreaseFactor: The factor, which must
+              be greater than 0 and less than or equal to 1.
+            :return: This Options so that you can chain calls to update values.
+            :rtype: SegmentFetcher.Options
+            """
+            if not (multiplicativeDecreaseFactor > 0 and
+                    multiplicativeDecreaseFactor <= 1):
+                raise ValueError(
+                  "SegmentFetcher.Options: The multiplicative decrease factor must be in (0, 1]")
+            self._multiplicativeDecreaseFactor = multiplicativeDecreaseFactor
+            return self
+
+        def setMaxRetries(self, maxRetries):
+            """
+            Set the maximum number of times to retransmit the Interest for a
+            segment after a timeout or a congestion or duplicate network Nack.
+
+            :param int maxRetries: The maximum number of retries.
+            :return: This Options so that you can chain calls to update values.
+            :rtype: SegmentFetcher.Options
+            """
+            self._maxRetries = maxRetries
+            return self
+
+        def setIgnoreCongestionMarks(self, ignoreCongestionMarks):
+            """
+            Set the flag for whether to ignore the CongestionMark of received
+            Data packets.
+
+            :param bool ignoreCongestionMarks: True to ignore congestion marks.
+            :return: This Options so that you can chain calls to update values.
+            :rtype: SegmentFetcher.Options
+            """
+            self._ignoreCongestionMarks = ignoreCongestionMarks
+            return self
 
     @staticmethod
     def DontVerifySegment(data):
@@ -139,13 +483,15 @@ class SegmentFetcher(object):
 
     @staticmethod
     def fetch(face, baseInterest, validatorKeyChainOrVerifySegment, onComplete,
-              onError):
+              onError, options = None, onSegment = None):
         """
         Initiate segment fetching. For more details, see the documentation for
         the module. There are two forms of fetch:
-        fetch(face, baseInterest, validatorKeyChain, onComplete, onError)
+        fetch(face, baseInterest, validatorKeyChain, onComplete, onError
+        [, options] [, onSegment])
         and
-        fetch(face, baseInterest, verifySegment, onComplete, onError)
+        fetch(face, baseInterest, verifySegment, onComplete, onError
+        [, options] [, onSegment])
 
         :param Face face: This calls face.expressInterest to fetch more segments.
         :param Interest baseInterest: An Interest for the initial segment of the
@@ -181,36 +527,186 @@ class SegmentFetcher(object):
           for better error handling the callback should catch and properly
           handle any exceptions.
         :type onError: function object
+        :param SegmentFetcher.Options options: (optional) The options for the
+          window of outstanding Interests. This does not copy the object, so you
+          should not change it while fetching. If omitted, use
+          SegmentFetcher.Options().
+        :param onSegment: (optional) If not None, call
+          onSegment(segmentNumber, content) for each segment in order (starting
+          from segment 0) as soon as it and the segments before it are received,
+          where content is a Blob. In this case, the content is not kept and
+          onComplete(content) is called with an isNull() Blob. If onSegment is a
+          SegmentFetcher.BufferSink, onComplete is called with the sink's
+          getContent(). If onSegment raises an exception, abort fetching and
+          call onError with SEGMENT_DELIVERY_FAILED.
+        :type onSegment: function object
+        :return: The SegmentFetcher, whose stop() method stops fetching.
+        :rtype: SegmentFetcher
+        """
+        fetcher = SegmentFetcher._create(
+          face, validatorKeyChainOrVerifySegment, onComplete, onError, options,
+          onSegment)
+        fetcher._fetchFirstSegment(baseInterest)
+        return fetcher
+
+    @staticmethod
+    def fetchSegments(face, baseInterest, validatorKeyChainOrVerifySegment,
+                      options = None, sleepSeconds = None):
+        """
+        Return a generator which fetches the segments and yields the content
+        Blob of each segment in order, as soon as it and the segments before it
+        are received. While waiting, this processes the events of the face. If
+        sleepSeconds is omitted or None, this uses a FaceReactor to wait until
+        the face's socket has data or an Interest times out, so there is no
+        polling delay. Otherwise, this calls face.processEvents() and sleeps for
+        sleepSeconds. (Therefore, use this with a Face which needs
+        processEvents, not with a ThreadsafeFace.) If the generator is closed
+        before all segments are received, this stops fetching.
+
+        Example:
+            for content in SegmentFetcher.fetchSegments(face, interest, None):
+                outputFile.write(content.toBytes())
+
+        :param Face face: This calls face.expressInterest to fetch segments
+          and calls face.processEvents().
+        :param Interest baseInterest: See fetch.
+        :param validatorKeyChainOrVerifySegment: The KeyChain or verifySegment
+          function object. See fetch.
+        :param SegmentFetcher.Options options: (optional) See fetch.
+        :param float sleepSeconds: (optional) The number of seconds to sleep
+          after each call to processEvents while waiting. If omitted or None,
+          wait with a FaceReactor, which needs a Face whose transport has a
+          socket, such as TcpTransport or UnixTransport.
+        :raises SegmentFetcher.Error: For an error which fetch would report to
+          onError.
+        :raises ValueError: If sleepSeconds is None and the face's transport
+          has no socket to wait on.
+        """
+        contents = []
+        result = {}
+        def onComplete(content):
+            result['isComplete'] = True
+        def onError(errorCode, message):
+            result['error'] = SegmentFetcher.Error(errorCode, message)
+
+        fetcher = SegmentFetcher._create(
+          face, validatorKeyChainOrVerifySegment, onComplete, onError, options,
+          lambda segmentNumber, content: contents.append(content))
+        fetcher._fetchFirstSegment(baseInterest)
+
+        reactor = None
+        if sleepSeconds == None:
+            # Import here to avoid import loops.
+            from pyndn.face import Face
+            from pyndn.face_reactor import FaceReactor
+            # The first Interest connected the transport.
+            if (not isinstance(face, Face) or
+                face.getTransport().getSocket() == None):
+                fetcher._finish()
+                raise ValueError(
+                  "SegmentFetcher.fetchSegments: The face transport has no socket to wait on. Use sleepSeconds.")
+            reactor = FaceReactor()
+            reactor.addFace(face)
+
+        try:
+            while True:
+                while len(contents) > 0:
+                    yield contents.pop(0)
+
+                if 'error' in result:
+                    raise result['error']
+                if 'isComplete' in result:
+                    return
+
+                if reactor != None:
+                    reactor.runOnce()
+                else:
+                    face.processEvents()
+                    if len(contents) == 0:
+                        time.sleep(sleepSeconds)
+        finally:
+            # Stop fetching if the generator is closed early.
+            fetcher._finish()
+            if reactor != None:
+                reactor.close()
+
+    @staticmethod
+    def _create(face, validatorKeyChainOrVerifySegment, onComplete, onError,
+                options, onSegment):
         """
+        Create a SegmentFetcher for fetch or fetchSegments, checking for a
+        KeyChain or a verifySegment callback.
+        """
+        if options == None:
+            options = SegmentFetcher.Options()
+
         # Import KeyChain here to avoid import loops.
         from pyndn.security.key_chain import KeyChain
         if (validatorKeyChainOrVerifySegment == None or
             isinstance(validatorKeyChainOrVerifySegment, KeyChain)):
-            SegmentFetcher(
+            return SegmentFetcher(
               face, validatorKeyChainOrVerifySegment,
               SegmentFetcher.DontVerifySegment, onComplete,
-              onError)._fetchFirstSegment(baseInterest)
+              onError, options, onSegment)
         else:
-            SegmentFetcher(face, None, validatorKeyChainOrVerifySegment,
-              onComplete, onError)._fetchFirstSegment(baseInterest)
+            return SegmentFetcher(face, None, validatorKeyChainOrVerifySegment,
+              onComplete, onError, options, onSegment)
 
     def _fetchFirstSegment(self, baseInterest):
+        self._baseInterest = Interest(baseInterest)
         interest = Interest(baseInterest)
         interest.setChildSelector(1)
         interest.setMustBeFresh(True)
-        self._face.expressInterest(interest, self._onData, self._onTimeout)
+        self._discoveryPendingInterestId = self._face.expressInterest(
+          interest, self._onData, self._onTimeout, self._onNetworkNack)
 
-    def _fetchNextSegment(self, originalInterest, dataName, segment):
+    def _fetchSegment(self, segment):
         # Start with the original Interest to preserve any special selectors.
-        interest = Interest(originalInterest)
+        interest = Interest(self._baseInterest)
         # Changing a field clears the nonce so that the library will
         #   generate a new one.
         interest.setChildSelector(0)
         interest.setMustBeFresh(False)
-        interest.setName(dataName.getPrefix(-1).appendSegment(segment))
-        self._face.expressInterest(interest, self._onData, self._onTimeout)
+        interest.setName(Name(self._versionedPrefix).appendSegment(segment))
+
+        pendingSegment = self._pendingSegments.get(segment)
+        if pendingSegment == None:
+            pendingSegment = SegmentFetcher._PendingSegment()
+            self._pendingSegments[segment] = pendingSegment
+        pendingSegment._pendingInterestId = self._face.expressInterest(
+          interest, self._onData, self._onTimeout, self._onNetworkNack)
+
+    def _fetchSegmentsInWindow(self):
+        """
+        Express Interests for retransmitted segments, then for new segments,
+        until the number of outstanding Interests reaches the window size.
+        """
+        windowSize = max(1, int(self._windowSize))
+        while (len(self._retransmitQueue) > 0 and
+               self._nOutstanding() < windowSize):
+            self._fetchSegment(self._retransmitQueue.pop(0))
+
+        while self._nOutstanding() < windowSize:
+            segment = self._nextSegmentToRequest
+            if (self._finalSegmentNumber != None and
+                segment > self._finalSegmentNumber):
+                break
+            self._nextSegmentToRequest += 1
+
+            if (segment in self._receivedSegments or
+                segment < self._nDeliveredSegments or
+                segment in self._pendingSegments):
+                # We already have it, for example from the first Interest.
+                continue
+            self._fetchSegment(segment)
+
+    def _nOutstanding(self):
+        return len(self._pendingSegments) - len(self._retransmitQueue)
 
     def _onData(self, originalInterest, data):
+        if self._isFinished:
+            return
+
         if self._validatorKeyChain != None:
             try:
                 self._validatorKeyChain.verifyData(
@@ -223,105 +719,303 @@ class SegmentFetcher(object):
             return
         else:
             if not self._verifySegment(data):
-                try:
-                    self._onError(
-                      self.ErrorCode.SEGMENT_VERIFICATION_FAILED,
-                      "Segment verification failed")
-                except:
-                    logging.exception("Error in onError")
+                self._finishWithError(
+                  self.ErrorCode.SEGMENT_VERIFICATION_FAILED,
+                  "Segment verification failed")
                 return
 
             self._onVerified(data, originalInterest)
 
     def _onVerified(self, data, originalInterest):
+        if self._isFinished:
+            # An error or another segment finished while verifying.
+            return
+
         if not self._endsWithSegmentNumber(data.getName()):
             # We don't expect a name without a segment number.  Treat it as
             # a bad packet.
-            try:
-                self._onError(
-                  self.ErrorCode.DATA_HAS_NO_SEGMENT,
-                   "Got an unexpected packet without a segment number: " +
-                   data.getName().toUri())
-            except:
-                logging.exception("Error in onError")
+            self._finishWithError(
+              self.ErrorCode.DATA_HAS_NO_SEGMENT,
+               "Got an unexpected packet without a segment number: " +
+               data.getName().toUri())
+            return
+
+        currentSegment = 0
+        try:
+            currentSegment = data.getName().get(-1).toSegment()
+        except RuntimeError as ex:
+            self._finishWithError(
+              self.ErrorCode.DATA_HAS_NO_SEGMENT,
+               "Error decoding the name segment number " +
+               data.getName().get(-1).toEscapedString() + ": " + str(ex))
+            return
+
+        if self._versionedPrefix == None:
+            # This is the response to the first Interest.
+            self._versionedPrefix = data.getName().getPrefix(-1)
+            self._discoveryPendingInterestId = None
+        else:
+            if (currentSegment in self._receivedSegments or
+                currentSegment < self._nDeliveredSegments):
+                # We already have this segment.
+                return
+
+            self._pendingSegments.pop(currentSegment, None)
+            if currentSegment in self._retransmitQueue:
+                # We don't need to request it again.
+                self._retransmitQueue.remove(currentSegment)
+
+        if (data.getCongestionMark() > 0 and
+            not self._options.getIgnoreCongestionMarks()):
+            self._decreaseWindow(currentSegment)
         else:
-            currentSegment = 0
+            self._increaseWindow()
+
+        if data.getMetaInfo().getFinalBlockId().getValue().size() > 0:
             try:
-                currentSegment = data.getName().get(-1).toSegment()
+                finalSegmentNumber = (data.getMetaInfo()
+                  .getFinalBlockId().toSegment())
             except RuntimeError as ex:
+                self._finishWithError(
+                  self.ErrorCode.DATA_HAS_NO_SEGMENT,
+                   "Error decoding the FinalBlockId segment number " +
+                   data.getMetaInfo().getFinalBlockId().toEscapedString() +
+                   ": " + str(ex))
+                return
+
+            if self._finalSegmentNumber == None:
+                self._finalSegmentNumber = finalSegmentNumber
+                self._cancelSegmentsAfterFinal()
+                if isinstance(self._onSegment, SegmentFetcher.BufferSink):
+                    self._onSegment.setFinalSegmentNumber(finalSegmentNumber)
+
+        # Save the content and deliver all in-order content.
+        if (currentSegment >= self._nDeliveredSegments and
+            not self._isAfterFinal(currentSegment)):
+            self._receivedSegments[currentSegment] = data.getContent()
+        while (self._nDeliveredSegments in self._receivedSegments and
+               not self._isAfterFinal(self._nDeliveredSegments)):
+            self._deliverSegment(
+              self._nDeliveredSegments,
+              self._receivedSegments.pop(self._nDeliveredSegments))
+            self._nDeliveredSegments += 1
+            if self._isFinished:
+                # The onSegment callback had an error.
+                return
+
+        if (self._finalSegmentNumber != None and
+            self._nDeliveredSegments > self._finalSegmentNumber):
+            # We are finished.
+            self._finish()
+
+            if self._onSegment != None:
+                # The content was given to onSegment.
+                if isinstance(self._onSegment, SegmentFetcher.BufferSink):
+                    content = self._onSegment.getContent()
+                else:
+                    content = Blob()
                 try:
-                    self._onError(
-                      self.ErrorCode.DATA_HAS_NO_SEGMENT,
-                       "Error decoding the name segment number " +
-                       data.getName().get(-1).toEscapedString() + ": " + str(ex))
+                    self._onComplete(content)
                 except:
-                    logging.exception("Error in onError")
+                    logging.exception("Error in onComplete")
                 return
 
-            expectedSegmentNumber = len(self._contentParts)
-            if currentSegment != expectedSegmentNumber:
-              # Try again to get the expected segment.  This also includes
-              # the case where the first segment is not segment 0.
-                self._fetchNextSegment(
-                  originalInterest, data.getName(), expectedSegmentNumber)
-            else:
-                # Save the content and check if we are finished.
-                self._contentParts.append(data.getContent())
-
-                if data.getMetaInfo().getFinalBlockId().getValue().size() > 0:
-                    finalSegmentNumber = 0
-                    try:
-                      finalSegmentNumber = (data.getMetaInfo()
-                        .getFinalBlockId().toSegment())
-                    except RuntimeError as ex:
-                        try:
-                            self._onError(
-                              self.ErrorCode.DATA_HAS_NO_SEGMENT,
-                               "Error decoding the FinalBlockId segment number " +
-                               data.getMetaInfo().getFinalBlockId().toEscapedString() +
-                               ": " + str(ex))
-                        except:
-                            logging.exception("Error in onError")
-                        return
-
-                    if currentSegment == finalSegmentNumber:
-                        # We are finished.
-
-                        # Get the total size and concatenate to get content.
-                        totalSize = 0
-                        for i in range(len(self._contentParts)):
-                            totalSize += self._contentParts[i].size()
-                        content = bytearray(totalSize)
-                        offset = 0
-                        for i in range(len(self._contentParts)):
-                            part = self._contentParts[i]
-                            content[offset:offset + part.size()] = part.buf()
-                            offset += part.size()
-
-                        try:
-                            self._onComplete(Blob(content, False))
-                        except:
-                            logging.exception("Error in onComplete")
-                        return
-
-                # Fetch the next segment.
-                self._fetchNextSegment(
-                  originalInterest, data.getName(), expectedSegmentNumber + 1)
+            # Get the total size and concatenate to get content.
+            totalSize = 0
+            for i in range(self._finalSegmentNumber + 1):
+                totalSize += self._contentParts[i].size()
+            content = bytearray(totalSize)
+            offset = 0
+            for i in range(self._finalSegmentNumber + 1):
+                part = self._contentParts[i]
+                content[offset:offset + part.size()] = part.buf()
+                offset += part.size()
+
+            try:
+                self._onComplete(Blob(content, False))
+            except:
+                logging.exception("Error in onComplete")
+            return
+
+        self._fetchSegmentsInWindow()
+
+    def _deliverSegment(self, segment, content):
+        """
+        Add the content to _contentParts, or give it to onSegment. If onSegment
+        raises an exception, finish with the error SEGMENT_DELIVERY_FAILED.
+        """
+        if self._onSegment == None:
+            self._contentParts.append(content)
+            return
 
-    def _onValidationFailed(self, data, reason):
         try:
-            self._onError(
-              self.ErrorCode.SEGMENT_VERIFICATION_FAILED,
-               "Segment verification failed for " + data.getName().toUri() +
-               " . Reason: " + reason)
-        except:
-            logging.exception("Error in onError")
+            self._onSegment(segment, content)
+        except Exception as ex:
+            logging.exception("Error in onSegment")
+            self._finishWithError(
+              self.ErrorCode.SEGMENT_DELIVERY_FAILED,
+              "Error in onSegment for segment " + str(segment) + ": " +
+              str(ex))
+
+    def _onValidationFailed(self, data, reason):
+        self._finishWithError(
+          self.ErrorCode.SEGMENT_VERIFICATION_FAILED,
+           "Segment verification failed for " + data.getName().toUri() +
+           " . Reason: " + reason)
 
     def _onTimeout(self, interest):
-        try:
-            self._onError(
+        if self._isFinished:
+            return
+
+        if self._versionedPrefix == None:
+            # The first Interest timed out.
+            self._finishWithError(
               self.ErrorCode.INTEREST_TIMEOUT,
                "Time out for interest " + interest.getName().toUri())
+            return
+
+        self._retryOrFail(
+          interest, self.ErrorCode.INTEREST_TIMEOUT,
+          "Time out for interest " + interest.getName().toUri())
+
+    def _onNetworkNack(self, interest, networkNack):
+        if self._isFinished:
+            return
+
+        message = ("Received Nack with reason " + str(networkNack.getReason()) +
+          " for interest " + interest.getName().toUri())
+        if (self._versionedPrefix == None or
+            not (networkNack.getReason() == NetworkNack.Reason.CONGESTION or
+                 networkNack.getReason() == NetworkNack.Reason.DUPLICATE)):
+            # We can't retry the first Interest or another Nack reason.
+            segment = self._getPendingSegmentNumber(interest)
+            if segment != None and self._isAfterFinal(segment):
+                # We don't need this segment.
+                del self._pendingSegments[segment]
+                self._fetchSegmentsInWindow()
+                return
+
+            self._finishWithError(self.ErrorCode.NACK_ERROR, message)
+            return
+
+        self._retryOrFail(interest, self.ErrorCode.NACK_ERROR, message)
+
+    def _retryOrFail(self, interest, errorCode, message):
+        """
+        Handle a timeout or Nack for the Interest for a segment. Decrease the
+        window and retransmit the segment if it has retries remaining,
+        otherwise finish with the error.
+        """
+        segment = self._getPendingSegmentNumber(interest)
+        if segment == None:
+            # We already received the segment.
+            return
+
+        if self._isAfterFinal(segment):
+            # We requested past the end before knowing the final segment.
+            del self._pendingSegments[segment]
+            self._fetchSegmentsInWindow()
+            return
+
+        self._decreaseWindow(segment)
+
+        pendingSegment = self._pendingSegments[segment]
+        if pendingSegment._nRetries >= self._options.getMaxRetries():
+            self._finishWithError(errorCode, message)
+            return
+
+        pendingSegment._nRetries += 1
+        self._retransmitQueue.append(segment)
+        self._fetchSegmentsInWindow()
+
+    def _getPendingSegmentNumber(self, interest):
+        """
+        Get the segment number of the Interest if it is still pending.
+
+        :return: The segment number, or None if the segment is not pending.
+        :rtype: int
+        """
+        try:
+            segment = interest.getName().get(-1).toSegment()
+        except RuntimeError:
+            return None
+
+        if (not segment in self._pendingSegments or
+            segment in self._retransmitQueue):
+            return None
+        return segment
+
+    def _isAfterFinal(self, segment):
+        return (self._finalSegmentNumber != None and
+                segment > self._finalSegmentNumber)
+
+    def _increaseWindow(self):
+        if self._windowSize < self._slowStartThreshold:
+            # Slow start.
+            self._windowSize += self._options.getAdditiveIncreaseStep()
+        else:
+            # Congestion avoidance.
+            self._windowSize += (
+              self._options.getAdditiveIncreaseStep() / self._windowSize)
+        self._windowSize = min(
+          self._windowSize, self._options.getMaxWindowSize())
+
+    def _decreaseWindow(self, segment):
+        """
+        Decrease the window for a congestion event on the segment, unless the
+        window was already decreased for a segment requested after this one.
+        """
+        if segment <= self._recoveryPoint:
+            return
+
+        self._slowStartThreshold = max(
+          1.0,
+          self._windowSize * self._options.getMultiplicativeDecreaseFactor())
+        self._windowSize = self._slowStartThreshold
+        self._recoveryPoint = self._nextSegmentToRequest - 1
+
+    def _cancelSegmentsAfterFinal(self):
+        """
+        Remove the pending Interests for segments after the final segment.
+        """
+        for segment in list(self._pendingSegments.keys()):
+            if segment > self._finalSegmentNumber:
+                self._face.removePendingInterest(
+                  self._pendingSegments[segment]._pendingInterestId)
+                del self._pendingSegments[segment]
+        self._retransmitQueue = [segment for segment in self._retransmitQueue
+                                 if segment <= self._finalSegmentNumber]
+
+    def stop(self):
+        """
+        Stop fetching and remove the pending Interests, without calling
+        onComplete or onError. If fetching has already finished, do nothing.
+        """
+        if self._isFinished:
+            return
+
+        self._finish()
+
+    def _finish(self):
+        """
+        Set the finished flag and remove all pending Interests.
+        """
+        self._isFinished = True
+        for pendingSegment in self._pendingSegments.values():
+            self._face.removePendingInterest(pendingSegment._pendingInterestId)
+        self._pendingSegments = {}
+        self._retransmitQueue = []
+        if self._discoveryPendingInterestId != None:
+            self._face.removePendingInterest(self._discoveryPendingInterestId)
+            self._discoveryPendingInterestId = None
+
+    def _finishWithError(self, errorCode, message):
+        if self._isFinished:
+            return
+
+        self._finish()
+        try:
+            self._onError(errorCode, message)
         except:
             logging.exception("Error in onError")
 
@@ -335,3 +1029,12 @@ class SegmentFetcher(object):
         :rtype: bool
         """
         return (name.size() >= 1 and name.get(-1).isSegment())
+
+    class _PendingSegment(object):
+        """
+        A _PendingSegment has the pendingInterestId of the latest Interest for
+        a segment and the number of times it was retransmitted.
+        """
+        def __init__(self):
+            self._pendingInterestId = None
+            self._nRetries = 0
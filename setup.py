@@ -15,6 +15,7 @@ import sys
 requirements = ['cryptography']
 if sys.version_info[0] == 2:
     requirements.append('trollius')
+    requirements.append('selectors34')
     requirements.append('protobuf')
 elif sys.version_info[0] == 3:
     requirements.append('protobuf')
@@ -22,6 +23,8 @@ elif sys.version_info[0] == 3:
         requirements.append('trollius')
     elif sys.version_info[1] < 4:
         requirements.append('asyncio')
+    if sys.version_info[1] < 4:
+        requirements.append('selectors34')
 
 setup(
     name='PyNDN',
@@ -20,7 +20,13 @@
 # A copy of the GNU Lesser General Public License is in the file COPYING.
 
 import unittest as ut
-from pyndn import Name
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+from pyndn import Name, Data, ValidityPeriod
+from pyndn.security import SigningInfo
+from pyndn.security.verification_helpers import VerificationHelpers
 from pyndn.security.pib.pib import Pib
 from pyndn.security.v2 import CertificateV2
 from pyndn.util.common import Common
@@ -198,5 +204,82 @@ class TestKeyChain(ut.TestCase):
         self.assertTrue(certificate.getValidityPeriod().getNotAfter() >
           Common.getNowMilliseconds() + 10 * 365 * 24 * 3600 * 1000.0)
 
+    def test_signer_cache(self):
+        keyChain = self._fixture._keyChain
+        identity1 = self._fixture.addIdentity(
+          Name("/Security/V2/TestKeyChain/SignerCache1"))
+        identity2 = self._fixture.addIdentity(
+          Name("/Security/V2/TestKeyChain/SignerCache2"))
+        keyChain.setDefaultIdentity(identity1)
+
+        def getKeyLocatorName(params = None):
+            data = Data(Name("/Data"))
+            if params == None:
+                keyChain.sign(data)
+            else:
+                keyChain.sign(data, params)
+            return data.getSignature().getKeyLocator().getKeyName()
+
+        self.assertTrue(getKeyLocatorName().equals(
+          identity1.getDefaultKey().getName()))
+        self.assertTrue(getKeyLocatorName().equals(
+          identity1.getDefaultKey().getName()))
+
+        # Changing the default identity invalidates the cache.
+        keyChain.setDefaultIdentity(identity2)
+        self.assertTrue(getKeyLocatorName().equals(
+          identity2.getDefaultKey().getName()))
+
+        # Changing the default key invalidates the cache.
+        params = SigningInfo(SigningInfo.SignerType.ID, identity2.getName())
+        self.assertTrue(getKeyLocatorName(params).equals(
+          identity2.getDefaultKey().getName()))
+        key = keyChain.createKey(identity2)
+        keyChain.setDefaultKey(identity2, key)
+        self.assertTrue(getKeyLocatorName(params).equals(key.getName()))
+
+        # A cached signer still uses the ValidityPeriod of the params.
+        params.setValidityPeriod(ValidityPeriod(0, 1000))
+        data = Data(Name("/Data"))
+        keyChain.sign(data, params)
+        self.assertTrue(data.getSignature().getValidityPeriod().hasPeriod())
+        keyChain.sign(data, SigningInfo(identity2))
+        self.assertFalse(data.getSignature().getValidityPeriod().hasPeriod())
+
+    def test_sign_batch(self):
+        identity = self._fixture.addIdentity(
+          Name("/Security/V2/TestKeyChain/SignBatch"))
+        certificate = identity.getDefaultKey().getDefaultCertificate()
+
+        dataList = []
+        for i in range(8):
+            data = Data(Name("/Security/V2/TestKeyChain/SignBatch/Data").
+              appendSegment(i))
+            data.setContent("segment " + str(i))
+            dataList.append(data)
+
+        executor = None
+        if ThreadPoolExecutor != None:
+            executor = ThreadPoolExecutor(4)
+        try:
+            encodings = self._fixture._keyChain.signBatch(
+              dataList, SigningInfo(identity), executor = executor)
+        finally:
+            if executor != None:
+                executor.shutdown()
+
+        self.assertEqual(len(encodings), len(dataList))
+        for i in range(len(dataList)):
+            data = dataList[i]
+            self.assertTrue(encodings[i].equals(data.wireEncode()))
+            self.assertTrue(data.getSignature().getKeyLocator().getKeyName()
+              .equals(identity.getDefaultKey().getName()))
+            self.assertTrue(
+              VerificationHelpers.verifyDataSignature(data, certificate))
+
+            decodedData = Data()
+            decodedData.wireDecode(encodings[i])
+            self.assertTrue(decodedData.getContent().equals(data.getContent()))
+
 if __name__ == '__main__':
     ut.main(verbosity=2)
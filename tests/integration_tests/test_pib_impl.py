@@ -24,9 +24,20 @@ import unittest as ut
 from pyndn.name import Name
 from pyndn.security.pib.pib_memory import PibMemory
 from pyndn.security.pib.pib_sqlite3 import PibSqlite3
+from pyndn.security.pib.pib_cache import PibCache
 from pyndn.security.pib.pib import Pib
 from .pib_data_fixture2 import PibDataFixture2
 
+def removeDatabaseFiles(databaseFilePath):
+    # Also remove the write-ahead log files which SQLite keeps while the
+    # database is open.
+    for suffix in ["", "-wal", "-shm"]:
+        try:
+            os.remove(databaseFilePath + suffix)
+        except OSError:
+            # no such file
+            pass
+
 class PibMemoryFixture(PibDataFixture2):
     def __init__(self):
         super(PibMemoryFixture, self).__init__()
@@ -41,6 +52,14 @@ class PibSqlite3Fixture(PibDataFixture2):
         self._myPib = PibSqlite3(databaseDirectoryPath, databaseFilename)
         self.pib = self._myPib
 
+class PibCacheFixture(PibDataFixture2):
+    def __init__(self, databaseDirectoryPath, databaseFilename):
+        super(PibCacheFixture, self).__init__()
+
+        self._myPib = PibCache(
+          PibSqlite3(databaseDirectoryPath, databaseFilename))
+        self.pib = self._myPib
+
 class TestPibImpl(ut.TestCase):
     def setUp(self):
         self.pibMemoryFixture = PibMemoryFixture()
@@ -49,23 +68,25 @@ class TestPibImpl(ut.TestCase):
         databaseFilename = "test-pib.db"
         self.databaseFilePath =  os.path.join(
           databaseDirectoryPath, databaseFilename)
-        try:
-            os.remove(self.databaseFilePath)
-        except OSError:
-            # no such file
-            pass
+        removeDatabaseFiles(self.databaseFilePath)
         self.pibSqlite3Fixture = PibSqlite3Fixture(
           databaseDirectoryPath, databaseFilename)
 
-        self.pibImpls = [None, None]
+        cacheDatabaseFilename = "test-pib-cache.db"
+        self.cacheDatabaseFilePath = os.path.join(
+          databaseDirectoryPath, cacheDatabaseFilename)
+        removeDatabaseFiles(self.cacheDatabaseFilePath)
+        self.pibCacheFixture = PibCacheFixture(
+          databaseDirectoryPath, cacheDatabaseFilename)
+
+        self.pibImpls = [None, None, None]
         self.pibImpls[0] = self.pibMemoryFixture
         self.pibImpls[1] = self.pibSqlite3Fixture
+        self.pibImpls[2] = self.pibCacheFixture
 
     def tearDown(self):
-        try:
-            os.remove(self.databaseFilePath)
-        except OSError:
-            pass
+        removeDatabaseFiles(self.databaseFilePath)
+        removeDatabaseFiles(self.cacheDatabaseFilePath)
 
     def test_certificate_decoding(self):
         # Use pibMemoryFixture to test.
@@ -501,5 +522,84 @@ class TestPibImpl(ut.TestCase):
             keyBits3 = pib.getKeyBits(fixture.id1Key1Name)
             self.assertTrue(keyBits3.equals(fixture.id1Key2))
 
+    def test_batch(self):
+        # Open another connection to the same database to check what is saved.
+        otherPib = PibSqlite3(
+          os.path.dirname(self.databaseFilePath),
+          os.path.basename(self.databaseFilePath))
+
+        for fixture in self.pibImpls:
+            pib = fixture.pib
+
+            with pib.batch():
+                pib.addCertificate(fixture.id1Key1Cert1)
+                with pib.batch():
+                    pib.addCertificate(fixture.id2Key1Cert1)
+                # The changes are visible in the same PIB.
+                self.assertTrue(pib.hasIdentity(fixture.id1))
+                self.assertTrue(pib.hasIdentity(fixture.id2))
+                if pib is self.pibSqlite3Fixture.pib:
+                    # The nested batch does not commit.
+                    self.assertFalse(otherPib.hasIdentity(fixture.id1))
+
+            self.assertTrue(pib.hasCertificate(fixture.id1Key1Cert1.getName()))
+            self.assertTrue(pib.hasCertificate(fixture.id2Key1Cert1.getName()))
+
+        # The outermost batch commits.
+        self.assertTrue(otherPib.hasIdentity(self.pibSqlite3Fixture.id1))
+        self.assertTrue(otherPib.hasIdentity(self.pibSqlite3Fixture.id2))
+
+        # An exception in the batch still commits the changes made so far.
+        pib = self.pibSqlite3Fixture.pib
+        try:
+            with pib.batch():
+                pib.removeIdentity(self.pibSqlite3Fixture.id1)
+                raise ValueError("test")
+        except ValueError:
+            pass
+        self.assertFalse(otherPib.hasIdentity(self.pibSqlite3Fixture.id1))
+
+    def test_cache(self):
+        fixture = self.pibCacheFixture
+        pib = fixture.pib
+        backEnd = pib.getPibImpl()
+
+        pib.addCertificate(fixture.id1Key1Cert1)
+        self.assertTrue(pib.getDefaultCertificateOfKey(
+          fixture.id1Key1Name).wireEncode().equals(
+          fixture.id1Key1Cert1.wireEncode()))
+        self.assertTrue(pib.hasKey(fixture.id1Key1Name))
+        self.assertFalse(pib.hasKey(fixture.id1Key2Name))
+        self.assertTrue(pib.getDefaultIdentity().equals(fixture.id1))
+
+        # A change made directly in the back end is not seen in the cache.
+        backEnd.removeIdentity(fixture.id1)
+        self.assertTrue(pib.hasKey(fixture.id1Key1Name))
+        self.assertTrue(pib.hasCertificate(fixture.id1Key1Cert1.getName()))
+        self.assertTrue(pib.getDefaultIdentity().equals(fixture.id1))
+
+        # A change made through the cache is written through and clears it.
+        pib.addKey(fixture.id1, fixture.id1Key2Name, fixture.id1Key2.buf())
+        self.assertTrue(backEnd.hasKey(fixture.id1Key2Name))
+        self.assertTrue(pib.hasKey(fixture.id1Key2Name))
+        self.assertFalse(pib.hasKey(fixture.id1Key1Name))
+        self.assertFalse(pib.hasCertificate(fixture.id1Key1Cert1.getName()))
+        self.assertTrue(pib.getDefaultKeyOfIdentity(fixture.id1).equals(
+          fixture.id1Key2Name))
+
+        # The returned certificate is a copy.
+        pib.addCertificate(fixture.id1Key2Cert1)
+        certificate = pib.getCertificate(fixture.id1Key2Cert1.getName())
+        certificate.setName(Name("/changed"))
+        self.assertTrue(pib.getCertificate(
+          fixture.id1Key2Cert1.getName()).getName().equals(
+          fixture.id1Key2Cert1.getName()))
+
+        # Lookups of many names which don't exist don't grow the cache without
+        # limit.
+        for i in range(PibCache._maxCacheSize + 10):
+            self.assertFalse(pib.hasIdentity(Name("/none").appendSegment(i)))
+        self.assertTrue(len(pib._hasIdentity) <= PibCache._maxCacheSize)
+
 if __name__ == '__main__':
     ut.main(verbosity=2)
@@ -20,6 +20,10 @@
 # A copy of the GNU Lesser General Public License is in the file COPYING.
 
 import unittest as ut
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
 from pyndn import Name, Data, Interest, NetworkNack, ContentType, ValidityPeriod
 from pyndn.security import SigningInfo, RsaKeyParams
 from pyndn.security.v2 import CertificateV2, ValidationPolicySimpleHierarchy
@@ -223,6 +227,88 @@ class TestValidator(ut.TestCase):
         self.assertTrue(len(self._fixture._face._sentInterests) > 1)
         self._fixture._face._sentInterests = []
 
+    def test_validate_batch(self):
+        # Delay the responses so that all the Data packets are waiting for the
+        # certificate at the same time.
+        pendingResponses = []
+        processInterest = self._fixture._face._processInterest
+        def delayedProcessInterest(interest, onData, onTimeout, onNetworkNack):
+            pendingResponses.append(lambda: processInterest(
+              interest, onData, onTimeout, onNetworkNack))
+        self._fixture._face._processInterest = delayedProcessInterest
+
+        dataList = []
+        for i in range(5):
+            data = Data(Name("/Security/V2/ValidatorFixture/Sub1/Sub2/Data").
+              appendSegment(i))
+            self._fixture._keyChain.sign(
+              data, SigningInfo(self._fixture._subIdentity))
+            dataList.append(data)
+        # Corrupt the signature of segment 3.
+        dataList[3].setContent("corrupted")
+        # Segment 4 is outside the policy namespace of its signer.
+        dataList[4].setName(Name("/Security/V2/ValidatorFixture/Data"))
+
+        successNames = []
+        failureNames = []
+        def successCallback(data):
+            successNames.append(data.getName().toUri())
+        def failureCallback(data, error):
+            failureNames.append(data.getName().toUri())
+
+        executor = None
+        if ThreadPoolExecutor != None:
+            executor = ThreadPoolExecutor(4)
+        try:
+            self._fixture._validator.validateBatch(
+              dataList, successCallback, failureCallback, executor)
+            # The policy failure is reported right away.
+            self.assertEqual(failureNames, [dataList[4].getName().toUri()])
+            self.assertEqual(len(successNames), 0)
+
+            while len(pendingResponses) > 0:
+                pendingResponses.pop(0)()
+        finally:
+            if executor != None:
+                executor.shutdown()
+
+        # The certificate is fetched once for the whole batch.
+        self.assertEqual(1, len(self._fixture._face._sentInterests))
+        self.assertEqual(
+          successNames, [dataList[i].getName().toUri() for i in range(3)])
+        self.assertEqual(failureNames, [dataList[4].getName().toUri(),
+                                        dataList[3].getName().toUri()])
+
+    def test_validate_batch_order(self):
+        # Delay the certificate responses so that the chain for the first Data
+        # packet is validated after the second, which is signed by the anchor.
+        pendingResponses = []
+        processInterest = self._fixture._face._processInterest
+        def delayedProcessInterest(interest, onData, onTimeout, onNetworkNack):
+            pendingResponses.append(lambda: processInterest(
+              interest, onData, onTimeout, onNetworkNack))
+        self._fixture._face._processInterest = delayedProcessInterest
+
+        data1 = Data(Name("/Security/V2/ValidatorFixture/Sub1/Sub2/Data"))
+        self._fixture._keyChain.sign(
+          data1, SigningInfo(self._fixture._subIdentity))
+        data2 = Data(Name("/Security/V2/ValidatorFixture/Data"))
+        self._fixture._keyChain.sign(data2, SigningInfo(self._fixture._identity))
+
+        successNames = []
+        def successCallback(data):
+            successNames.append(data.getName().toUri())
+        def failureCallback(data, error):
+            self.fail("Unexpected validation failure: " + str(error))
+
+        self._fixture._validator.validateBatch(
+          [data1, data2], successCallback, failureCallback)
+        while len(pendingResponses) > 0:
+            pendingResponses.pop(0)()
+
+        self.assertEqual(
+          successNames, [data1.getName().toUri(), data2.getName().toUri()])
+
     def test_infinite_certificate_chain(self):
         def processInterest(interest, onData, onTimeout, onNetworkNack):
             try:
@@ -0,0 +1,308 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+# These test cases use the async and await syntax, so test_asyncio_face imports
+# them only on Python 3.5 or later.
+
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+import unittest as ut
+from pyndn import Name, Interest, Data
+from pyndn.util import Blob
+from pyndn.util.segment_fetcher import SegmentFetcher
+from pyndn.transport.transport import Transport
+from pyndn.transport.async_unix_transport import AsyncUnixTransport
+from pyndn.asyncio_face import AsyncioFace
+
+class LoopbackTransport(Transport):
+    """
+    A LoopbackTransport records the sent packets and answers each interest under
+    /data with a Data packet of the same name. It answers each interest under
+    /segmented with a segment of version 1, where the final segment is 2 and
+    the content is the segment number.
+    """
+    def __init__(self, loop):
+        self._loop = loop
+        self._elementListener = None
+        self.sentData = []
+
+    def isLocal(self, connectionInfo):
+        return True
+
+    def isAsync(self):
+        return True
+
+    def connect(self, connectionInfo, elementListener, onConnected):
+        self._elementListener = elementListener
+        if onConnected != None:
+            self._loop.call_soon(onConnected)
+
+    def send(self, data):
+        data = Blob(bytearray(data), False)
+        if data.buf()[0] == 0x05:
+            interest = Interest()
+            interest.wireDecode(data)
+            if Name("/data").match(interest.getName()):
+                self.receive(Data(interest.getName()).wireEncode())
+            elif Name("/segmented").match(interest.getName()):
+                self.receive(LoopbackTransport._makeSegment(interest))
+        else:
+            self.sentData.append(data)
+
+    def receive(self, encoding):
+        self._loop.call_soon(
+          self._elementListener.onReceivedElement, encoding.toBytes())
+
+    def getIsConnected(self):
+        return self._elementListener != None
+
+    @staticmethod
+    def _makeSegment(interest):
+        segment = 0
+        if interest.getName().size() == 3:
+            segment = interest.getName()[2].toSegment()
+        data = Data(Name("/segmented").appendVersion(1).appendSegment(segment))
+        data.setContent(bytearray([segment]))
+        data.getMetaInfo().setFinalBlockId(Name.Component.fromSegment(2))
+        return data.wireEncode()
+
+class TestAsyncioFace(ut.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.transport = LoopbackTransport(self.loop)
+        self.face = AsyncioFace(
+          self.loop, self.transport, Transport.ConnectionInfo())
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_express(self):
+        names = [Name("/data/a"), Name("/data/b"), Name("/data/c")]
+
+        async def expressAll():
+            return await asyncio.gather(
+              *[self.face.express(name) for name in names])
+
+        dataList = self.loop.run_until_complete(expressAll())
+
+        self.assertEqual(
+          [data.getName().toUri() for data in dataList],
+          [name.toUri() for name in names])
+
+    def test_express_timeout(self):
+        interest = Interest(Name("/none"))
+        interest.setInterestLifetimeMilliseconds(10)
+
+        with self.assertRaises(AsyncioFace.InterestTimeoutError) as context:
+            self.loop.run_until_complete(self.face.express(interest))
+        self.assertTrue(context.exception.getInterest().getName().equals(
+          interest.getName()))
+
+    def test_express_cancel(self):
+        async def expressAndCancel():
+            task = asyncio.ensure_future(self.face.express(Name("/none")))
+            # Let the interest be sent.
+            await asyncio.sleep(0.01)
+            self.assertEqual(self.face._node._pendingInterestTable.size(), 1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # Let the removal be processed.
+            await asyncio.sleep(0)
+
+        self.loop.run_until_complete(expressAndCancel())
+        self.assertEqual(self.face._node._pendingInterestTable.size(), 0)
+
+    def test_serve(self):
+        async def serve():
+            names = []
+            async with self.face.serve(Name("/app"), register = False) as interests:
+                # Connect so that the transport can receive.
+                await self.face.express(Name("/data/connect"))
+                self.transport.receive(Interest(Name("/app/1")).wireEncode())
+                self.transport.receive(Interest(Name("/other")).wireEncode())
+                self.transport.receive(Interest(Name("/app/2")).wireEncode())
+
+                async for interest in interests:
+                    names.append(interest.getName().toUri())
+                    self.face.putData(Data(interest.getName()))
+                    if len(names) == 2:
+                        interests.close()
+
+            return names
+
+        names = self.loop.run_until_complete(serve())
+        self.assertEqual(names, ["/app/1", "/app/2"])
+        self.assertEqual(len(self.transport.sentData), 2)
+
+    def test_serve_before_loop_runs(self):
+        # Call serve before the loop runs. The loop is not the current event
+        # loop, so the stream must use the face's loop.
+        interests = self.face.serve(Name("/app"), register = False)
+
+        async def receive():
+            # Connect so that the transport can receive.
+            await self.face.express(Name("/data/connect"))
+            self.transport.receive(Interest(Name("/app/1")).wireEncode())
+            async for interest in interests:
+                interests.close()
+                return interest.getName().toUri()
+
+        self.assertEqual(self.loop.run_until_complete(receive()), "/app/1")
+
+    def test_fetch_segments(self):
+        async def fetchAll():
+            contents = []
+            async for content in self.face.fetchSegments(
+                  Interest(Name("/segmented"))):
+                contents.append(content.toBytes())
+            return contents
+
+        contents = self.loop.run_until_complete(fetchAll())
+        self.assertEqual(contents, [b"\x00", b"\x01", b"\x02"])
+
+    def test_fetch_segments_error(self):
+        interest = Interest(Name("/none"))
+        interest.setInterestLifetimeMilliseconds(10)
+
+        async def fetchAll():
+            async for content in self.face.fetchSegments(interest):
+                pass
+
+        with self.assertRaises(SegmentFetcher.Error) as context:
+            self.loop.run_until_complete(fetchAll())
+        self.assertEqual(context.exception.getErrorCode(),
+          SegmentFetcher.ErrorCode.INTEREST_TIMEOUT)
+
+    def test_fetch_segments_close(self):
+        async def fetchFirst():
+            async with self.face.fetchSegments(
+                  Interest(Name("/segmented"))) as segments:
+                async for content in segments:
+                    segments.close()
+                    return content.toBytes()
+
+        self.assertEqual(self.loop.run_until_complete(fetchFirst()), b"\x00")
+
+@ut.skipUnless(hasattr(socket, "AF_UNIX"), "Requires Unix sockets")
+class TestAsyncFlowControl(ut.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.directory = tempfile.mkdtemp()
+        self.filePath = os.path.join(self.directory, "test.sock")
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.filePath)
+        self.server.listen(1)
+
+    def tearDown(self):
+        self.server.close()
+        shutil.rmtree(self.directory)
+        self.loop.close()
+
+    def connect(self, face):
+        """
+        Start connecting the face with an interest which will time out, and
+        return the server's connection.
+        """
+        interest = Interest(Name("/none"))
+        interest.setInterestLifetimeMilliseconds(10)
+        face.expressInterest(interest, None)
+        self.loop.run_until_complete(asyncio.sleep(0.01))
+        connection, _ = self.server.accept()
+        return connection
+
+    def test_drain(self):
+        face = AsyncioFace(
+          self.loop, AsyncUnixTransport(self.loop),
+          AsyncUnixTransport.ConnectionInfo(self.filePath))
+        transport = face.getTransport()
+        transport.setWriteBufferLimits(64 * 1024, 16 * 1024)
+        writableCount = [0]
+        def onWritable():
+            writableCount[0] += 1
+        face.setOnWritable(onWritable)
+
+        async def sendUntilPaused(connection):
+            # The drain future is done while writing is not paused.
+            await face.drain()
+            data = Data(Name("/data"))
+            data.setContent(bytearray(8000))
+            for i in range(200):
+                face.putData(data)
+            drainFuture = face.drain()
+            # Let the dispatched sends run.
+            await asyncio.sleep(0.01)
+            self.assertTrue(transport.getIsWritingPaused())
+            self.assertTrue(transport.getWriteBufferSize() >= 16 * 1024)
+            self.assertFalse(drainFuture.done())
+
+            # Read in another thread until the transport can write again.
+            def read():
+                while not drainFuture.done():
+                    try:
+                        connection.recv(1024 * 1024)
+                    except socket.timeout:
+                        pass
+            reader = self.loop.run_in_executor(None, read)
+            await drainFuture
+            self.assertFalse(transport.getIsWritingPaused())
+            self.assertEqual(writableCount[0], 1)
+            await reader
+
+        connection = self.connect(face)
+        # Let the reader thread check if drainFuture is done.
+        connection.settimeout(0.05)
+        try:
+            self.loop.run_until_complete(sendUntilPaused(connection))
+        finally:
+            face.shutdown()
+            connection.close()
+
+    def test_drain_after_connection_lost(self):
+        face = AsyncioFace(
+          self.loop, AsyncUnixTransport(self.loop),
+          AsyncUnixTransport.ConnectionInfo(self.filePath))
+        transport = face.getTransport()
+        transport.setWriteBufferLimits(64 * 1024, 16 * 1024)
+
+        async def sendUntilPausedAndLose(connection):
+            data = Data(Name("/data"))
+            data.setContent(bytearray(8000))
+            for i in range(200):
+                face.putData(data)
+            # Let the dispatched sends run.
+            await asyncio.sleep(0.01)
+            self.assertTrue(transport.getIsWritingPaused())
+
+            # The peer drops the connection while writing is paused.
+            connection.close()
+            await asyncio.wait_for(face.drain(), 1)
+            self.assertFalse(transport.getIsWritingPaused())
+            # A later drain is also done.
+            await asyncio.wait_for(face.drain(), 1)
+
+        connection = self.connect(face)
+        try:
+            self.loop.run_until_complete(sendUntilPausedAndLose(connection))
+        finally:
+            face.shutdown()
+            connection.close()
@@ -0,0 +1,32 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import sys
+import unittest as ut
+
+if sys.version_info >= (3, 5):
+    from .asyncio_face_test_cases import TestAsyncioFace, TestAsyncFlowControl
+else:
+    @ut.skip("AsyncioFace requires Python 3.5 or later")
+    class TestAsyncioFace(ut.TestCase):
+        def test_asyncio_face(self):
+            pass
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
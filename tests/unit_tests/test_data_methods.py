@@ -25,9 +25,10 @@ from pyndn import ContentType
 from pyndn import KeyLocatorType
 from pyndn import Sha256WithRsaSignature
 from pyndn import GenericSignature
-from pyndn.encoding import TlvWireFormat
+from pyndn.encoding import TlvWireFormat, WireFormat
 from pyndn.lp.lp_packet import LpPacket
 from pyndn.util import Blob
+from pyndn.security.verification_helpers import VerificationHelpers
 from .test_utils import dump, CredentialStorage
 import unittest as ut
 
@@ -282,6 +283,32 @@ class TestDataDump(ut.TestCase):
         self.assertEqual(failedCallback.call_count, 0, 'Signature verification failed')
         self.assertEqual(verifiedCallback.call_count, 1, 'Verification callback was not used.')
 
+    def test_public_key_cache(self):
+        failedCallback = Mock()
+        verifiedCallback = Mock()
+
+        self.credentials.signData(self.freshData)
+        saveMaxPublicKeyCacheSize = VerificationHelpers.getMaxPublicKeyCacheSize()
+        try:
+            VerificationHelpers.setMaxPublicKeyCacheSize(1)
+            for i in range(2):
+                self.credentials.verifyData(
+                  self.freshData, verifiedCallback, failedCallback)
+            self.assertEqual(len(VerificationHelpers._publicKeyCache), 1)
+
+            # Without the cache, the key is parsed each time.
+            VerificationHelpers.setMaxPublicKeyCacheSize(0)
+            self.assertEqual(len(VerificationHelpers._publicKeyCache), 0)
+            self.credentials.verifyData(
+              self.freshData, verifiedCallback, failedCallback)
+            self.assertEqual(len(VerificationHelpers._publicKeyCache), 0)
+        finally:
+            VerificationHelpers.setMaxPublicKeyCacheSize(
+              saveMaxPublicKeyCacheSize)
+
+        self.assertEqual(failedCallback.call_count, 0, 'Signature verification failed')
+        self.assertEqual(verifiedCallback.call_count, 3, 'Verification callback was not used.')
+
     def test_generic_signature(self):
         # Test correct encoding.
         signature = GenericSignature()
@@ -371,5 +398,37 @@ class TestDataDump(ut.TestCase):
 
         self.assertEqual(1, data.getCongestionMark())
 
+    def test_encode_signed_data(self):
+        signedPortions = []
+        def sign(signedPortion):
+            signedPortions.append(signedPortion)
+            sha256 = hashes.Hash(hashes.SHA256(), backend=default_backend())
+            sha256.update(signedPortion.toBytes())
+            return Blob(bytearray(sha256.finalize()), False)
+
+        self.freshData.setSignature(Sha256WithRsaSignature())
+        self.freshData.getSignature().getKeyLocator().setType(
+          KeyLocatorType.KEYNAME)
+        self.freshData.getSignature().getKeyLocator().setKeyName(
+          Name("/key/name"))
+        (encoding, signedPortionBeginOffset, signedPortionEndOffset) = \
+          TlvWireFormat.get().encodeSignedData(self.freshData, sign)
+
+        # The single-pass encoding is the same as encoding again.
+        self.assertTrue(encoding.equals(
+          TlvWireFormat.get().encodeData(self.freshData)[0]))
+        self.assertTrue(Blob(
+          encoding.buf()[signedPortionBeginOffset:signedPortionEndOffset],
+          False).equals(signedPortions[0]))
+        self.assertTrue(self.freshData.getSignature().getSignature().equals(
+          sign(signedPortions[0])))
+
+        # The base WireFormat implementation gives the same result.
+        baseResult = WireFormat.encodeSignedData(
+          TlvWireFormat.get(), self.freshData, sign)
+        self.assertTrue(baseResult[0].equals(encoding))
+        self.assertEqual(baseResult[1:],
+          (signedPortionBeginOffset, signedPortionEndOffset))
+
 if __name__ == '__main__':
     ut.main(verbosity=2)
@@ -0,0 +1,68 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn.impl.delayed_call_table import DelayedCallTable
+
+class TestDelayedCallTable(ut.TestCase):
+    def test_call_order(self):
+        table = DelayedCallTable()
+        calls = []
+        table.callLater(-2, lambda: calls.append(2))
+        table.callLater(-3, lambda: calls.append(1))
+        table.callLater(-2, lambda: calls.append(3))
+        table.callLater(100000, lambda: calls.append(4))
+
+        table.callTimedOut()
+        self.assertEqual(calls, [1, 2, 3],
+          "Expected the timed-out calls ordered by call time, then by adding")
+        self.assertEqual(table.size(), 1)
+
+    def test_cancel(self):
+        table = DelayedCallTable()
+        calls = []
+        handle1 = table.callLater(-1, lambda: calls.append(1))
+        table.callLater(-1, lambda: calls.append(2))
+        handle1.cancel()
+        self.assertEqual(table.size(), 1)
+
+        table.callTimedOut()
+        self.assertEqual(calls, [2])
+        self.assertEqual(table.size(), 0)
+        # Cancelling again or after the call does nothing.
+        handle1.cancel()
+        self.assertEqual(table.size(), 0)
+
+    def test_cancel_many(self):
+        table = DelayedCallTable()
+        calls = []
+        handles = [table.callLater(-1, lambda: calls.append(1))
+                   for i in range(100)]
+        table.callLater(-1, lambda: calls.append(2))
+        for handle in handles:
+            handle.cancel()
+        self.assertEqual(table.size(), 1)
+        self.assertTrue(len(table._heap) < 100,
+          "Expected the cancelled entries to be removed from the heap")
+
+        table.callTimedOut()
+        self.assertEqual(calls, [2])
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
@@ -0,0 +1,82 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Data, Interest
+from pyndn.encoding.element_reader import ElementReader
+from pyndn.util import Blob
+
+class ElementListener(object):
+    def __init__(self):
+        self.elements = []
+
+    def onReceivedElement(self, element):
+        # The element is only valid during the call, so copy.
+        self.elements.append(Blob(element, True))
+
+class TestElementReader(ut.TestCase):
+    def setUp(self):
+        self.listener = ElementListener()
+        self.reader = ElementReader(self.listener)
+
+        self.interest = Interest(Name("/a")).wireEncode().toBytes()
+        data = Data(Name("/b"))
+        # Use a large content for an extended encoding of the length.
+        data.setContent(bytearray(range(256)) * 30)
+        self.data = data.wireEncode().toBytes()
+
+    def test_whole_elements(self):
+        self.reader.onReceivedData(bytearray(self.interest + self.data))
+        self.assertEqual(
+          [element.toBytes() for element in self.listener.elements],
+          [self.interest, self.data])
+
+    def test_split_elements(self):
+        input = bytearray(self.data + self.interest + self.data)
+        for chunkSize in [1, 2, 3, 7, 1000]:
+            self.listener.elements = []
+            for i in range(0, len(input), chunkSize):
+                self.reader.onReceivedData(input[i:i + chunkSize])
+
+            self.assertEqual(
+              [element.toBytes() for element in self.listener.elements],
+              [self.data, self.interest, self.data],
+              "Wrong elements for chunk size " + str(chunkSize))
+
+    def test_empty_value(self):
+        self.reader.onReceivedData(bytearray([0x80]))
+        self.reader.onReceivedData(bytearray([0x00, 0x81, 0x00]))
+        self.assertEqual(
+          [element.toBytes() for element in self.listener.elements],
+          [bytearray([0x80, 0x00]), bytearray([0x81, 0x00])])
+
+    def test_max_packet_size(self):
+        # The header for a length of 9000 is enough to reject the element.
+        with self.assertRaises(ValueError):
+            self.reader.onReceivedData(bytearray([0x06, 0xfd, 0x23]))
+            self.reader.onReceivedData(bytearray([0x28]))
+
+        # The reader is reset to read a new element.
+        self.reader.onReceivedData(bytearray(self.interest))
+        self.assertEqual(
+          [element.toBytes() for element in self.listener.elements],
+          [self.interest])
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
@@ -0,0 +1,110 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import os
+import shutil
+import socket
+import tempfile
+import unittest as ut
+from pyndn import Name, Interest, Data, Face
+from pyndn.transport.unix_transport import UnixTransport
+from pyndn.util.common import Common
+from pyndn.face_reactor import FaceReactor
+
+@ut.skipUnless(hasattr(socket, "AF_UNIX"), "Requires Unix sockets")
+class TestFaceReactor(ut.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filePath = os.path.join(self.directory, "test.sock")
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.filePath)
+        self.server.listen(5)
+        self.reactor = FaceReactor()
+        self.faces = []
+        self.connections = []
+
+    def tearDown(self):
+        for face in self.faces:
+            face.shutdown()
+        for connection in self.connections:
+            connection.close()
+        self.reactor.close()
+        self.server.close()
+        shutil.rmtree(self.directory)
+
+    def makeFace(self):
+        face = Face(UnixTransport(), UnixTransport.ConnectionInfo(self.filePath))
+        self.faces.append(face)
+        self.reactor.addFace(face)
+        return face
+
+    def test_receive(self):
+        names = []
+        def onData(interest, data):
+            names.append(data.getName().toUri())
+            if len(names) == 2:
+                self.reactor.stop()
+
+        for i in range(2):
+            self.makeFace().expressInterest(Name("/data/" + str(i)), onData)
+            connection, _ = self.server.accept()
+            self.connections.append(connection)
+        self.assertEqual(self.reactor.getFaceCount(), 2)
+
+        # Answer the second face first.
+        self.connections[1].sendall(Data(Name("/data/1")).wireEncode().toBytes())
+        self.connections[0].sendall(Data(Name("/data/0")).wireEncode().toBytes())
+        self.reactor.run()
+        self.assertEqual(sorted(names), ["/data/0", "/data/1"])
+
+    def test_timeout(self):
+        timeoutTimes = []
+        def onTimeout(interest):
+            timeoutTimes.append(Common.getNowMilliseconds())
+            self.reactor.stop()
+
+        interest = Interest(Name("/none"))
+        interest.setInterestLifetimeMilliseconds(100)
+        startTime = Common.getNowMilliseconds()
+        self.makeFace().expressInterest(interest, None, onTimeout)
+        # The reactor waits for the timeout without receiving anything.
+        self.reactor.run()
+
+        self.assertEqual(len(timeoutTimes), 1)
+        self.assertTrue(timeoutTimes[0] - startTime >= 100)
+        self.assertTrue(timeoutTimes[0] - startTime < 1000)
+
+    def test_connection_closed(self):
+        face = self.makeFace()
+        face.expressInterest(Name("/none"), None)
+        connection, _ = self.server.accept()
+        self.reactor.runOnce(0)
+        self.assertTrue(face.getTransport().getSocket() != None)
+
+        # Receive the interest so that closing doesn't reset the connection.
+        connection.recv(1024)
+        connection.close()
+        self.reactor.runOnce(1000)
+        # The transport is closed and the reactor no longer waits on it.
+        self.assertEqual(face.getTransport().getSocket(), None)
+        self.reactor.runOnce(0)
+        self.assertEqual(len(self.reactor._selector.get_map()), 1)
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
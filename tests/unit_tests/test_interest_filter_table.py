@@ -0,0 +1,91 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Interest, InterestFilter
+from pyndn.impl.interest_filter_table import InterestFilterTable
+
+def onInterest(prefix, interest, face, interestFilterId, filter):
+    pass
+
+class TestInterestFilterTable(ut.TestCase):
+    def setUp(self):
+        self.table = InterestFilterTable()
+
+    def getMatchedIds(self, uri):
+        matchedFilters = []
+        self.table.getMatchedFilters(Interest(Name(uri)), matchedFilters)
+        return [entry.getInterestFilterId() for entry in matchedFilters]
+
+    def test_match_order(self):
+        self.table.setInterestFilter(
+          1, InterestFilter("/a/b"), onInterest, None)
+        self.table.setInterestFilter(2, InterestFilter("/a"), onInterest, None)
+        self.table.setInterestFilter(3, InterestFilter("/c"), onInterest, None)
+        self.table.setInterestFilter(4, InterestFilter("/"), onInterest, None)
+        self.table.setInterestFilter(
+          5, InterestFilter("/a/b/c/d"), onInterest, None)
+
+        self.assertEqual(self.getMatchedIds("/a/b/c"), [1, 2, 4],
+          "Expected the matched filters in the order they were added")
+        self.assertEqual(self.getMatchedIds("/c"), [3, 4])
+        self.assertEqual(self.getMatchedIds("/d"), [4])
+
+    def test_regex_filter(self):
+        self.table.setInterestFilter(
+          1, InterestFilter("/hello", "<world><>+"), onInterest, None)
+        self.table.setInterestFilter(
+          2, InterestFilter("/hello"), onInterest, None)
+
+        self.assertEqual(self.getMatchedIds("/hello/world/x"), [1, 2])
+        self.assertEqual(self.getMatchedIds("/hello/world"), [2])
+        self.assertEqual(self.getMatchedIds("/hello/there/x"), [2])
+
+    def test_callback_arguments(self):
+        def onInterestOld(prefix, interest, face, interestFilterId):
+            pass
+        class OnInterest(object):
+            def __call__(self, prefix, interest, face, interestFilterId, filter):
+                pass
+
+        self.table.setInterestFilter(1, InterestFilter("/a"), onInterest, None)
+        self.table.setInterestFilter(
+          2, InterestFilter("/a"), onInterestOld, None)
+        self.table.setInterestFilter(
+          3, InterestFilter("/a"), OnInterest(), None)
+
+        matchedFilters = []
+        self.table.getMatchedFilters(Interest(Name("/a")), matchedFilters)
+        self.assertEqual(
+          [entry.getOnInterestIncludesFilter() for entry in matchedFilters],
+          [True, False, True])
+
+    def test_unset(self):
+        self.table.setInterestFilter(1, InterestFilter("/a"), onInterest, None)
+        self.table.setInterestFilter(2, InterestFilter("/a"), onInterest, None)
+
+        self.table.unsetInterestFilter(1)
+        self.assertEqual(self.getMatchedIds("/a/b"), [2])
+        self.table.unsetInterestFilter(2)
+        self.assertEqual(self.getMatchedIds("/a/b"), [])
+        # Unsetting an unknown ID does nothing.
+        self.table.unsetInterestFilter(3)
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
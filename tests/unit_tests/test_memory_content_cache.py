@@ -0,0 +1,209 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Interest, Data
+from pyndn.util.memory_content_cache import MemoryContentCache
+from pyndn.util.eviction_policy import LfuEvictionPolicy, ArcEvictionPolicy
+
+class DummyFace(object):
+    """
+    DummyFace records the encodings sent by the MemoryContentCache.
+    """
+    def __init__(self):
+        self.sentData = []
+
+    def setInterestFilter(self, filterOrPrefix, onInterest):
+        return 1
+
+    def send(self, encoding):
+        data = Data()
+        data.wireDecode(encoding)
+        self.sentData.append(data)
+
+class TestMemoryContentCache(ut.TestCase):
+    def setUp(self):
+        self.face = DummyFace()
+        self.cache = MemoryContentCache(self.face, 0.0)
+        self.dataNotFound = []
+        self.cache.setInterestFilter(Name("/"), self.onDataNotFound)
+
+    def onDataNotFound(self, prefix, interest, face, interestFilterId, filter):
+        self.dataNotFound.append(interest)
+
+    def addData(self, uri, freshnessPeriod = None):
+        data = Data(Name(uri))
+        if freshnessPeriod != None:
+            data.getMetaInfo().setFreshnessPeriod(freshnessPeriod)
+        self.cache.add(data)
+
+    def expressInterest(self, interest):
+        self.face.sentData = []
+        self.cache._onInterest(Name("/"), interest, self.face, 1, None)
+        if len(self.face.sentData) == 0:
+            return None
+        return self.face.sentData[0].getName().toUri()
+
+    def test_child_selector(self):
+        self.addData("/a/c/1")
+        self.addData("/a/b/1", 10000.0)
+        self.addData("/a/d/1")
+        self.addData("/b/a/1")
+        self.addData("/a0/z")
+
+        interest = Interest(Name("/a"))
+        self.assertEqual(self.expressInterest(interest), "/a/b/1")
+        interest.setChildSelector(0)
+        self.assertEqual(self.expressInterest(interest), "/a/b/1")
+        interest.setChildSelector(1)
+        self.assertEqual(self.expressInterest(interest), "/a/d/1")
+
+        self.assertEqual(self.expressInterest(Interest(Name("/b"))), "/b/a/1")
+        self.assertEqual(self.expressInterest(Interest(Name())), "/a/b/1")
+        self.assertEqual(len(self.dataNotFound), 0)
+
+        self.assertIsNone(self.expressInterest(Interest(Name("/c"))))
+        self.assertEqual(len(self.dataNotFound), 1)
+
+    def test_selectors(self):
+        self.addData("/a/1")
+        self.addData("/a/2")
+        self.addData("/a/3")
+
+        interest = Interest(Name("/a")).setChildSelector(1)
+        interest.getExclude().appendComponent(Name.Component("3"))
+        self.assertEqual(self.expressInterest(interest), "/a/2")
+
+        interest = Interest(Name("/a")).setMinSuffixComponents(3)
+        self.assertIsNone(self.expressInterest(interest))
+
+    def test_must_be_fresh_and_cleanup(self):
+        self.addData("/a/1", 0.0)
+        self.addData("/a/2")
+
+        interest = Interest(Name("/a")).setMustBeFresh(False)
+        interest.setChildSelector(0)
+        # The stale content was removed on cleanup.
+        self.assertEqual(self.expressInterest(interest), "/a/2")
+        self.assertEqual(len(self.cache._contents), 1)
+
+        self.cache.setMinimumCacheLifetime(10000.0)
+        self.addData("/a/1", 0.0)
+        self.assertEqual(self.expressInterest(interest), "/a/1")
+        interest.setMustBeFresh(True)
+        self.assertEqual(self.expressInterest(interest), "/a/2")
+
+    def test_lru_eviction(self):
+        self.cache.setMaxContentCount(2)
+        self.addData("/a")
+        self.addData("/b")
+        self.assertEqual(self.expressInterest(Interest(Name("/a"))), "/a")
+        # /b is the least recently used.
+        self.addData("/c")
+
+        self.assertEqual(self.cache.size(), 2)
+        self.assertIsNone(self.expressInterest(Interest(Name("/b"))))
+        self.assertEqual(self.expressInterest(Interest(Name("/a"))), "/a")
+        self.assertEqual(self.expressInterest(Interest(Name("/c"))), "/c")
+        self.assertEqual(self.cache.getHitCount(), 3)
+        self.assertEqual(self.cache.getMissCount(), 1)
+        self.assertEqual(self.cache.getEvictionCount(), 1)
+
+    def test_evicted_stale_time_content(self):
+        self.cache.setMaxContentCount(10)
+        for i in range(1000):
+            # The content would stay in the heap for an hour if not evicted.
+            self.addData("/a/" + str(i), 3600000.0)
+
+        self.assertEqual(self.cache.size(), 10)
+        self.assertEqual(self.cache.getEvictionCount(), 990)
+        # The heap keeps at most the live content plus as many evicted entries.
+        self.assertTrue(len(self.cache._staleTimeHeap) <= 2 * 10 + 17)
+        self.assertEqual(self.expressInterest(Interest(Name("/a/999"))), "/a/999")
+
+    def test_lfu_eviction(self):
+        self.cache.setEvictionPolicy(LfuEvictionPolicy())
+        self.cache.setMaxContentCount(2)
+        self.addData("/a")
+        self.addData("/b")
+        self.expressInterest(Interest(Name("/a")))
+        self.expressInterest(Interest(Name("/a")))
+        self.expressInterest(Interest(Name("/b")))
+        self.addData("/c")
+        # /b has fewer uses than /a.
+        self.assertIsNone(self.expressInterest(Interest(Name("/b"))))
+        self.assertEqual(self.expressInterest(Interest(Name("/a"))), "/a")
+
+    def test_arc_eviction(self):
+        self.cache.setEvictionPolicy(ArcEvictionPolicy())
+        self.cache.setMaxContentCount(2)
+        self.addData("/a")
+        self.addData("/b")
+        self.expressInterest(Interest(Name("/a")))
+        # /b is the only entry used once.
+        self.addData("/c")
+        self.assertIsNone(self.expressInterest(Interest(Name("/b"))))
+        self.assertEqual(self.expressInterest(Interest(Name("/a"))), "/a")
+        self.assertEqual(self.cache.getEvictionCount(), 1)
+
+    def test_max_byte_count(self):
+        data = Data(Name("/a"))
+        byteCount = data.wireEncode().size()
+        self.cache.setMaxByteCount(2 * byteCount)
+        self.addData("/a")
+        self.addData("/b")
+        self.assertEqual(self.cache.getByteCount(), 2 * byteCount)
+        self.addData("/c")
+        self.assertEqual(self.cache.size(), 2)
+        self.assertEqual(self.cache.getByteCount(), 2 * byteCount)
+        self.assertIsNone(self.expressInterest(Interest(Name("/a"))))
+
+        # Lowering the limit evicts now.
+        self.cache.setMaxByteCount(byteCount)
+        self.assertEqual(self.cache.size(), 1)
+        self.assertEqual(self.expressInterest(Interest(Name("/c"))), "/c")
+
+        # Content larger than the limit is not stored.
+        self.cache.setMaxByteCount(byteCount - 1)
+        self.addData("/d")
+        self.assertEqual(self.cache.size(), 0)
+        self.assertEqual(self.cache.getByteCount(), 0)
+
+    def test_pending_interests(self):
+        self.cache.storePendingInterest(Interest(Name("/a")), self.face)
+        self.cache.storePendingInterest(Interest(Name("/a/b")), self.face)
+        self.cache.storePendingInterest(Interest(Name("/c")), self.face)
+        self.cache.storePendingInterest(
+          Interest(Name("/a")).setInterestLifetimeMilliseconds(0), self.face)
+
+        self.face.sentData = []
+        self.addData("/a/b/1")
+        # The timed-out interest and /c are not answered.
+        self.assertEqual(len(self.face.sentData), 2)
+
+        # The satisfied interests are removed.
+        self.face.sentData = []
+        self.addData("/a/b/2")
+        self.assertEqual(len(self.face.sentData), 0)
+        self.addData("/c")
+        self.assertEqual(len(self.face.sentData), 1)
+        self.assertTrue(self.cache._pendingInterestTable.isEmpty())
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
@@ -0,0 +1,112 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import unittest as ut
+from pyndn import Name, Interest, Data
+from pyndn.util import Blob
+from pyndn.impl.pending_interest_table import PendingInterestTable
+
+def onData(interest, data):
+    pass
+
+def onNetworkNack(interest, networkNack):
+    pass
+
+class TestPendingInterestTable(ut.TestCase):
+    def setUp(self):
+        self.table = PendingInterestTable()
+
+    def addInterest(self, pendingInterestId, uri):
+        interest = Interest(Name(uri))
+        return self.table.add(pendingInterestId, interest, onData, None, None)
+
+    def test_extract_for_data(self):
+        self.addInterest(1, "/a")
+        self.addInterest(2, "/a/b")
+        self.addInterest(3, "/a/c")
+        self.addInterest(4, "/a/b/c/d")
+        self.addInterest(5, "/")
+
+        entries = []
+        self.table.extractEntriesForExpressedInterest(
+          Data(Name("/a/b/c")), entries)
+        self.assertEqual(
+          [entry.getPendingInterestId() for entry in entries], [5, 2, 1],
+          "Expected the matching entries in reverse order of adding")
+        for entry in entries:
+            self.assertTrue(entry.getIsRemoved())
+        self.assertEqual(self.table.size(), 2)
+
+        # The extracted entries no longer match.
+        entries = []
+        self.table.extractEntriesForExpressedInterest(
+          Data(Name("/a/b/c")), entries)
+        self.assertEqual(len(entries), 0)
+
+    def test_extract_with_implicit_digest(self):
+        data = Data(Name("/a/b"))
+        fullName = data.getFullName()
+        self.addInterest(1, fullName.toUri())
+        wrongDigestName = Name("/a/b").appendImplicitSha256Digest(bytearray(32))
+        self.addInterest(2, wrongDigestName.toUri())
+
+        entries = []
+        self.table.extractEntriesForExpressedInterest(data, entries)
+        self.assertEqual(
+          [entry.getPendingInterestId() for entry in entries], [1])
+        self.assertEqual(self.table.size(), 1)
+
+    def test_extract_for_nack(self):
+        interest1 = Interest(Name("/a")).setNonce(Blob([1, 2, 3, 4]))
+        interest2 = Interest(Name("/a")).setNonce(Blob([5, 6, 7, 8]))
+        interest3 = Interest(Name("/a")).setNonce(Blob([1, 2, 3, 4]))
+        self.table.add(1, interest1, onData, None, onNetworkNack)
+        self.table.add(2, interest2, onData, None, onNetworkNack)
+        # Without onNetworkNack, the entry is left to time out.
+        self.table.add(3, interest3, onData, None, None)
+
+        nackInterest = Interest()
+        nackInterest.wireDecode(interest1.wireEncode())
+        entries = []
+        self.table.extractEntriesForNackInterest(nackInterest, entries)
+        self.assertEqual(
+          [entry.getPendingInterestId() for entry in entries], [1])
+        self.assertEqual(self.table.size(), 2)
+
+        entries = []
+        self.table.extractEntriesForNackInterest(nackInterest, entries)
+        self.assertEqual(len(entries), 0)
+
+    def test_remove(self):
+        entry1 = self.addInterest(1, "/a")
+        entry2 = self.addInterest(2, "/a")
+
+        self.table.removePendingInterest(1)
+        self.assertTrue(entry1.getIsRemoved())
+        self.assertFalse(self.table.removeEntry(entry1))
+        self.assertTrue(self.table.removeEntry(entry2))
+        self.assertEqual(self.table.size(), 0)
+
+        # Removing before adding prevents the add.
+        self.table.removePendingInterest(3)
+        self.assertIsNone(self.addInterest(3, "/a"))
+        self.assertIsNotNone(self.addInterest(4, "/a"))
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
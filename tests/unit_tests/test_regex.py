@@ -431,6 +431,24 @@ class TestRegex(ut.TestCase):
         self.assertEquals(6, len(cm.getMatchResult()))
         self.assertEquals(Name("/ndn/edu/ucla/yingdi/mac/"), cm.expand())
 
+    def test_top_matcher_cache(self):
+        cache = NdnRegexTopMatcher.Cache(2)
+        cm1 = cache.get("^<a>(<>*)$")
+        self.assertTrue(cm1 is cache.get("^<a>(<>*)$"))
+        self.assertTrue(cm1.match(Name("/a/b/c")))
+        self.assertEqual(Name("/b/c"), cm1.expand("\\1"))
+
+        cache.get("^<b>$")
+        # Use cm1 so that "^<b>$" is the least recently used.
+        cache.get("^<a>(<>*)$")
+        cache.get("^<c>$")
+        self.assertEqual(2, cache.size())
+        self.assertTrue(cm1 is cache.get("^<a>(<>*)$"),
+          "Expected the most recently used matcher to remain cached")
+
+        # Another cache doesn't share the matchers.
+        self.assertFalse(cm1 is NdnRegexTopMatcher.Cache().get("^<a>(<>*)$"))
+
 from pyndn.util.regex.ndn_regex_matcher_base import NdnRegexMatcherBase
 
 if __name__ == '__main__':
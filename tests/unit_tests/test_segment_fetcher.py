@@ -0,0 +1,268 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest as ut
+from pyndn import Name, Interest, Data, NetworkNack, Face
+from pyndn.encoding.element_reader import ElementReader
+from pyndn.transport.unix_transport import UnixTransport
+from pyndn.util import Blob
+from pyndn.util.segment_fetcher import SegmentFetcher
+
+class DummyFace(object):
+    """
+    DummyFace keeps the expressed Interests so that the test can answer them.
+    """
+    def __init__(self):
+        self.pending = [] # of [pendingInterestId, interest, onData, onTimeout, onNetworkNack]
+        self.lastPendingInterestId = 0
+
+    def expressInterest(self, interest, onData, onTimeout, onNetworkNack):
+        self.lastPendingInterestId += 1
+        self.pending.append([self.lastPendingInterestId, Interest(interest),
+          onData, onTimeout, onNetworkNack])
+        return self.lastPendingInterestId
+
+    def removePendingInterest(self, pendingInterestId):
+        self.pending = [entry for entry in self.pending
+                        if entry[0] != pendingInterestId]
+
+    def pop(self, uri = None):
+        for i in range(len(self.pending)):
+            if uri == None or self.pending[i][1].getName().toUri() == uri:
+                return self.pending.pop(i)
+        raise RuntimeError("No pending Interest for " + str(uri))
+
+    def pendingUris(self):
+        return [entry[1].getName().toUri() for entry in self.pending]
+
+    def answer(self, segment, nSegments):
+        entry = self.pop(makeName(segment).toUri())
+        entry[2](entry[1], makeData(segment, nSegments))
+
+def makeName(segment):
+    return Name("/a/b").appendVersion(1).appendSegment(segment)
+
+def makeData(segment, nSegments):
+    data = Data(makeName(segment))
+    data.setContent(Blob(bytearray([segment % 256])))
+    data.getMetaInfo().setFinalBlockId(Name.Component.fromSegment(nSegments - 1))
+    return data
+
+class TestSegmentFetcher(ut.TestCase):
+    def setUp(self):
+        self.face = DummyFace()
+        self.content = None
+        self.errorCode = None
+
+    def onComplete(self, content):
+        self.content = content
+
+    def onError(self, errorCode, message):
+        self.errorCode = errorCode
+
+    def fetch(self, options = None, onSegment = None):
+        SegmentFetcher.fetch(
+          self.face, Interest(Name("/a/b")), SegmentFetcher.DontVerifySegment,
+          self.onComplete, self.onError, options, onSegment)
+
+    def answerDiscovery(self, segment, nSegments):
+        entry = self.face.pop()
+        entry[2](entry[1], makeData(segment, nSegments))
+
+    def test_window_grows(self):
+        self.fetch()
+        self.answerDiscovery(0, 10)
+        # The window has grown from 1 to 2.
+        self.assertEqual(self.face.pendingUris(),
+          [makeName(1).toUri(), makeName(2).toUri()])
+        self.face.answer(1, 10)
+        self.assertEqual(len(self.face.pending), 3)
+
+        while len(self.face.pending) > 0:
+            entry = self.face.pop()
+            entry[2](entry[1], makeData(
+              entry[1].getName().get(-1).toSegment(), 10))
+        self.assertEqual(self.content, Blob(bytearray(range(10))))
+        self.assertEqual(self.errorCode, None)
+
+    def test_default_max_window(self):
+        options = SegmentFetcher.Options()
+        self.assertEqual(options.getMaxWindowSize(), 64)
+        # Start above the slow start threshold to reach the maximum sooner.
+        self.fetch(options.setInitialWindowSize(60))
+        self.answerDiscovery(0, 512)
+        maxPending = 0
+        while len(self.face.pending) > 0:
+            maxPending = max(maxPending, len(self.face.pending))
+            entry = self.face.pop()
+            entry[2](entry[1], makeData(
+              entry[1].getName().get(-1).toSegment(), 512))
+
+        self.assertEqual(maxPending, 64)
+        self.assertEqual(self.content.size(), 512)
+
+    def test_out_of_order(self):
+        self.fetch(SegmentFetcher.Options().setInitialWindowSize(4))
+        # The first Data packet is not segment 0.
+        self.answerDiscovery(2, 5)
+        self.assertEqual(len(self.face.pending), 4)
+        for segment in [4, 1, 3]:
+            self.face.answer(segment, 5)
+        self.assertEqual(self.content, None)
+        self.face.answer(0, 5)
+        self.assertEqual(self.content, Blob(bytearray(range(5))))
+
+    def test_retry_timeout(self):
+        self.fetch(SegmentFetcher.Options().setMaxRetries(1))
+        self.answerDiscovery(0, 3)
+
+        entry = self.face.pop(makeName(1).toUri())
+        entry[3](entry[1])
+        # The timeout decreased the window, which still has segment 2.
+        self.assertEqual(self.face.pendingUris(), [makeName(2).toUri()])
+        self.face.answer(2, 3)
+        # The timed-out segment is requested again.
+        self.assertTrue(makeName(1).toUri() in self.face.pendingUris())
+        entry = self.face.pop(makeName(1).toUri())
+        entry[3](entry[1])
+        self.assertEqual(self.errorCode, SegmentFetcher.ErrorCode.INTEREST_TIMEOUT)
+        self.assertEqual(len(self.face.pending), 0)
+
+    def test_nack(self):
+        self.fetch(SegmentFetcher.Options().setMaxRetries(1))
+        self.answerDiscovery(0, 3)
+
+        networkNack = NetworkNack()
+        networkNack.setReason(NetworkNack.Reason.CONGESTION)
+        entry = self.face.pop(makeName(1).toUri())
+        entry[4](entry[1], networkNack)
+        self.face.answer(2, 3)
+        self.assertTrue(makeName(1).toUri() in self.face.pendingUris())
+
+        networkNack.setReason(NetworkNack.Reason.NO_ROUTE)
+        entry = self.face.pop(makeName(1).toUri())
+        entry[4](entry[1], networkNack)
+        self.assertEqual(self.errorCode, SegmentFetcher.ErrorCode.NACK_ERROR)
+
+    def test_no_interests_after_final(self):
+        self.fetch(SegmentFetcher.Options().setInitialWindowSize(8))
+        self.answerDiscovery(0, 3)
+        self.assertEqual(self.face.pendingUris(),
+          [makeName(1).toUri(), makeName(2).toUri()])
+
+    def test_on_segment(self):
+        segments = []
+        self.fetch(SegmentFetcher.Options().setInitialWindowSize(4),
+          lambda segmentNumber, content: segments.append(
+            (segmentNumber, content.buf()[0])))
+        self.answerDiscovery(0, 4)
+        self.face.answer(2, 4)
+        self.assertEqual(segments, [(0, 0)])
+        self.face.answer(1, 4)
+        self.assertEqual(segments, [(0, 0), (1, 1), (2, 2)])
+        self.face.answer(3, 4)
+        self.assertEqual(segments, [(0, 0), (1, 1), (2, 2), (3, 3)])
+        self.assertTrue(self.content.isNull())
+
+    def test_buffer_sink(self):
+        sink = SegmentFetcher.BufferSink()
+        self.fetch(SegmentFetcher.Options().setInitialWindowSize(4), sink)
+        self.answerDiscovery(0, 3)
+        # The FinalBlockId gives the size hint.
+        self.assertEqual(len(sink.getBuffer()), 3)
+        self.face.answer(1, 3)
+        self.face.answer(2, 3)
+        self.assertEqual(self.content, Blob(bytearray([0, 1, 2])))
+        self.assertTrue(sink.getBuffer() is not None)
+
+        # A preallocated buffer which is too small is extended.
+        buffer = bytearray(1)
+        sink = SegmentFetcher.BufferSink(buffer)
+        sink(0, Blob(bytearray([1, 2])))
+        sink(1, Blob(bytearray([3])))
+        self.assertTrue(sink.getBuffer() is buffer)
+        self.assertEqual(sink.getContent(), Blob(bytearray([1, 2, 3])))
+
+    def test_fetch_segments(self):
+        face = self.face
+        def processEvents():
+            if len(face.pending) > 0:
+                entry = face.pop()
+                segment = (entry[1].getName().get(-1).toSegment()
+                  if entry[1].getName().get(-1).isSegment() else 0)
+                entry[2](entry[1], makeData(segment, 3))
+        face.processEvents = processEvents
+
+        contents = [content.buf()[0] for content in SegmentFetcher.fetchSegments(
+          face, Interest(Name("/a/b")), None, sleepSeconds = 0)]
+        self.assertEqual(contents, [0, 1, 2])
+
+    @ut.skipUnless(hasattr(socket, "AF_UNIX"), "Requires Unix sockets")
+    def test_fetch_segments_reactor(self):
+        directory = tempfile.mkdtemp()
+        filePath = os.path.join(directory, "test.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(filePath)
+        server.listen(1)
+
+        class Responder(object):
+            def __init__(self, connection):
+                self._connection = connection
+
+            def onReceivedElement(self, element):
+                interest = Interest()
+                interest.wireDecode(element)
+                segment = (interest.getName().get(-1).toSegment()
+                  if interest.getName().get(-1).isSegment() else 0)
+                self._connection.sendall(
+                  makeData(segment, 3).wireEncode().toBytes())
+
+        def serve():
+            connection, _ = server.accept()
+            reader = ElementReader(Responder(connection))
+            try:
+                while True:
+                    data = connection.recv(8800)
+                    if len(data) == 0:
+                        break
+                    reader.onReceivedData(bytearray(data))
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target = serve)
+        thread.start()
+        face = Face(UnixTransport(), UnixTransport.ConnectionInfo(filePath))
+        try:
+            # Without sleepSeconds, wait on the socket with a FaceReactor.
+            contents = [content.buf()[0] for content in
+              SegmentFetcher.fetchSegments(face, Interest(Name("/a/b")), None)]
+            self.assertEqual(contents, [0, 1, 2])
+        finally:
+            face.shutdown()
+            thread.join()
+            server.close()
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)
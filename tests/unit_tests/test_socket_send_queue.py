@@ -0,0 +1,141 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2018 Regents of the University of California.
+# Author: Jeff Thompson <jefft0@remap.ucla.edu>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# A copy of the GNU Lesser General Public License is in the file COPYING.
+
+import os
+import shutil
+import socket
+import tempfile
+import unittest as ut
+from pyndn import Name, Interest
+from pyndn.transport.socket_send_queue import SocketSendQueue
+from pyndn.transport.unix_transport import UnixTransport
+
+def receiveAll(sock, nBytes):
+    result = bytearray()
+    while len(result) < nBytes:
+        result.extend(sock.recv(nBytes - len(result)))
+    return result
+
+@ut.skipUnless(hasattr(socket, "socketpair"), "Requires socket.socketpair")
+class TestSocketSendQueue(ut.TestCase):
+    def setUp(self):
+        self.sender, self.receiver = socket.socketpair()
+
+    def tearDown(self):
+        self.sender.close()
+        self.receiver.close()
+
+    def test_flush(self):
+        queue = SocketSendQueue(self.sender)
+        queue.add(bytearray([1, 2, 3]))
+        queue.add(memoryview(bytearray([4, 5, 6, 7]))[1:])
+        queue.add(bytearray())
+        self.assertEqual(queue.getByteCount(), 6)
+
+        self.assertTrue(queue.flush())
+        self.assertEqual(queue.getByteCount(), 0)
+        self.assertEqual(receiveAll(self.receiver, 6),
+                         bytearray([1, 2, 3, 5, 6, 7]))
+
+    def test_flush_byte_count(self):
+        queue = SocketSendQueue(self.sender)
+        queue.setFlushByteCount(4)
+        queue.add(bytearray([1, 2]))
+        self.assertEqual(queue.getByteCount(), 2)
+        # Reaching the flush byte count sends.
+        queue.add(bytearray([3, 4]))
+        self.assertEqual(queue.getByteCount(), 0)
+        self.assertEqual(receiveAll(self.receiver, 4), bytearray([1, 2, 3, 4]))
+
+    @ut.skipUnless(hasattr(socket, "MSG_DONTWAIT"), "Requires MSG_DONTWAIT")
+    def test_non_blocking(self):
+        queue = SocketSendQueue(self.sender)
+        queue.setIsBlocking(False)
+        queue.setFlushByteCount(1 << 30)
+        data = bytearray(os.urandom(8 * 1024 * 1024))
+        for i in range(0, len(data), 1000):
+            queue.add(memoryview(data)[i:i + 1000])
+
+        # The socket can't take all the data without the receiver reading.
+        self.assertFalse(queue.flush())
+        self.assertTrue(queue.getByteCount() > 0)
+
+        received = bytearray()
+        while not queue.flush():
+            received.extend(self.receiver.recv(1024 * 1024))
+        received.extend(receiveAll(self.receiver, len(data) - len(received)))
+        self.assertEqual(queue.getByteCount(), 0)
+        self.assertEqual(received, data)
+
+class ElementListener(object):
+    def __init__(self, transport):
+        self._transport = transport
+        self.pendingSendByteCounts = []
+
+    def onReceivedElement(self, element):
+        interest = Interest()
+        interest.wireDecode(element)
+        encoding = interest.wireEncode()
+        self._transport.send(encoding.toBytes())
+        self._transport.send(encoding.toBytes())
+        self.pendingSendByteCounts.append(
+          self._transport.getPendingSendByteCount())
+
+@ut.skipUnless(hasattr(socket, "AF_UNIX"), "Requires Unix sockets")
+class TestUnixTransportSend(ut.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filePath = os.path.join(self.directory, "test.sock")
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.filePath)
+        self.server.listen(1)
+
+    def tearDown(self):
+        self.server.close()
+        shutil.rmtree(self.directory)
+
+    def test_send_in_process_events(self):
+        transport = UnixTransport()
+        listener = ElementListener(transport)
+        transport.connect(
+          UnixTransport.ConnectionInfo(self.filePath), listener, None)
+        connection, _ = self.server.accept()
+        try:
+            # A send outside of processEvents is not queued.
+            transport.send(bytearray([1, 2, 3]))
+            self.assertEqual(transport.getPendingSendByteCount(), 0)
+            self.assertEqual(receiveAll(connection, 3), bytearray([1, 2, 3]))
+
+            encoding = Interest(Name("/a")).wireEncode().toBytes()
+            connection.sendall(encoding + encoding)
+            while len(listener.pendingSendByteCounts) < 2:
+                transport.processEvents()
+
+            # The sends in onReceivedElement are queued until the end of
+            # processEvents.
+            self.assertEqual(listener.pendingSendByteCounts[0], 2 * len(encoding))
+            self.assertEqual(transport.getPendingSendByteCount(), 0)
+            received = receiveAll(connection, 4 * len(encoding))
+            self.assertEqual(len(received), 4 * len(encoding))
+        finally:
+            connection.close()
+            transport.close()
+
+if __name__ == '__main__':
+    ut.main(verbosity=2)